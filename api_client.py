@@ -0,0 +1,97 @@
+"""Shared HTTP client the Streamlit app uses to talk to the FastAPI backend."""
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON is used when msgpack isn't installed
+    msgpack = None
+
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+# Seconds to wait for a connection / for the response
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "3.05"))
+BACKEND_READ_TIMEOUT = float(os.getenv("BACKEND_READ_TIMEOUT", "30"))
+# Retries for failed connections and 502/503/504 responses
+BACKEND_RETRIES = int(os.getenv("BACKEND_RETRIES", "3"))
+# Keep-alive connections kept open to the backend
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "10"))
+# Ask for msgpack instead of JSON (when msgpack is installed)
+BACKEND_MSGPACK = os.getenv("BACKEND_MSGPACK", "1") == "1"
+
+RETRY_STATUSES = (502, 503, 504)
+MSGPACK_TYPE = "application/msgpack"
+
+
+class BackendClient:
+    """
+    Pooled, retrying HTTP client for the backend API.
+
+    One ``requests.Session`` keeps connections alive between calls. Every
+    request has a (connect, read) timeout, so a hung backend cannot hang the
+    UI. Failed connections and gateway errors are retried with exponential,
+    jittered backoff; read timeouts are not retried, which bounds a stalled
+    call to roughly one read timeout. Responses may be gzip-compressed or
+    msgpack-encoded when the backend offers it.
+
+    Args:
+        base_url (str): Backend URL
+        connect_timeout (float): Seconds to establish a connection
+        read_timeout (float): Seconds to wait for a response
+        retries (int): Retries for connection errors and 502/503/504
+        backoff_factor (float): Base of the exponential backoff in seconds
+        pool_size (int): Keep-alive connections in the pool
+        use_msgpack (bool): Ask for msgpack responses if msgpack is installed
+    """
+
+    def __init__(self, base_url=API_URL, connect_timeout=BACKEND_CONNECT_TIMEOUT, read_timeout=BACKEND_READ_TIMEOUT,
+                 retries=BACKEND_RETRIES, backoff_factor=0.2, pool_size=BACKEND_POOL_SIZE, use_msgpack=BACKEND_MSGPACK):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=False,
+            status=retries,
+            status_forcelist=RETRY_STATUSES,
+            # Every backend endpoint is safe to repeat (POSTs are searches and upserts)
+            allowed_methods=None,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_factor,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        accept = [MSGPACK_TYPE, "application/json;q=0.9"] if msgpack and use_msgpack else ["application/json"]
+        self.session.headers.update({"Accept": ", ".join(accept), "Accept-Encoding": "gzip, deflate"})
+
+    def request(self, method, path, **kwargs):
+        """
+        Send a request and decode the response body.
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts and error statuses
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        response.raise_for_status()
+        return self.decode(response)
+
+    @staticmethod
+    def decode(response):
+        if msgpack and response.headers.get("content-type", "").startswith(MSGPACK_TYPE):
+            return msgpack.unpackb(response.content, raw=False)
+        return response.json()
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, payload=None, **kwargs):
+        return self.request("POST", path, json=payload, **kwargs)
+
+    def close(self):
+        self.session.close()
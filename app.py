@@ -1,18 +1,33 @@
 import streamlit as st
-import requests
 import json
+import math
 from datetime import datetime
+from html import escape
 import os
 from pathlib import Path
 
-# Constants
-API_URL = "http://localhost:8000"  # FastAPI backend URL
+from api_client import API_URL, BackendClient  # API_URL: FastAPI backend URL
+
+# Seconds backend responses are memoized across reruns
+PAPER_CACHE_TTL = 600
+# Paper cards rendered per results page
+PAGE_SIZE = 20
+
+# Author Search sort options -> backend sort_by values
+SORT_FIELDS = {"Published Date": "published", "Updated Date": "updated", "Title": "title"}
 SEARCH_HISTORY_FILE = Path("data/user_data/search_history.json")
 CATEGORIES_FILE = Path("data/user_data/categories.json")
 
 # Create directory if it doesn't exist
 SEARCH_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
 
+def write_json_atomic(path, data, **kwargs):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file"""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_path, path)
+
 # Function to load search history from file
 def load_search_history():
     if SEARCH_HISTORY_FILE.exists():
@@ -26,8 +41,7 @@ def load_search_history():
 # Function to save search history to file
 def save_search_history(history):
     try:
-        with open(SEARCH_HISTORY_FILE, 'w') as f:
-            json.dump(history, f)
+        write_json_atomic(SEARCH_HISTORY_FILE, history)
     except Exception as e:
         print(f"Error saving search history: {e}")
 
@@ -57,8 +71,7 @@ def load_categories():
 # Function to save categories to file
 def save_categories(categories_data):
     try:
-        with open(CATEGORIES_FILE, 'w') as f:
-            json.dump(categories_data, f, indent=2)
+        write_json_atomic(CATEGORIES_FILE, categories_data, indent=2)
     except Exception as e:
         print(f"Error saving categories: {e}")
 
@@ -92,41 +105,53 @@ st.set_page_config(
 def reset_search_results():
     """Reset the search results"""
     st.session_state.papers = []
+    st.session_state.paper_cards = []
     st.session_state.last_search = None
 
 # Functions to interact with the backend API
-def fetch_papers_by_author(author_id, max_results=50):
-    """Fetch papers by author ID from the backend API"""
+@st.cache_resource
+def backend_client():
+    """One pooled client per Streamlit server (the script itself re-runs on every interaction)"""
+    return BackendClient(API_URL)
+
+@st.cache_data(ttl=PAPER_CACHE_TTL, show_spinner=False)
+def api_post(path, payload):
+    """POST to the backend, memoized on (path, payload); errors raise and are not cached"""
+    return backend_client().post(path, payload)
+
+def fetch_papers(path, payload):
+    """Fetch a paper list from the backend, reporting connection errors in the UI"""
     try:
-        response = requests.post(
-            f"{API_URL}/papers/by-author",
-            json={"author_id": author_id, "max_results": max_results}
-        )
-        return response.json()
+        return api_post(path, payload)
     except Exception as e:
         st.error(f"Error connecting to backend: {e}")
         return {"success": False, "papers": [], "error": str(e)}
 
+def fetch_papers_by_author(author_id, max_results=50, sort_by=None, order="desc"):
+    """Fetch papers by author ID from the backend API, sorted server-side"""
+    return fetch_papers(
+        "/papers/by-author",
+        {"author_id": author_id, "max_results": max_results, "sort_by": sort_by, "order": order},
+    )
+
+def selected_sort():
+    """Backend (sort_by, order) for the Author Search sort controls (their defaults before they are shown)"""
+    sort_by = st.session_state.get("sort_by", "Published Date")
+    sort_order = st.session_state.get("sort_order", "Newest First")
+    return SORT_FIELDS[sort_by], "desc" if sort_order in ("Newest First", "Z-A") else "asc"
+
+def fetch_papers_by_authors(authors, max_results=50):
+    """Fetch the merged, newest-first feed of several authors in one request"""
+    return fetch_papers("/papers/by-authors", {"authors": authors, "max_results": max_results})
+
 def fetch_daily_papers(categories=None, date_range=None):
     """Fetch daily submissions with optional filtering"""
-    try:
-        if not categories:
-            categories = []
-            
-        response = requests.post(
-            f"{API_URL}/papers/daily",
-            json={"categories": categories, "date_range": date_range}
-        )
-        return response.json()
-    except Exception as e:
-        st.error(f"Error connecting to backend: {e}")
-        return {"success": False, "papers": [], "error": str(e)}
+    return fetch_papers("/papers/daily", {"categories": categories or [], "date_range": date_range})
 
 def get_user_profile(user_id):
     """Get stored user profile from the backend"""
     try:
-        response = requests.get(f"{API_URL}/profile/{user_id}")
-        return response.json()
+        return backend_client().get(f"/profile/{user_id}")
     except Exception as e:
         st.error(f"Error retrieving profile: {e}")
         return {"success": False, "profile": None}
@@ -134,11 +159,7 @@ def get_user_profile(user_id):
 def save_user_profile(profile_data):
     """Save user profile to the backend"""
     try:
-        response = requests.post(
-            f"{API_URL}/profile",
-            json=profile_data
-        )
-        return response.json()
+        return backend_client().post("/profile", profile_data)
     except Exception as e:
         st.error(f"Error saving profile: {e}")
         return {"success": False}
@@ -151,51 +172,59 @@ def format_date(date_str):
     except:
         return date_str
 
-def render_paper_card(paper):
-    """Render a paper in a nice card format"""
-    with st.expander(paper["title"]):
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            # Show authors
-            st.write("**Authors:** " + ", ".join(paper["authors"]))
-            
-            # Show dates in a more prominent way
-            dates_html = ""
-            
-            if "published" in paper and paper["published"]:
-                pub_date = format_date(paper["published"])
-                dates_html += f"<span style='color: #1e88e5'><strong>Published:</strong> {pub_date}</span>"
-            
-            if "updated" in paper and paper["updated"]:
-                upd_date = format_date(paper["updated"])
-                dates_html += f" <span style='color: #43a047'><strong>Updated:</strong> {upd_date}</span>" if dates_html else f"<span style='color: #43a047'><strong>Updated:</strong> {upd_date}</span>"
-            
-            if dates_html:
-                st.markdown(dates_html, unsafe_allow_html=True)
-            
-            # Show categories if available with better formatting
-            if "categories" in paper and paper["categories"]:
-                st.markdown("**Categories:**")
-                categories_html = ""
-                for cat in paper["categories"]:
-                    categories_html += f"<span style='background-color: #f1f8ff; padding: 2px 6px; border-radius: 4px; margin-right: 5px;'>{cat}</span>"
-                st.markdown(categories_html, unsafe_allow_html=True)
-        
-        with col2:
-            # Add buttons for PDF and arXiv links
-            if "pdf_url" in paper and paper["pdf_url"]:
-                st.markdown(f"[📄 Read PDF]({paper['pdf_url']})")
-            
-            if "id" in paper and paper["id"]:
-                st.markdown(f"[🔗 View on arXiv]({paper['id']})")
-                
-            # Placeholder for future citation info
-            # st.markdown("**Citations:** Not available")
-        
-        # Show abstract
-        st.markdown("**Abstract:**")
-        st.markdown(f"<div style='background-color: #f8f9fa; padding: 10px; border-radius: 5px;'>{paper['summary']}</div>", unsafe_allow_html=True)
+def paper_card_html(paper):
+    """Build the HTML body of a paper card (authors, dates, categories, links, abstract)"""
+    parts = [f"<p><strong>Authors:</strong> {escape(', '.join(paper.get('authors', [])))}</p>"]
+
+    dates = []
+    if paper.get("published"):
+        dates.append(f"<span style='color: #1e88e5'><strong>Published:</strong> {format_date(paper['published'])}</span>")
+    if paper.get("updated"):
+        dates.append(f"<span style='color: #43a047'><strong>Updated:</strong> {format_date(paper['updated'])}</span>")
+    if dates:
+        parts.append(f"<p>{' '.join(dates)}</p>")
+
+    if paper.get("categories"):
+        tags = "".join(
+            f"<span style='background-color: #f1f8ff; padding: 2px 6px; border-radius: 4px; margin-right: 5px;'>{escape(cat)}</span>"
+            for cat in paper["categories"]
+        )
+        parts.append(f"<p><strong>Categories:</strong> {tags}</p>")
+
+    links = []
+    # Served (and cached) by the backend, so reopening a PDF doesn't hit arXiv again
+    if paper.get("id") and "/abs/" in paper["id"]:
+        links.append(f"<a href='{API_URL}/papers/{paper['id'].split('/abs/')[-1]}/pdf' target='_blank'>📄 Read PDF</a>")
+    elif paper.get("pdf_url"):
+        links.append(f"<a href='{paper['pdf_url']}' target='_blank'>📄 Read PDF</a>")
+    if paper.get("id"):
+        links.append(f"<a href='{paper['id']}' target='_blank'>🔗 View on arXiv</a>")
+    if links:
+        parts.append(f"<p>{' &nbsp; '.join(links)}</p>")
+
+    parts.append("<p><strong>Abstract:</strong></p>")
+    parts.append(f"<div style='background-color: #f8f9fa; padding: 10px; border-radius: 5px;'>{escape(paper.get('summary') or '')}</div>")
+    return "".join(parts)
+
+def set_results(key, papers):
+    """Store a result set with its card HTML built once, and go back to its first page"""
+    st.session_state[key] = [(paper.get("title", "Untitled"), paper_card_html(paper)) for paper in papers]
+    st.session_state[f"{key}_page"] = 1
+
+def render_results(key):
+    """Render one page of a stored result set; only the visible cards are created"""
+    cards = st.session_state.get(key) or []
+    pages = max(1, math.ceil(len(cards) / PAGE_SIZE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key=f"{key}_page")
+    start = (page - 1) * PAGE_SIZE
+    visible = cards[start:start + PAGE_SIZE]
+    if visible:
+        st.write(f"**Displaying papers {start + 1}-{start + len(visible)} of {len(cards)}**")
+    for number, (title, body) in enumerate(visible, start + 1):
+        with st.expander(f"{number}. {title}"):
+            st.markdown(body, unsafe_allow_html=True)
 
 # Main app
 def main():
@@ -422,11 +451,16 @@ def main():
             
             # Fetch papers
             with st.spinner("Fetching papers..."):
-                result = fetch_papers_by_author(author_id, max_results)
+                # Sorted as currently selected, so a search is one backend request
+                sort_params = selected_sort()
+                result = fetch_papers_by_author(author_id, max_results, *sort_params)
                 
                 if result.get("success", False):
                     # Store papers in session state
                     st.session_state.papers = result.get("papers", [])
+                    set_results("paper_cards", st.session_state.papers)
+                    st.session_state.papers_sort = sort_params
+                    st.session_state.papers_max_results = max_results
                     st.success(f"Found {len(st.session_state.papers)} papers by {author_id}")
                 else:
                     st.error("Failed to fetch papers. Please try again.")
@@ -446,7 +480,7 @@ def main():
                 )
             
             with col2:
-                sort_order = st.radio(
+                st.radio(
                     "Order:",
                     ["Newest First", "Oldest First"] if "Date" in sort_by else ["A-Z", "Z-A"],
                     horizontal=True,
@@ -468,61 +502,23 @@ def main():
                 3. Cache for citation data to avoid excessive API calls
                 """)
             
-            # Get papers from session state
-            papers_to_display = st.session_state.papers.copy()
-            
-            # Sort the papers based on selection
-            if sort_by == "Published Date":
-                # Convert date strings to datetime for proper sorting
-                try:
-                    papers_to_display = sorted(
-                        papers_to_display,
-                        key=lambda x: datetime.strptime(x.get("published", "1900-01-01"), "%Y-%m-%dT%H:%M:%SZ"),
-                        reverse=(sort_order == "Newest First")
-                    )
-                except Exception as e:
-                    st.warning(f"Some papers may have invalid date formats. Basic sorting applied.")
-                    # Fallback sorting if date parsing fails
-                    papers_to_display = sorted(
-                        papers_to_display,
-                        key=lambda x: x.get("published", ""),
-                        reverse=(sort_order == "Newest First")
-                    )
-                    
-            elif sort_by == "Updated Date":
-                try:
-                    papers_to_display = sorted(
-                        papers_to_display,
-                        key=lambda x: datetime.strptime(x.get("updated", "1900-01-01"), "%Y-%m-%dT%H:%M:%SZ"),
-                        reverse=(sort_order == "Newest First")
-                    )
-                except Exception as e:
-                    # Fallback sorting
-                    papers_to_display = sorted(
-                        papers_to_display,
-                        key=lambda x: x.get("updated", ""),
-                        reverse=(sort_order == "Newest First")
-                    )
-            
-            elif sort_by == "Title":
-                papers_to_display = sorted(
-                    papers_to_display,
-                    key=lambda x: x.get("title", "").lower(),
-                    reverse=(sort_order == "Z-A")
+            # The backend sorts (on dates parsed once at ingest); only re-request when the sort changes
+            sort_params = selected_sort()
+            if st.session_state.get("papers_sort") != sort_params:
+                result = fetch_papers_by_author(
+                    st.session_state.last_search, st.session_state.papers_max_results, *sort_params
                 )
+                if result.get("success", False):
+                    st.session_state.papers = result.get("papers", [])
+                    set_results("paper_cards", st.session_state.papers)
+                    st.session_state.papers_sort = sort_params
             
             # Refresh button
             if st.button("Refresh Results", key="refresh_button"):
                 st.rerun()
             
-            # Display count of papers
-            st.write(f"**Displaying {len(papers_to_display)} papers**")
-            
-            # Display papers with a counter
-            for i, paper in enumerate(papers_to_display, 1):
-                st.write(f"**Paper {i} of {len(papers_to_display)}**")
-                render_paper_card(paper)
-                st.markdown("---")
+            # Only the current page of cards is rendered
+            render_results("paper_cards")
                     
     elif page == "Daily Papers":
         st.title("Daily arXiv Submissions")
@@ -569,13 +565,12 @@ def main():
                 if result.get("success", False):
                     papers = result.get("papers", [])
                     st.success(f"Found {len(papers)} recent papers")
-                    
-                    # Display papers
-                    for paper in papers:
-                        render_paper_card(paper)
-                        st.markdown("---")
+                    set_results("daily_cards", papers)
                 else:
                     st.error("Failed to fetch papers. Please try again.")
+
+        # Kept across reruns, so paging doesn't refetch
+        render_results("daily_cards")
     
     elif page == "My Profile":
         st.title("My Research Profile")
@@ -618,5 +613,19 @@ def main():
                 else:
                     st.error("Failed to save profile.")
 
+            # Latest papers by all favorite authors, fetched in one request
+            if favorite_authors and st.button("Papers by My Authors"):
+                with st.spinner("Fetching papers by your favorite authors..."):
+                    result = fetch_papers_by_authors(favorite_authors)
+
+                    if result.get("success", False):
+                        papers = result.get("papers", [])
+                        st.success(f"Found {len(papers)} recent papers")
+                        set_results("author_feed_cards", papers)
+                    else:
+                        st.error("Failed to fetch papers. Please try again.")
+
+            render_results("author_feed_cards")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
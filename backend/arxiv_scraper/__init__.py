@@ -0,0 +1,6 @@
+from backend.arxiv_scraper.scheduler import BACKGROUND, INTERACTIVE, RequestScheduler
+from backend.arxiv_scraper.scraper import ArxivScraper, author_query, authors_queries, category_query
+
+__all__ = [
+    "ArxivScraper", "author_query", "authors_queries", "category_query", "RequestScheduler", "INTERACTIVE", "BACKGROUND",
+]
@@ -0,0 +1,76 @@
+import re
+
+# An arXiv ID with optional version at the end of an entry URL, a PDF link or an 'arXiv:' reference:
+# new-style '2401.01234v2', old-style 'hep-th/9901001v1' or 'math.GT/0309136'
+ARXIV_ID_RE = re.compile(
+    r"(?:abs/|pdf/|arxiv:)?([a-z\-]+(?:\.[a-z]{2})?/\d{7}|\d{4}\.\d{4,5})(?:v(\d+))?(?:\.pdf)?/?$",
+    re.IGNORECASE,
+)
+
+
+def _canonical(arxiv_id):
+    # Archives are lower case and subject classes upper case ('math.GT/0309136')
+    if "/" not in arxiv_id:
+        return arxiv_id
+    archive, number = arxiv_id.split("/")
+    archive, _, subject = archive.partition(".")
+    return f"{archive.lower()}.{subject.upper()}/{number}" if subject else f"{archive.lower()}/{number}"
+
+
+def parse_arxiv_id(value):
+    """
+    Canonical arXiv ID and requested version of an ID, URL or reference.
+
+    Args:
+        value (str): e.g. 'arXiv:2401.01234v2', 'https://arxiv.org/pdf/2401.01234v2.pdf', 'HEP-TH/9901001'
+
+    Returns:
+        tuple: (arxiv_id, version or None), or None if value is not an arXiv ID
+    """
+    match = ARXIV_ID_RE.search((value or "").strip())
+    if not match:
+        return None
+    return _canonical(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def split_arxiv_id(entry_id):
+    """
+    Split an arXiv entry URL or ID into (arxiv_id, version).
+
+    Args:
+        entry_id (str): e.g. 'http://arxiv.org/abs/2401.01234v2' or 'hep-th/9901001'
+
+    Returns:
+        tuple: (arxiv_id, version), version is 1 when the ID carries none
+    """
+    parsed = parse_arxiv_id(entry_id)
+    if parsed is None:
+        return entry_id, 1
+    return parsed[0], parsed[1] or 1
+
+
+def versioned_id(arxiv_id, version=None):
+    """'2401.01234v2' for an ID and version, the bare ID when version is None."""
+    return f"{arxiv_id}v{version}" if version else arxiv_id
+
+
+def latest_versions(papers):
+    """
+    One paper per arXiv ID: the newest version seen, in order of first appearance.
+
+    Several searches (or an OR-ed query matching a paper twice) can return
+    the same paper, possibly at different versions.
+
+    Args:
+        papers (iterable): Paper dictionaries
+
+    Returns:
+        list: Deduplicated paper dictionaries
+    """
+    latest = {}
+    for paper in papers:
+        arxiv_id, version = split_arxiv_id(paper["id"])
+        current = latest.get(arxiv_id)
+        if current is None or current[0] < version:
+            latest[arxiv_id] = (version, paper)
+    return [paper for _, paper in latest.values()]
@@ -0,0 +1,277 @@
+import os
+import re
+import asyncio
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from backend.arxiv_scraper.ids import split_arxiv_id
+from backend.arxiv_scraper.parser import date_key
+from backend.metrics import UPSTREAM_BYTES, UPSTREAM_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+ARXIV_OAI_URL = os.getenv("ARXIV_OAI_URL", "https://oaipmh.arxiv.org/oai")
+
+OAI = "{http://www.openarchives.org/OAI/2.0/}"
+RAW = "{http://arxiv.org/OAI/arXivRaw/}"
+
+# Top-level OAI sets; every other archive is a subset of physics (e.g. physics:hep-th)
+TOP_LEVEL_SETS = {"cs", "econ", "eess", "math", "q-bio", "q-fin", "stat"}
+
+# Seconds to wait on a 503 without a Retry-After header
+DEFAULT_RETRY_AFTER = 10
+
+AUTHOR_SEPARATOR_RE = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+")
+
+# arXivRaw elements copied (whitespace-normalized) into the paper dict
+RAW_FIELDS = {RAW + "doi": "doi", RAW + "journal-ref": "journal_ref", RAW + "comments": "comment"}
+
+
+class OAIError(Exception):
+    """An OAI-PMH error response (e.g. badResumptionToken)."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+def oai_set(category):
+    """
+    OAI set containing an arXiv category.
+
+    Sets are archives, not categories, so records still need filtering by category.
+
+    Args:
+        category (str): e.g. 'cs.LG', 'hep-th', 'astro-ph.CO'
+
+    Returns:
+        str: e.g. 'cs', 'physics:hep-th', 'physics:astro-ph'
+    """
+    archive = category.split(".")[0]
+    return archive if archive in TOP_LEVEL_SETS else f"physics:{archive}"
+
+
+def split_authors(authors):
+    """Split an arXivRaw author string ('A, B and C') into names."""
+    return [name for name in AUTHOR_SEPARATOR_RE.split(" ".join(authors.split())) if name]
+
+
+def raw_date(value):
+    """ISO timestamp ('2007-04-02T19:18:42Z') for an arXivRaw version date ('Mon, 2 Apr 2007 19:18:42 GMT')."""
+    try:
+        return parsedate_to_datetime(value).strftime("%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(value, now=None):
+    """
+    Seconds to wait for a Retry-After header value.
+
+    Args:
+        value (str): Delay in seconds or an HTTP date, or None
+        now (datetime): Current time (for tests)
+
+    Returns:
+        float: The delay (0 for a date in the past), DEFAULT_RETRY_AFTER if missing or malformed
+    """
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class OAIParser:
+    """
+    Incremental parser for OAI-PMH ListRecords responses in the arXivRaw format.
+
+    Like AtomParser, records are turned into paper dicts (the same shape the
+    search API produces) as their end tags arrive and are then detached, so
+    memory is bounded by one record plus the papers not yet collected.
+    Deleted records are skipped. After close(), ``token`` holds the
+    resumption token ('' or None at the end of the list).
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._list = None
+        self._versions = []
+        self.token = None
+        self.complete_list_size = None
+        self.cursor = None
+        self.error = None
+        self.records = 0
+
+    def feed(self, data):
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self):
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self):
+        papers = []
+        for event, elem in self._parser.read_events():
+            tag = elem.tag
+            if event == "start":
+                if tag == OAI + "ListRecords":
+                    self._list = elem
+                continue
+            if tag == RAW + "version":
+                self._versions.append((int((elem.get("version") or "v1")[1:]), elem.findtext(RAW + "date")))
+            elif tag == OAI + "record":
+                self.records += 1
+                paper = self._to_paper(elem)
+                if paper is not None:
+                    papers.append(paper)
+                self._versions = []
+                elem.clear()
+                if self._list is not None:
+                    self._list.remove(elem)
+            elif tag == OAI + "resumptionToken":
+                self.token = (elem.text or "").strip()
+                size = elem.get("completeListSize")
+                self.complete_list_size = int(size) if size else None
+                self.cursor = int(elem.get("cursor") or 0)
+            elif tag == OAI + "error":
+                self.error = OAIError(elem.get("code"), (elem.text or "").strip())
+        return papers
+
+    def _to_paper(self, record):
+        header = record.find(OAI + "header")
+        raw = record.find(f"{OAI}metadata/{RAW}arXivRaw")
+        if header is not None and header.get("status") == "deleted" or raw is None:
+            return None
+        arxiv_id = raw.findtext(RAW + "id", "").strip()
+        versions = sorted(self._versions)
+        version = versions[-1][0] if versions else 1
+        published = raw_date(versions[0][1]) if versions else None
+        updated = raw_date(versions[-1][1]) if versions else published
+        categories = (raw.findtext(RAW + "categories") or "").split()
+        arxiv_id = split_arxiv_id(arxiv_id)[0]
+        paper = {
+            "title": " ".join((raw.findtext(RAW + "title") or "Unknown Title").split()),
+            "authors": split_authors(raw.findtext(RAW + "authors") or ""),
+            "summary": (raw.findtext(RAW + "abstract") or "").strip(),
+            "published": published,
+            "updated": updated,
+            "categories": categories,
+            "primary_category": categories[0] if categories else None,
+            "id": f"http://arxiv.org/abs/{arxiv_id}v{version}",
+            "arxiv_id": arxiv_id,
+            "version": version,
+            "pdf_url": f"http://arxiv.org/pdf/{arxiv_id}v{version}",
+            "doi": None,
+            "journal_ref": None,
+            "comment": None,
+            "published_ts": date_key(published),
+            "updated_ts": date_key(updated),
+            # Every version with its date, so the store can record the full history
+            "versions": [{"version": number, "updated": raw_date(date)} for number, date in versions],
+        }
+        for tag, field in RAW_FIELDS.items():
+            value = raw.findtext(tag)
+            if value and value.strip():
+                paper[field] = " ".join(value.split())
+        return paper
+
+
+class OAIClient:
+    """
+    Streaming OAI-PMH client for arXiv's metadata harvesting endpoint.
+
+    ``list_records`` walks a ListRecords result page by page, following
+    resumption tokens. Each response is parsed while it downloads. 503
+    responses are retried after the server's Retry-After delay, which is how
+    arXiv paces harvesters.
+
+    Args:
+        base_url (str): OAI-PMH endpoint
+        client (httpx.AsyncClient): Optional client (e.g. for tests)
+        max_retries (int): Retries per page for 503s and connection errors
+    """
+
+    def __init__(self, base_url=ARXIV_OAI_URL, client=None, max_retries=5):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.client = client or httpx.AsyncClient(timeout=httpx.Timeout(30, read=300), follow_redirects=True)
+        self.requests = 0
+
+    async def list_records(self, set_spec=None, from_date=None, until=None, token=None):
+        """
+        Yield pages of a ListRecords result.
+
+        Args:
+            set_spec (str): OAI set (see oai_set), or None for everything
+            from_date (str): Only records changed on or after this date ('YYYY-MM-DD')
+            until (str): Only records changed on or before this date
+            token (str): Resumption token to continue an earlier listing from
+
+        Yields:
+            tuple: (papers, parser) where parser.token continues after this page
+                (empty at the end) and parser.complete_list_size is the list size
+        """
+        while True:
+            if token:
+                params = {"verb": "ListRecords", "resumptionToken": token}
+            else:
+                params = {"verb": "ListRecords", "metadataPrefix": "arXivRaw"}
+                if set_spec:
+                    params["set"] = set_spec
+                if from_date:
+                    params["from"] = from_date
+                if until:
+                    params["until"] = until
+            papers, parser = await self._fetch_page(params)
+            if parser.error is not None:
+                if parser.error.code == "noRecordsMatch":
+                    return
+                raise parser.error
+            yield papers, parser
+            if not parser.token:
+                return
+            token = parser.token
+
+    async def _fetch_page(self, params):
+        # The last attempt always returns or raises
+        for attempt in range(self.max_retries + 1):
+            parser = OAIParser()
+            papers = []
+            try:
+                async with self.client.stream("GET", self.base_url, params=params) as response:
+                    self.requests += 1
+                    UPSTREAM_REQUESTS.inc(outcome=str(response.status_code))
+                    if response.status_code == 503 and attempt < self.max_retries:
+                        delay = retry_after(response.headers.get("Retry-After"))
+                        logger.info(f"OAI-PMH server asked us to retry after {delay:.0f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        UPSTREAM_BYTES.inc(len(chunk))
+                        papers.extend(parser.feed(chunk))
+                    papers.extend(parser.close())
+                return papers, parser
+            except httpx.RequestError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"OAI-PMH request failed ({e}), retrying")
+                await asyncio.sleep(2 ** attempt)
+
+    async def close(self):
+        """Close the HTTP client session"""
+        await self.client.aclose()
@@ -0,0 +1,174 @@
+import logging
+import calendar
+import xml.etree.ElementTree as ET
+
+from backend.arxiv_scraper.ids import split_arxiv_id
+
+logger = logging.getLogger(__name__)
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV = "{http://arxiv.org/schemas/atom}"
+OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+ENTRY = ATOM + "entry"
+AUTHOR_NAME = ATOM + "name"
+
+# Entry child elements copied verbatim (after stripping) into the paper dict
+TEXT_FIELDS = {
+    ATOM + "id": "id",
+    ATOM + "published": "published",
+    ATOM + "updated": "updated",
+    ATOM + "summary": "summary",
+    ARXIV + "doi": "doi",
+    ARXIV + "journal_ref": "journal_ref",
+    ARXIV + "comment": "comment",
+}
+
+
+def date_key(value):
+    """
+    Compact sort key for an arXiv timestamp: seconds since the epoch.
+
+    Args:
+        value (str): e.g. '2024-01-02T09:30:00Z' or '2024-01-02'
+
+    Returns:
+        int: Seconds since 1970-01-01 UTC, 0 if missing or malformed
+    """
+    if not value:
+        return 0
+    try:
+        return calendar.timegm((
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13] or 0), int(value[14:16] or 0), int(value[17:19] or 0), 0, 0, 0,
+        ))
+    except ValueError:
+        return 0
+
+
+def _new_paper():
+    return {
+        "title": "Unknown Title",
+        "authors": [],
+        "summary": "",
+        "published": None,
+        "updated": None,
+        "categories": [],
+        "primary_category": None,
+        "id": None,
+        "arxiv_id": None,
+        "version": None,
+        "pdf_url": None,
+        "doi": None,
+        "journal_ref": None,
+        "comment": None,
+        "published_ts": 0,
+        "updated_ts": 0,
+    }
+
+
+class AtomParser:
+    """
+    Incremental (pull) parser for arXiv Atom feeds.
+
+    Bytes are fed as they arrive from the network and each ``<entry>`` is
+    turned into a paper dict as soon as its end tag is seen. Finished entries
+    are detached from the tree, so memory use is bounded by one entry rather
+    than the whole feed.
+
+    Usage:
+        parser = AtomParser()
+        for chunk in chunks:
+            papers.extend(parser.feed(chunk))
+        papers.extend(parser.close())
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._paper = None
+        self.total_results = None
+
+    def feed(self, data):
+        """
+        Parse another chunk of the feed.
+
+        Args:
+            data (bytes or str): Next chunk of the document
+
+        Returns:
+            list: Papers whose entries were completed by this chunk
+        """
+        self._parser.feed(data)
+        return self._read_events()
+
+    def close(self):
+        """Finish parsing and return any remaining papers."""
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self):
+        papers = []
+        for event, elem in self._parser.read_events():
+            tag = elem.tag
+            if event == "start":
+                if tag == ENTRY:
+                    self._paper = _new_paper()
+                elif self._root is None:
+                    self._root = elem
+                continue
+
+            paper = self._paper
+            if paper is None:
+                if tag == OPENSEARCH + "totalResults" and elem.text:
+                    self.total_results = int(elem.text)
+                continue
+
+            if tag == ENTRY:
+                # Dates are parsed once here, so sorting and filtering never re-parse them
+                paper["published_ts"] = date_key(paper["published"])
+                paper["updated_ts"] = date_key(paper["updated"])
+                # Canonical identity, so clients can tell versions of one paper from different papers
+                if paper["id"]:
+                    paper["arxiv_id"], paper["version"] = split_arxiv_id(paper["id"])
+                papers.append(paper)
+                self._paper = None
+                elem.clear()
+                self._root.remove(elem)
+            elif tag in TEXT_FIELDS:
+                if elem.text:
+                    paper[TEXT_FIELDS[tag]] = elem.text.strip()
+            elif tag == ATOM + "title":
+                if elem.text:
+                    paper["title"] = " ".join(elem.text.split())
+            elif tag == AUTHOR_NAME:
+                if elem.text:
+                    paper["authors"].append(elem.text)
+            elif tag == ATOM + "category":
+                term = elem.get("term")
+                if term:
+                    paper["categories"].append(term)
+            elif tag == ARXIV + "primary_category":
+                paper["primary_category"] = elem.get("term")
+            elif tag == ATOM + "link":
+                if elem.get("title") == "pdf":
+                    paper["pdf_url"] = elem.get("href")
+        return papers
+
+
+def parse_feed(data):
+    """
+    Parse a complete arXiv Atom feed.
+
+    Args:
+        data (bytes or str): Atom XML document
+
+    Returns:
+        list: List of paper dictionaries ([] if the XML is malformed)
+    """
+    parser = AtomParser()
+    try:
+        return parser.feed(data) + parser.close()
+    except ET.ParseError as e:
+        logger.error(f"XML parsing error: {e}")
+        return []
@@ -0,0 +1,100 @@
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# arXiv asks API clients to wait ~3 seconds between requests
+ARXIV_REQUEST_INTERVAL = float(os.getenv("ARXIV_REQUEST_INTERVAL", "3"))
+
+# Request priorities (lower runs first)
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+class RequestScheduler:
+    """
+    Token-bucket pacer with a priority queue for outbound arXiv requests.
+
+    Callers await ``acquire(priority)`` before each request. Tokens refill at
+    one per ``interval`` seconds (up to ``burst``), and when several callers
+    are waiting the one with the lowest priority value (then the oldest) gets
+    the next token, so interactive searches overtake background prefetches.
+
+    Args:
+        interval (float): Seconds per token; 0 disables pacing
+        burst (int): Maximum number of tokens that can accumulate
+    """
+
+    def __init__(self, interval=ARXIV_REQUEST_INTERVAL, burst=1):
+        self.interval = interval
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queue = []
+        self._seq = itertools.count()
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+        self._updated = now
+
+    async def acquire(self, priority=INTERACTIVE):
+        """
+        Wait until this caller may send a request.
+
+        Args:
+            priority (int): INTERACTIVE, BACKGROUND or any int (lower first)
+        """
+        started = time.monotonic()
+        if self.interval > 0:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1 and self._queue[0] == entry:
+                        heapq.heappop(self._queue)
+                        self._tokens -= 1
+                        break
+                    if self._tokens >= 1:
+                        # A token is free but another waiter is ahead: let it run
+                        await asyncio.sleep(0.001)
+                    else:
+                        await asyncio.sleep((1 - self._tokens) * self.interval)
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                raise
+
+        wait = time.monotonic() - started
+        self.granted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait > self.interval:
+            logger.debug(f"arXiv request (priority {priority}) waited {wait:.2f}s for a slot")
+
+    def stats(self):
+        """Return queue depth and wait-time counters."""
+        by_priority = {}
+        for priority, _ in self._queue:
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+        return {
+            "interval_s": self.interval,
+            "queue_depth": len(self._queue),
+            "queue_depth_by_priority": by_priority,
+            "granted": self.granted,
+            "avg_wait_ms": round(self.total_wait / self.granted * 1000, 1) if self.granted else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+# Process-wide scheduler shared by every ArxivScraper unless one is passed in
+default_scheduler = RequestScheduler()
@@ -0,0 +1,243 @@
+import os
+import time
+import asyncio
+import httpx
+import logging
+import xml.etree.ElementTree as ET
+from backoff import expo, on_exception
+
+from backend.arxiv_scraper.parser import AtomParser, parse_feed
+from backend.arxiv_scraper.scheduler import INTERACTIVE, default_scheduler
+from backend.metrics import UPSTREAM_BYTES, UPSTREAM_REQUESTS, record, span
+
+logger = logging.getLogger(__name__)
+
+ARXIV_API_URL = os.getenv("ARXIV_API_URL", "http://export.arxiv.org/api/query")
+
+# Statuses arXiv returns when it is throttling us
+RETRY_STATUSES = {429, 503}
+
+# Longest search_query sent upstream; longer OR-ed queries are split
+MAX_QUERY_LENGTH = int(os.getenv("ARXIV_MAX_QUERY_LENGTH", "1000"))
+
+# IDs per id_list request (keeps the query URL well under common length limits)
+ID_LIST_CHUNK = int(os.getenv("ARXIV_ID_LIST_CHUNK", "200"))
+
+
+def _should_give_up(error):
+    """Retry connection errors and throttling responses, give up on anything else"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code not in RETRY_STATUSES
+    return False
+
+
+def author_query(author):
+    """Build the arXiv search query for an author name"""
+    return f"au:{author}"
+
+
+def authors_queries(authors, max_length=MAX_QUERY_LENGTH):
+    """
+    Pack several authors into as few OR-ed arXiv queries as max_length allows.
+
+    Multi-word names are quoted so each name is matched as a phrase.
+
+    Args:
+        authors (list): Author names
+        max_length (int): Longest query string to produce
+
+    Returns:
+        list: Query strings
+    """
+    queries, terms = [], []
+    for author in dict.fromkeys(" ".join(a.split()) for a in authors if a.strip()):
+        term = f'au:"{author}"' if " " in author else f"au:{author}"
+        if terms and len(" OR ".join(terms + [term])) > max_length:
+            queries.append(" OR ".join(terms))
+            terms = []
+        terms.append(term)
+    if terms:
+        queries.append(" OR ".join(terms))
+    return queries
+
+
+def category_query(categories=None):
+    """Build the arXiv search query for a list of categories (all when empty)"""
+    if categories:
+        return " OR ".join([f"cat:{c}" for c in categories])
+    return "cat:*"
+
+
+class ArxivScraper:
+    """Async arXiv API client sharing one pooled HTTP connection pool.
+
+    All requests go through a single ``httpx.AsyncClient`` so concurrent
+    searches reuse keep-alive connections and never block the event loop,
+    and every request first waits for a slot from the rate-limiting
+    scheduler (the process-wide one unless ``scheduler`` is given).
+    """
+
+    def __init__(self, base_url=ARXIV_API_URL, client=None, max_connections=10, scheduler=None):
+        self.base_url = base_url
+        self.scheduler = scheduler or default_scheduler
+        self.client = client or httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    @on_exception(expo, (httpx.RequestError, httpx.HTTPStatusError), max_tries=3, giveup=_should_give_up)
+    async def search(self, query, max_results=50, start=0, sort_by=None, sort_order="descending",
+                     priority=INTERACTIVE, id_list=None):
+        """
+        Run a raw arXiv API search query.
+
+        Args:
+            query (str): arXiv search query (e.g. 'au:Bengio' or 'cat:cs.LG'), may be empty with id_list
+            max_results (int): Maximum number of results to return
+            start (int): Offset of the first result
+            sort_by (str): Optional sort field ('relevance', 'lastUpdatedDate', 'submittedDate')
+            sort_order (str): 'ascending' or 'descending'
+            priority (int): Scheduler priority (INTERACTIVE or BACKGROUND)
+            id_list (list): Optional arXiv IDs to restrict the results to
+
+        Returns:
+            list: List of paper dictionaries
+        """
+        params = {"start": start, "max_results": max_results}
+        if query:
+            params["search_query"] = query
+        if id_list:
+            params["id_list"] = ",".join(id_list)
+        if sort_by:
+            params["sortBy"] = sort_by
+            params["sortOrder"] = sort_order
+
+        with span("queue"):
+            await self.scheduler.acquire(priority)
+        logger.debug(f"Querying arXiv API: {query or f'{len(id_list)} IDs'} (start={start}, max_results={max_results})")
+        # Parse the feed incrementally while the body is still downloading
+        parser = AtomParser()
+        papers = []
+        parse_s = 0.0
+        outcome = "error"
+        try:
+            with span("upstream"):
+                async with self.client.stream("GET", self.base_url, params=params) as response:
+                    outcome = str(response.status_code)
+                    response.raise_for_status()
+                    try:
+                        async for chunk in response.aiter_bytes():
+                            UPSTREAM_BYTES.inc(len(chunk))
+                            started = time.perf_counter()
+                            papers.extend(parser.feed(chunk))
+                            parse_s += time.perf_counter() - started
+                        started = time.perf_counter()
+                        papers.extend(parser.close())
+                        parse_s += time.perf_counter() - started
+                    except ET.ParseError as e:
+                        outcome = "parse_error"
+                        logger.error(f"XML parsing error: {e}")
+                        return []
+        finally:
+            UPSTREAM_REQUESTS.inc(outcome=outcome)
+            record("parse", parse_s)
+        return papers
+
+    async def iter_search(self, query, max_results=50, page_size=100, start=0, sort_by=None,
+                          sort_order="descending", priority=INTERACTIVE):
+        """
+        Run a search page by page, yielding each page as soon as it is parsed.
+
+        Args:
+            query (str): arXiv search query
+            max_results (int): Maximum number of results over all pages
+            page_size (int): Results requested per upstream call
+            start (int): Offset of the first result
+            sort_by (str): Optional sort field
+            sort_order (str): 'ascending' or 'descending'
+            priority (int): Scheduler priority
+
+        Yields:
+            list: One page of paper dictionaries
+        """
+        fetched = 0
+        while fetched < max_results:
+            size = min(page_size, max_results - fetched)
+            page = await self.search(query, max_results=size, start=start + fetched,
+                                     sort_by=sort_by, sort_order=sort_order, priority=priority)
+            if not page:
+                return
+            yield page
+            fetched += len(page)
+            if len(page) < size:
+                return
+
+    async def fetch_by_author(self, author, max_results=50, priority=INTERACTIVE):
+        """
+        Fetch papers by a specific author.
+
+        Args:
+            author (str): Author name
+            max_results (int): Maximum number of results to return
+            priority (int): Scheduler priority
+
+        Returns:
+            list: List of paper dictionaries
+        """
+        return await self.search(author_query(author), max_results=max_results, priority=priority)
+
+    async def fetch_by_ids(self, ids, chunk_size=ID_LIST_CHUNK, priority=INTERACTIVE):
+        """
+        Fetch papers by arXiv ID, as few upstream requests as possible.
+
+        IDs are sent in id_list chunks of chunk_size; the chunks are requested
+        concurrently and paced by the scheduler.
+
+        Args:
+            ids (list): arXiv IDs, optionally with a version (e.g. '2401.01234v2')
+            chunk_size (int): IDs per upstream request
+            priority (int): Scheduler priority
+
+        Returns:
+            list: List of paper dictionaries (unknown IDs are left out)
+        """
+        chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        pages = await asyncio.gather(*[
+            self.search("", max_results=len(chunk), id_list=chunk, priority=priority) for chunk in chunks
+        ])
+        return [paper for page in pages for paper in page]
+
+    async def fetch_daily_submissions(self, categories=None, max_results=50, priority=INTERACTIVE):
+        """
+        Fetch the latest submissions, optionally filtered by category.
+
+        Args:
+            categories (list): List of arXiv categories (e.g. ['cs.LG', 'stat.ML'])
+            max_results (int): Maximum number of results to return
+            priority (int): Scheduler priority
+
+        Returns:
+            list: List of paper dictionaries, newest first
+        """
+        return await self.search(
+            category_query(categories), max_results=max_results, sort_by="submittedDate", priority=priority
+        )
+
+    def _parse_results(self, xml_data):
+        """
+        Parse arXiv API XML response into a list of paper dictionaries.
+
+        Args:
+            xml_data (str or bytes): XML response from arXiv API
+
+        Returns:
+            list: List of dictionaries containing paper data
+        """
+        return parse_feed(xml_data)
+
+    async def close(self):
+        """Close the HTTP client session"""
+        await self.client.aclose()
@@ -0,0 +1,160 @@
+import os
+import time
+import asyncio
+import logging
+
+from backend.arxiv_scraper.oai import OAIClient, OAIError, oai_set
+
+logger = logging.getLogger(__name__)
+
+# Papers written per transaction; progress is checkpointed with each one
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "10000"))
+
+
+def harvest_key(set_spec, from_date=None, until=None):
+    """Key a bulk import's progress is saved under."""
+    return f"oai:{set_spec or '*'}:{from_date or ''}:{until or ''}"
+
+
+def in_categories(paper, categories):
+    """True if a paper is in any of the categories (an archive such as 'cs' matches all of its categories)."""
+    return any(c in categories or c.split(".")[0] in categories for c in paper["categories"])
+
+
+class BulkImporter:
+    """
+    Backfill the paper store from arXiv's OAI-PMH interface.
+
+    The search API caps out at a few thousand results per query, while
+    OAI-PMH lists every record of a set, about a thousand per response,
+    chained by resumption tokens. Each response is parsed while it streams
+    in. Papers are written ``batch_size`` at a time in one transaction per
+    batch, and the resumption token that follows the batch is stored in the
+    same transaction, so an interrupted import resumes from its last batch
+    without gaps or duplicates. The write of one batch overlaps with
+    downloading the next pages.
+
+    Args:
+        store (PaperStore): Where papers and progress are stored
+        client (OAIClient): OAI-PMH client
+        batch_size (int): Papers per transaction
+    """
+
+    def __init__(self, store, client=None, batch_size=IMPORT_BATCH_SIZE):
+        self.store = store
+        self.client = client or OAIClient()
+        self.batch_size = batch_size
+
+    async def run(self, categories=None, from_date=None, until=None, restart=False):
+        """
+        Import every record of the categories' OAI sets, keeping those in the categories.
+
+        Args:
+            categories (list): Category codes or archives (e.g. ['cs.LG', 'hep-th']); everything when empty
+            from_date (str): Only records changed on or after this date ('YYYY-MM-DD')
+            until (str): Only records changed on or before this date
+            restart (bool): Ignore saved progress and start from the beginning
+
+        Returns:
+            dict: OAI set -> import counters
+        """
+        sets = {}
+        for category in categories or []:
+            sets.setdefault(oai_set(category), set()).add(category)
+        if not sets:
+            sets = {None: set()}
+        results = {}
+        for set_spec, wanted in sets.items():
+            results[set_spec or "*"] = await self.import_set(set_spec, wanted, from_date, until, restart)
+        return results
+
+    async def import_set(self, set_spec, categories=(), from_date=None, until=None, restart=False):
+        """
+        Import one OAI set, resuming from saved progress.
+
+        Returns:
+            dict: Records listed, papers stored, pages and throughput of this run
+        """
+        key = harvest_key(set_spec, from_date, until)
+        state = None if restart else await asyncio.to_thread(self.store.get_import_state, key)
+        if state and state["done"]:
+            logger.info(f"Import {key} already finished ({state['records']} records); pass restart to redo it")
+            return {"records": state["records"], "stored": 0, "pages": 0, "done": True, "resumed": False}
+
+        token = state["token"] if state else None
+        records = state["records"] if state and token else 0
+        if token:
+            logger.info(f"Resuming import {key} after {records} records")
+        try:
+            return await self._import(key, set_spec, categories, from_date, until, token, records)
+        except OAIError as e:
+            if not token or e.code != "badResumptionToken":
+                raise
+            # Tokens expire; already stored papers are skipped cheaply on the second pass
+            logger.warning(f"Saved resumption token for {key} expired, starting the import over")
+            return await self._import(key, set_spec, categories, from_date, until, None, 0)
+
+    async def _import(self, key, set_spec, categories, from_date, until, token, records):
+        started = time.monotonic()
+        resumed = bool(token)
+        batch, since_checkpoint, pages, stored = [], 0, 0, 0
+        writing = None
+        total = None
+
+        async def flush(papers, checkpoint):
+            nonlocal writing, stored
+            if writing is not None:
+                stored += await writing
+            writing = asyncio.ensure_future(asyncio.to_thread(self.store.add_papers, papers, checkpoint))
+
+        async for papers, page in self.client.list_records(set_spec, from_date, until, token=token):
+            pages += 1
+            records += page.records
+            since_checkpoint += page.records
+            total = page.complete_list_size or total
+            batch.extend(p for p in papers if not categories or in_categories(p, categories))
+            if len(batch) >= self.batch_size or since_checkpoint >= self.batch_size:
+                checkpoint = {"harvest": key, "token": page.token, "records": records, "complete_list_size": total}
+                await flush(batch, checkpoint)
+                logger.info(f"Import {key}: {records}" + (f" of {total}" if total else "") + " records")
+                batch, since_checkpoint = [], 0
+
+        await flush(batch, {"harvest": key, "token": None, "records": records, "complete_list_size": total,
+                            "done": True})
+        stored += await writing
+        elapsed = time.monotonic() - started
+        logger.info(f"Import {key} finished: {records} records, {stored} papers stored in {elapsed:.0f}s")
+        return {
+            "records": records,
+            "stored": stored,
+            "pages": pages,
+            "done": True,
+            "resumed": resumed,
+            "records_per_s": round(records / elapsed) if elapsed else 0,
+        }
+
+    async def close(self):
+        await self.client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    from backend.storage import PaperStore
+
+    parser = argparse.ArgumentParser(description="Backfill the local paper store from arXiv's OAI-PMH interface")
+    parser.add_argument("categories", nargs="*", help="Category codes or archives (e.g. cs.LG hep-th); all when omitted")
+    parser.add_argument("--from", dest="from_date", help="Only records changed on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Only records changed on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--restart", action="store_true", help="Ignore saved progress")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Papers per transaction")
+    args = parser.parse_args()
+
+    async def run():
+        importer = BulkImporter(PaperStore(), batch_size=args.batch_size)
+        try:
+            print(await importer.run(args.categories, args.from_date, args.until, restart=args.restart))
+        finally:
+            await importer.close()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+
+
+def make_cache_key(endpoint, **params):
+    """
+    Build a normalized cache key for an arXiv query.
+
+    Author names are case-folded, categories are de-duplicated and sorted and
+    dict parameters (e.g. date_range) are serialized with sorted keys, so
+    equivalent requests map to the same key.
+
+    Args:
+        endpoint (str): Name of the endpoint (e.g. 'by-author')
+        **params: Query parameters
+
+    Returns:
+        str: Cache key
+    """
+    normalized = {}
+    for name, value in params.items():
+        if isinstance(value, str):
+            value = " ".join(value.split()).lower()
+        elif isinstance(value, (list, tuple, set)):
+            value = sorted({v.strip() for v in value})
+        normalized[name] = value
+    return f"{endpoint}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+class ResultCache:
+    """
+    In-memory TTL cache with LRU eviction.
+
+    Args:
+        max_entries (int): Maximum number of cached results before the least
+            recently used entry is evicted
+        default_ttl (float): TTL in seconds used when set() gets no ttl
+    """
+
+    def __init__(self, max_entries=256, default_ttl=600):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Store value under key for ttl seconds, evicting LRU entries if full."""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+        }
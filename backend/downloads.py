@@ -0,0 +1,191 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+from backoff import expo, on_exception
+
+from backend.arxiv_scraper.scheduler import INTERACTIVE, default_scheduler
+from backend.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_DIR = os.getenv("DOWNLOAD_DIR", "data/downloads")
+# Total size of cached files before the least recently used ones are evicted
+DOWNLOAD_CACHE_BYTES = int(os.getenv("DOWNLOAD_CACHE_BYTES", str(2 * 1024 ** 3)))
+# Simultaneous transfers from arXiv
+DOWNLOAD_CONCURRENCY = int(os.getenv("DOWNLOAD_CONCURRENCY", "4"))
+# arXiv asks automated clients to fetch files from the export mirror
+ARXIV_FILES_URL = os.getenv("ARXIV_FILES_URL", "https://export.arxiv.org")
+
+# URL path and file suffix for each kind of download
+KINDS = {
+    "pdf": ("pdf", ".pdf"),
+    "source": ("e-print", ".tar.gz"),
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadManager:
+    """
+    Concurrent PDF/source downloader backed by a size-capped on-disk cache.
+
+    Files are keyed by arXiv ID and version, so every version is fetched at
+    most once; concurrent requests for the same file share one transfer.
+    Transfers stream to a ``.part`` file in chunks and are limited to
+    ``concurrency`` at a time; each attempt first takes a slot from the
+    arXiv request scheduler (the process-wide one unless ``scheduler`` is
+    given), so downloads are paced together with API requests and bulk jobs
+    yield to interactive ones. An interrupted transfer resumes with a Range
+    request. When the cache grows past ``max_bytes`` the least recently
+    opened files are deleted (access order survives restarts via mtime).
+
+    Args:
+        directory (str): Cache directory
+        max_bytes (int): Cache size limit in bytes
+        concurrency (int): Maximum simultaneous transfers
+        base_url (str): Where /pdf/<id> and /e-print/<id> are served
+        client (httpx.AsyncClient): Optional client (e.g. for tests)
+        scheduler (RequestScheduler): Paces transfers
+    """
+
+    def __init__(self, directory=DOWNLOAD_DIR, max_bytes=DOWNLOAD_CACHE_BYTES, concurrency=DOWNLOAD_CONCURRENCY,
+                 base_url=ARXIV_FILES_URL, client=None, scheduler=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+        self.base_url = base_url.rstrip("/")
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(30, read=120),
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self.scheduler = scheduler or default_scheduler
+        self.flights = SingleFlight()
+        self.active = 0
+        self._slots = None
+        self._slots_loop = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_downloaded = 0
+        # Cached file name -> size, least recently used first
+        self._files = OrderedDict()
+        for path in sorted(self.directory.iterdir(), key=lambda p: p.stat().st_mtime):
+            if path.is_file() and not path.name.endswith(".part"):
+                self._files[path.name] = path.stat().st_size
+
+    def cache_bytes(self):
+        return sum(self._files.values())
+
+    def path_for(self, arxiv_id, version, kind="pdf"):
+        """Cache path of one version of a paper's PDF or source archive."""
+        _, suffix = KINDS[kind]
+        return self.directory / f"{arxiv_id.replace('/', '_')}v{version}{suffix}"
+
+    async def get(self, arxiv_id, version, kind="pdf", priority=INTERACTIVE):
+        """
+        Return the local path of a file, downloading it first if needed.
+
+        Args:
+            arxiv_id (str): arXiv ID without version
+            version (int): Version number
+            kind (str): 'pdf' or 'source'
+            priority (int): Scheduler priority of the transfer (BACKGROUND for jobs)
+
+        Returns:
+            Path: File in the cache
+        """
+        path = self.path_for(arxiv_id, version, kind)
+        if path.name in self._files and path.exists():
+            self.hits += 1
+            self._touch(path)
+            return path
+        self.misses += 1
+        return await self.flights.do(path.name, lambda: self._download(arxiv_id, version, kind, path, priority))
+
+    def _touch(self, path):
+        self._files.move_to_end(path.name)
+        now = time.time()
+        os.utime(path, (now, now))
+
+    def _transfer_slots(self):
+        # A Semaphore binds to the event loop it first waits on, so make one per loop
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    async def _download(self, arxiv_id, version, kind, path, priority):
+        async with self._transfer_slots():
+            self.active += 1
+            try:
+                url = f"{self.base_url}/{KINDS[kind][0]}/{arxiv_id}v{version}"
+                await self._transfer(url, path, priority)
+            finally:
+                self.active -= 1
+        self._files[path.name] = path.stat().st_size
+        self._files.move_to_end(path.name)
+        self._evict(keep=path.name)
+        return path
+
+    @on_exception(expo, (httpx.RequestError, httpx.HTTPStatusError), max_tries=3,
+                  giveup=lambda e: isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500)
+    async def _transfer(self, url, path, priority):
+        """Stream url into path, resuming a partial download if one exists."""
+        await self.scheduler.acquire(priority)
+        part = path.with_name(path.name + ".part")
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416:
+                # The partial file is already complete
+                part.replace(path)
+                return
+            response.raise_for_status()
+            resumed = offset and response.status_code == 206
+            if offset and not resumed:
+                logger.debug(f"Server ignored Range for {url}, restarting download")
+            with open(part, "ab" if resumed else "wb") as f:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    f.write(chunk)
+                    self.bytes_downloaded += len(chunk)
+        part.replace(path)
+        logger.info(f"Downloaded {url} ({path.stat().st_size} bytes)")
+
+    def _evict(self, keep=None):
+        total = self.cache_bytes()
+        for name in list(self._files):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            total -= self._files.pop(name)
+            (self.directory / name).unlink(missing_ok=True)
+            self.evictions += 1
+            logger.debug(f"Evicted {name} from the download cache")
+
+    def stats(self):
+        """Return cache and transfer counters."""
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self._files),
+            "bytes": self.cache_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "active": self.active,
+            "bytes_downloaded": self.bytes_downloaded,
+        }
+
+    async def close(self):
+        """Close the HTTP client session"""
+        await self.client.aclose()
@@ -0,0 +1,186 @@
+import os
+import json
+import zlib
+import contextvars
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from backend.metrics import span
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: clients asking for msgpack get JSON
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # optional: clients accepting br get gzip
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1000"))
+# gzip level 6 and brotli quality 5 are within a few percent of the maximum ratio at a fraction of the CPU
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+MSGPACK_TYPE = "application/msgpack"
+
+# Already-compressed responses are passed through as they are
+INCOMPRESSIBLE_TYPES = ("application/pdf", "application/gzip", "application/x-gzip", "image/", "text/event-stream")
+
+# Accept header of the request being handled, for content negotiation in PaperResponse
+request_accept = contextvars.ContextVar("request_accept", default="")
+
+
+def dumps(content):
+    """Serialize to compact UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def accepts(header, coding):
+    """True if an Accept / Accept-Encoding header lists coding without q=0."""
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        if name.strip() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class PaperResponse(Response):
+    """
+    JSON or msgpack response for plain dicts and lists.
+
+    The body is serialized directly (orjson when available), skipping
+    FastAPI's ``jsonable_encoder`` pass over every value, which dominates
+    the cost of returning large paper lists. Clients sending
+    ``Accept: application/msgpack`` get msgpack when it is installed.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content, status_code=200, headers=None):
+        media_type = self.media_type
+        if msgpack is not None and accepts(request_accept.get(), MSGPACK_TYPE):
+            media_type = MSGPACK_TYPE
+        super().__init__(content, status_code, headers, media_type)
+
+    def render(self, content):
+        with span("serialize"):
+            if self.media_type == MSGPACK_TYPE:
+                return msgpack.packb(content, use_bin_type=True)
+            return dumps(content)
+
+
+class _Compressor:
+    """Streaming gzip or brotli compressor with a flush per chunk."""
+
+    def __init__(self, coding):
+        self.coding = coding
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, final):
+        with span("compress"):
+            return self._compress(data, final)
+
+    def _compress(self, data, final):
+        if self.coding == "br":
+            return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client prefers.
+
+    Brotli is used when the client accepts it and the ``brotli`` package is
+    installed, gzip otherwise. Small bodies, already-compressed content and
+    responses that set their own Content-Encoding are passed through.
+    Streamed (NDJSON) bodies are compressed chunk by chunk with a flush
+    after each one, so clients still see every paper as soon as it is sent.
+
+    Args:
+        app: ASGI application
+        minimum_size (int): Smallest body worth compressing
+    """
+
+    def __init__(self, app, minimum_size=COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    def choose_coding(self, accept_encoding):
+        if brotli is not None and accepts(accept_encoding, "br"):
+            return "br"
+        if accepts(accept_encoding, "gzip"):
+            return "gzip"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        token = request_accept.set(request_headers.get("accept", ""))
+        try:
+            coding = self.choose_coding(request_headers.get("accept-encoding", ""))
+            if coding is None:
+                await self.app(scope, receive, send)
+            else:
+                await self.app(scope, receive, self._compressing_send(send, coding))
+        finally:
+            request_accept.reset(token)
+
+    def _compressing_send(self, send, coding):
+        start = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if ("content-encoding" in headers or message["status"] == 206
+                        or content_type.startswith(INCOMPRESSIBLE_TYPES)):
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether it is worth compressing
+                    start = message
+                return
+            if message["type"] != "http.response.body" or (start is None and compressor is None):
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if len(body) < self.minimum_size and not more_body:
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+                compressor = _Compressor(coding)
+                headers["Content-Encoding"] = coding
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                body = compressor.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+            else:
+                body = compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        return send_compressed
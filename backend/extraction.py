@@ -0,0 +1,195 @@
+import os
+import time
+import signal
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Extraction processes (defaults to one per core)
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+# Seconds a single PDF may take before it is abandoned
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "120"))
+# Documents submitted to the pool at once; further callers wait (backpressure)
+EXTRACT_MAX_PENDING = int(os.getenv("EXTRACT_MAX_PENDING", "0")) or 2 * EXTRACT_WORKERS
+
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised in a pool process when a document exceeds its time budget.
+
+    A BaseException so that pypdf's ``except Exception`` recovery paths
+    cannot swallow it and return a partial text.
+    """
+
+
+def _alarm(signum, frame):
+    raise ExtractionTimeout()
+
+
+def extract_pdf_text(path, timeout=None):
+    """
+    Extract the text of a PDF, page by page. Runs in a pool process.
+
+    Args:
+        path (str): PDF file
+        timeout (float): Seconds before ExtractionTimeout is raised (POSIX only)
+
+    Returns:
+        tuple: (text, number of pages)
+    """
+    import pypdf
+
+    # pypdf logs a warning for every font it cannot fully decode
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        reader = pypdf.PdfReader(path)
+        pages = [page.extract_text() or "" for page in reader.pages]
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return "\n\n".join(pages), len(pages)
+
+
+class TextExtractor:
+    """
+    Full-text extraction for downloaded PDFs on a process pool.
+
+    Parsing PDFs is CPU-bound, so it runs in ``workers`` separate processes
+    instead of on the event loop. At most ``max_pending`` documents are
+    accepted at once; further callers wait, so a large batch doesn't queue
+    every document (and its result) in memory. Of those, at most
+    ``workers`` are in the pool, so a document starts as soon as it is
+    submitted and its ``timeout`` seconds are spent on it alone. A process
+    that overruns its alarm is killed and the pool restarted. Results are
+    written to the paper store.
+
+    Args:
+        store (PaperStore): Where extracted texts are saved
+        workers (int): Pool processes
+        timeout (float): Per-document time limit in seconds
+        max_pending (int): Documents in the pool at once
+    """
+
+    def __init__(self, store, workers=EXTRACT_WORKERS, timeout=EXTRACT_TIMEOUT, max_pending=EXTRACT_MAX_PENDING):
+        self.store = store
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.pending = 0
+        self.documents = 0
+        self.pages = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.busy_s = 0.0
+        self._busy_since = None
+        self._pool = None
+        self._slots_loop = None
+
+    def _slots(self):
+        # Semaphores bind to the event loop they first wait on, so make new ones per loop
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._accepted = asyncio.Semaphore(self.max_pending)
+            self._in_pool = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._accepted, self._in_pool
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Spawned rather than forked: the API process has threads and open connections
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def extract(self, arxiv_id, version, path):
+        """
+        Extract one PDF and store its text.
+
+        Args:
+            arxiv_id (str): arXiv ID without version
+            version (int): Version the PDF belongs to
+            path (str): Downloaded PDF
+
+        Returns:
+            int: Number of pages, or None if extraction failed or timed out
+        """
+        accepted, in_pool = self._slots()
+        async with accepted:
+            self.pending += 1
+            if self.pending == 1:
+                self._busy_since = time.monotonic()
+            try:
+                async with in_pool:
+                    result = await self._run(arxiv_id, version, path)
+                if result is None:
+                    return None
+                text, pages = result
+                await asyncio.to_thread(self.store.save_texts, [(arxiv_id, version, pages, text)])
+            finally:
+                self.pending -= 1
+                if self.pending == 0:
+                    self.busy_s += time.monotonic() - self._busy_since
+
+        self.documents += 1
+        self.pages += pages
+        return pages
+
+    async def _run(self, arxiv_id, version, path):
+        """Run one document in the pool; returns (text, pages) or None."""
+        pool = self._get_pool()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(pool, extract_pdf_text, str(path), self.timeout)
+            # The pool process enforces the timeout; this is a backstop if it cannot
+            return await asyncio.wait_for(future, self.timeout + 5)
+        except ExtractionTimeout:
+            self.timeouts += 1
+            logger.warning(f"Text extraction of {arxiv_id}v{version} timed out after {self.timeout}s")
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.error(f"Extraction process for {arxiv_id}v{version} ignored its alarm, restarting the pool")
+            self._restart_pool(pool, kill=True)
+        except BrokenProcessPool:
+            self.failures += 1
+            logger.error(f"Extraction pool crashed on {arxiv_id}v{version}, restarting it")
+            self._restart_pool(pool)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Text extraction of {arxiv_id}v{version} failed: {e}")
+        return None
+
+    def _restart_pool(self, pool, kill=False):
+        # Another document may already have replaced the broken pool
+        if self._pool is pool:
+            self._pool = None
+        if kill:
+            # A hung process would otherwise keep its worker slot forever
+            for process in (getattr(pool, "_processes", None) or {}).values():
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """Return throughput and failure counters."""
+        busy_s = self.busy_s + (time.monotonic() - self._busy_since if self.pending else 0)
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "documents": self.documents,
+            "pages": self.pages,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "busy_s": round(busy_s, 1),
+            "pages_per_s": round(self.pages / busy_s, 1) if busy_s else 0.0,
+        }
+
+    def close(self):
+        """Stop the pool, abandoning queued documents."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
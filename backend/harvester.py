@@ -0,0 +1,167 @@
+import time
+import asyncio
+import logging
+
+from backend.arxiv_scraper import BACKGROUND, category_query
+
+logger = logging.getLogger(__name__)
+
+# Key used for the harvest state of the unfiltered (all categories) feed
+ALL_CATEGORIES = "*"
+
+
+class DailyHarvester:
+    """
+    Incrementally harvest new arXiv submissions into the local paper store.
+
+    For each category the harvester remembers the newest ``updated``
+    timestamp it has seen (the watermark). A harvest walks the category
+    newest-first by lastUpdatedDate and stops at the first page that reaches
+    the watermark, so upstream traffic is proportional to new papers.
+
+    A walk that runs out of ``max_results`` first (after downtime, or on a
+    busy category) keeps the old watermark and saves how far it got. The
+    next harvest fetches the papers updated since then and continues from
+    that offset, and only moves the watermark once the walk reaches it.
+    Papers updated meanwhile move to the top of the listing, so the saved
+    offset can only make the walk re-read papers, never skip them.
+
+    Args:
+        scraper (ArxivScraper): arXiv client
+        store (PaperStore): Local paper store holding papers and watermarks
+        page_size (int): Results per upstream call
+        initial_results (int): Papers fetched for a category with no watermark
+        max_results (int): Upper bound on papers fetched in one harvest
+    """
+
+    def __init__(self, scraper, store, page_size=100, initial_results=200, max_results=2000):
+        self.scraper = scraper
+        self.store = store
+        self.page_size = page_size
+        self.initial_results = initial_results
+        self.max_results = max_results
+
+    async def harvest_category(self, category, priority=BACKGROUND):
+        """
+        Fetch papers updated since the category's watermark.
+
+        Args:
+            category (str): arXiv category code, or ALL_CATEGORIES
+            priority (int): Scheduler priority for the upstream calls
+
+        Returns:
+            int: Number of new or updated papers stored
+        """
+        watermark, _ = await asyncio.to_thread(self.store.get_harvest_state, category)
+        resume = await asyncio.to_thread(self.store.get_harvest_resume, category)
+        query = category_query([] if category == ALL_CATEGORIES else [category])
+
+        if watermark is None:
+            # First harvest: just the most recent papers, the watermark goes to the newest
+            _, stored, newest, _ = await self._walk(query, 0, self.initial_results, None, priority)
+            reached = True
+        elif resume:
+            resume_at, resume_newest = resume
+            # Papers updated since the interrupted walk are listed above it now
+            walked, stored, newest, caught_up = await self._walk(query, 0, self.max_results, resume_newest, priority)
+            newest = newest or resume_newest
+            reached = False
+            if caught_up:
+                more, more_stored, _, reached = await self._walk(
+                    query, resume_at, self.max_results - walked, watermark, priority)
+                stored += more_stored
+                resume_at += more
+            else:
+                # Still behind at the top: walk it again next time rather than leave a gap
+                newest = resume_newest
+        else:
+            walked, stored, newest, reached = await self._walk(query, 0, self.max_results, watermark, priority)
+            resume_at = walked
+        newest = newest or watermark
+
+        if reached:
+            await asyncio.to_thread(self.store.set_harvest_state, category, newest, time.time())
+            logger.info(f"Harvested {category}: {stored} new or updated papers (watermark {newest})")
+        else:
+            await asyncio.to_thread(self.store.set_harvest_state, category, watermark, time.time(),
+                                    (resume_at, newest))
+            logger.info(f"Harvested {category}: {stored} new or updated papers, stopped before the watermark "
+                        f"{watermark}; resuming at offset {resume_at}")
+        return stored
+
+    async def _walk(self, query, start, limit, watermark, priority):
+        """
+        Store papers newest-first from start until one older than watermark or limit papers.
+
+        Returns:
+            tuple: (papers walked down to the watermark, papers stored, newest 'updated' seen, whether the walk reached
+                the watermark or the end of the listing)
+        """
+        walked = stored = 0
+        newest = None
+        if limit <= 0:
+            return walked, stored, newest, False
+        async for page in self.scraper.iter_search(query, max_results=limit, page_size=self.page_size, start=start,
+                                                   sort_by="lastUpdatedDate", priority=priority):
+            # >= so papers sharing the watermark's timestamp aren't skipped; re-storing is a no-op
+            fresh = [p for p in page if p["updated"] and (watermark is None or p["updated"] >= watermark)]
+            walked += len(fresh)
+            if fresh:
+                stored += await asyncio.to_thread(self.store.add_papers, fresh)
+                newest = max([newest or ""] + [p["updated"] for p in fresh])
+            if len(fresh) < len(page):
+                return walked, stored, newest, True
+        # iter_search stops early when the listing runs out
+        return walked, stored, newest, walked < limit
+
+    async def refresh(self, categories=None, max_age=600, priority=BACKGROUND, coalesce=None):
+        """
+        Harvest every category whose last harvest is older than max_age.
+
+        Args:
+            categories (list): Category codes; all categories when empty
+            max_age (float): Seconds a harvest stays fresh
+            priority (int): Scheduler priority for the upstream calls
+            coalesce (SingleFlight): Optional single-flight group so concurrent
+                refreshes of the same category share one harvest
+
+        Returns:
+            dict: Category -> number of papers stored (stale categories only)
+        """
+        categories = categories or [ALL_CATEGORIES]
+        now = time.time()
+        stale = []
+        for category in dict.fromkeys(categories):
+            _, harvested_at = await asyncio.to_thread(self.store.get_harvest_state, category)
+            if harvested_at is None or now - harvested_at > max_age:
+                stale.append(category)
+
+        async def harvest(category):
+            if coalesce is None:
+                return await self.harvest_category(category, priority)
+            return await coalesce.do(f"harvest:{category}", lambda: self.harvest_category(category, priority))
+
+        counts = await asyncio.gather(*[harvest(category) for category in stale])
+        return dict(zip(stale, counts))
+
+
+if __name__ == "__main__":
+    import argparse
+    from backend.arxiv_scraper import ArxivScraper
+    from backend.storage import PaperStore
+
+    parser = argparse.ArgumentParser(description="Harvest new arXiv papers into the local paper store")
+    parser.add_argument("categories", nargs="*", help="Category codes (e.g. cs.LG hep-th); all when omitted")
+    args = parser.parse_args()
+
+    async def run():
+        scraper = ArxivScraper()
+        harvester = DailyHarvester(scraper, PaperStore())
+        try:
+            for category in args.categories or [ALL_CATEGORIES]:
+                await harvester.harvest_category(category)
+        finally:
+            await scraper.close()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+import calendar
+from datetime import datetime
+
+from backend.arxiv_scraper.parser import date_key
+
+# Sortable fields and their key functions (dates use the keys computed at ingest)
+SORT_KEYS = {
+    "published": lambda paper: paper.get("published_ts") or date_key(paper.get("published")),
+    "updated": lambda paper: paper.get("updated_ts") or date_key(paper.get("updated")),
+    "title": lambda paper: (paper.get("title") or "").casefold(),
+}
+
+# Accepted forms of a date filter bound
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M", "%Y-%m-%dT%H:%M:%S")
+
+
+def parse_date(value):
+    """
+    Parse a date filter bound.
+
+    Args:
+        value (str): 'YYYY-MM-DD' or a timestamp such as '2024-01-02T09:30:00Z'
+
+    Returns:
+        int: Seconds since 1970-01-01 UTC
+
+    Raises:
+        ValueError: If value is not a valid date or timestamp
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value.removesuffix("Z"), fmt)
+        except ValueError:
+            continue
+        return calendar.timegm(parsed.timetuple())
+    raise ValueError(f"Not a date (YYYY-MM-DD) or timestamp: {value!r}")
+
+
+def list_papers(papers, sort_by=None, order="desc", categories=None, date_from=None, date_to=None,
+                date_field="published", offset=0, limit=None):
+    """
+    Filter, sort and slice a list of papers.
+
+    Args:
+        papers (list): Paper dictionaries
+        sort_by (str): 'published', 'updated', 'title', or None to keep the given order
+        order (str): 'asc' or 'desc'
+        categories (list): Keep papers in any of these categories
+        date_from (str): Keep papers dated on or after this ('YYYY-MM-DD' or a full timestamp)
+        date_to (str): Keep papers dated on or before this (a bare date includes the whole day)
+        date_field (str): Date the range applies to: 'published' or 'updated'
+        offset (int): Number of matching papers to skip
+        limit (int): Maximum number of papers to return
+
+    Returns:
+        tuple: (page of papers, number of papers matching the filters)
+
+    Raises:
+        ValueError: If date_from or date_to is malformed
+    """
+    if categories:
+        wanted = set(categories)
+        papers = [p for p in papers if wanted.intersection(p.get("categories") or ())]
+    if date_from or date_to:
+        key = SORT_KEYS[date_field]
+        low = parse_date(date_from) if date_from else 0
+        high = parse_date(date_to) + (86399 if "T" not in date_to else 0) if date_to else float("inf")
+        papers = [p for p in papers if low <= key(p) <= high]
+    if sort_by:
+        papers = sorted(papers, key=SORT_KEYS[sort_by], reverse=order == "desc")
+    end = None if limit is None else offset + limit
+    return papers[offset:end], len(papers)
+
+
+def project(papers, fields):
+    """
+    Keep only the requested fields of each paper.
+
+    Args:
+        papers (list): Paper dictionaries
+        fields (list): Field names to keep ('id' is always kept), or None/empty for everything
+
+    Returns:
+        list: Paper dictionaries with just those fields
+    """
+    if not fields:
+        return papers
+    keep = ["id"] + [field for field in fields if field != "id"]
+    return [{field: paper[field] for field in keep if field in paper} for paper in papers]
@@ -1,10 +1,109 @@
-from fastapi import FastAPI
+import os
+import asyncio
+import logging.config
+from pathlib import Path
+import httpx
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import arxiv
-from typing import List, Optional, Dict
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from typing import List, Literal, Optional, Dict
+from pydantic import BaseModel, Field
 
-app = FastAPI()
+from backend.arxiv_scraper import INTERACTIVE, ArxivScraper, author_query, authors_queries, category_query
+from backend.cache import ResultCache, make_cache_key
+from backend.downloads import DownloadManager
+from backend.encoding import CompressionMiddleware, PaperResponse
+from backend.extraction import TextExtractor
+from backend.harvester import DailyHarvester
+from backend.listing import list_papers, parse_date, project
+from backend.metrics import MetricsMiddleware, registry, span
+from backend.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, ndjson_lines
+from backend.singleflight import SingleFlight
+from backend.recommend import (
+    PAPER_INDEX_DIR, SIMILAR_INDEX_DIR, PaperIndex, SimilarityIndex, embed_paper, profile_tokens, sync_index,
+    sync_similar,
+)
+from backend.storage import PaperStore, ProfileStore
+from backend.arxiv_scraper.ids import latest_versions, parse_arxiv_id, split_arxiv_id, versioned_id
+from worker import Worker
+from worker.tasks import TASKS
+
+# Logging setup (handlers, formats, levels); set LOGGING_CONFIG to use another file
+LOGGING_CONFIG = os.getenv("LOGGING_CONFIG", str(Path(__file__).resolve().parent.parent / "config/logging.conf"))
+if os.path.exists(LOGGING_CONFIG):
+    logging.config.fileConfig(LOGGING_CONFIG, disable_existing_loggers=False)
+
+# Per-endpoint cache lifetimes in seconds
+AUTHOR_CACHE_TTL = 3600
+DAILY_CACHE_TTL = 600
+# Seconds before a category's daily feed is harvested again
+HARVEST_MAX_AGE = 600
+# Local times (HH:MM, comma separated) at which profiles are prefetched ahead of peak use
+WARM_CACHE_AT = [t for t in os.getenv("WARM_CACHE_AT", "07:30").split(",") if t]
+# Local time (HH:MM) at which recommendation index segments are merged
+COMPACT_INDEX_AT = os.getenv("COMPACT_INDEX_AT", "03:00")
+
+# Shared async arXiv client (one connection pool for every request)
+scraper = ArxivScraper()
+# Recent search results, keyed by normalized query
+cache = ResultCache(max_entries=256)
+# Identical concurrent cache misses share one upstream fetch
+flights = SingleFlight()
+# Local paper store every fetched paper is written through to
+store = PaperStore()
+# Per-user research profiles
+profiles = ProfileStore()
+# Recommendation index over the paper store, updated incrementally as papers are stored
+paper_index = PaperIndex.open(PAPER_INDEX_DIR)
+store.listeners.append(lambda papers: paper_index.add(papers))
+# "Similar papers" nearest-neighbour index over title and abstract embeddings, weighted by the above's IDF
+similar_index = SimilarityIndex.open(SIMILAR_INDEX_DIR)
+# Pulls only new daily submissions into the store
+harvester = DailyHarvester(scraper, store)
+# PDFs and source archives, cached on disk by arXiv ID and version; transfers share the scraper's pacing
+downloads = DownloadManager(scheduler=scraper.scheduler)
+# Full text of downloaded PDFs, extracted on a process pool
+extractor = TextExtractor(store)
+# Background jobs (prefetching, cache warming) run on the app's event loop, queued in a database all processes share
+worker = Worker(TASKS)
+for at in WARM_CACHE_AT:
+    worker.schedule_daily(at, "prefetch_profiles")
+worker.schedule_daily(COMPACT_INDEX_AT, "compact_index")
+
+def queue_once(task):
+    """Queue a parameterless maintenance job unless one is already queued or running"""
+    if not worker.unfinished(task):
+        worker.submit(task)
+
+def index_similar(papers):
+    """Store listener: embed stored papers, queueing a rebuild once enough are pending"""
+    similar_index.add(papers, paper_index.idf())
+    if similar_index.needs_rebuild() and not similar_index.building:
+        queue_once("build_similar_index")
+
+store.listeners.append(index_similar)
+
+# Largest number of IDs accepted by one batch lookup
+MAX_BATCH_IDS = 2000
+# Largest k accepted by the recommendation and similar-papers endpoints
+MAX_K = 200
+
+# arXiv query prefixes for each local search field
+ARXIV_FIELD_PREFIXES = {"all": "all", "title": "ti", "abstract": "abs", "author": "au"}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await worker.start()
+    yield
+    await worker.stop()
+    await scraper.close()
+    await downloads.close()
+    extractor.close()
+    store.close()
+    profiles.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,74 +112,500 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# gzip/brotli for every response; also records the Accept header PaperResponse negotiates on
+app.add_middleware(CompressionMiddleware)
+# Outermost, so latency and response bytes cover compression too
+app.add_middleware(MetricsMiddleware)
+
+# Existing component counters, read when /metrics is scraped
+registry.callback("cache_hits_total", "Result cache hits", lambda: cache.hits, kind="counter")
+registry.callback("cache_misses_total", "Result cache misses", lambda: cache.misses, kind="counter")
+registry.callback("cache_entries", "Entries in the result cache", lambda: len(cache))
+registry.callback("singleflight_saved_calls_total", "Upstream calls saved by coalescing",
+                  lambda: flights.shared, kind="counter")
+registry.callback("arxiv_queue_depth", "Requests waiting for an arXiv rate-limit slot",
+                  lambda: scraper.scheduler.stats()["queue_depth"])
+registry.callback("arxiv_queue_wait_seconds_total", "Time requests waited for an arXiv slot",
+                  lambda: round(scraper.scheduler.total_wait, 6), kind="counter")
+registry.callback("download_cache_bytes", "Bytes in the PDF/source download cache", lambda: downloads.cache_bytes())
+registry.callback("download_cache_lookups_total", "Download cache lookups",
+                  lambda: {"hit": downloads.hits, "miss": downloads.misses}, kind="counter", labelnames=("result",))
+registry.callback("download_bytes_total", "Bytes downloaded from arXiv file servers",
+                  lambda: downloads.bytes_downloaded, kind="counter")
+registry.callback("extracted_pages_total", "PDF pages extracted", lambda: extractor.pages, kind="counter")
+registry.callback("index_papers", "Papers in the recommendation index", lambda: len(paper_index))
+registry.callback("similar_index_papers", "Papers in the similar-papers index", lambda: len(similar_index))
+registry.callback("similar_index_pending", "Papers not yet in the similar-papers index's lists",
+                  lambda: similar_index.pending)
+registry.callback("jobs", "Background jobs by status", lambda: worker.counts(), labelnames=("status",))
+
+class PageOptions(BaseModel):
+    # Cursor pagination: set page_size (and pass back next_cursor) to page through results
+    page_size: Optional[int] = None
+    cursor: Optional[str] = None
+    # Streaming: send papers as NDJSON while arXiv pages are parsed
+    stream: bool = False
+
+class ListOptions(BaseModel):
+    # Server-side sorting, filtering and slicing of the fetched papers
+    sort_by: Optional[Literal["published", "updated", "title"]] = None
+    order: Literal["asc", "desc"] = "desc"
+    filter_categories: List[str] = []
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    date_field: Literal["published", "updated"] = "published"
+    offset: int = Field(0, ge=0)
+    limit: Optional[int] = Field(None, ge=0)
+    # Projection: return only these paper fields (e.g. ["title"] for a compact list)
+    fields: List[str] = []
 
-class AuthorSearchRequest(BaseModel):
+class AuthorSearchRequest(PageOptions, ListOptions):
     author_id: str
     max_results: int = 50
 
-class DailySearchRequest(BaseModel):
+class AuthorsFeedRequest(ListOptions):
+    authors: List[str]
+    max_results: int = 50
+
+class DailySearchRequest(PageOptions, ListOptions):
     categories: List[str] = []
     date_range: Optional[Dict] = None
+    max_results: int = 50
+
+class PaperSearchRequest(ListOptions):
+    query: str
+    field: Literal["all", "title", "abstract", "author"] = "all"
+    max_results: int = 50
+
+class BatchLookupRequest(BaseModel):
+    # arXiv IDs or abs/pdf URLs, with or without a version suffix
+    ids: List[str]
+    fields: List[str] = []
+
+class JobRequest(BaseModel):
+    task: str
+    params: Dict = {}
+
+def check_list_options(request):
+    """Reject malformed date filters, and ListOptions that need the whole result in a paged or streamed request"""
+    for value in (request.date_from, request.date_to):
+        if value:
+            try:
+                parse_date(value)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+    paged = isinstance(request, PageOptions) and (request.stream or request.page_size or request.cursor)
+    if paged and (request.sort_by or request.offset or request.limit is not None):
+        raise HTTPException(
+            status_code=400,
+            detail="sort_by, offset and limit can't be combined with page_size, cursor or stream",
+        )
+
+def filtered(papers, request):
+    """Papers of one page or streamed chunk that pass the request's category and date filters"""
+    page, _ = list_papers(
+        papers,
+        categories=request.filter_categories,
+        date_from=request.date_from,
+        date_to=request.date_to,
+        date_field=request.date_field,
+    )
+    return page
+
+def listed(papers, request, **extra):
+    """Response body for a paper list after applying the request's ListOptions"""
+    page, total = list_papers(
+        papers,
+        sort_by=request.sort_by,
+        order=request.order,
+        categories=request.filter_categories,
+        date_from=request.date_from,
+        date_to=request.date_to,
+        date_field=request.date_field,
+        offset=request.offset,
+        limit=request.limit,
+    )
+    return PaperResponse({"success": True, **extra, "papers": project(page, request.fields), "total": total})
+
+async def store_papers(papers):
+    """Write fetched papers through to the local store off the event loop"""
+    with span("store"):
+        await asyncio.to_thread(store.add_papers, papers)
+
+async def fetch_cached(key, ttl, fetch, write_through=True):
+    """Serve from cache, coalescing concurrent misses into one upstream fetch"""
+    papers = cache.get(key)
+    if papers is not None:
+        return papers
+
+    async def load():
+        papers = await fetch()
+        cache.set(key, papers, ttl=ttl)
+        if write_through:
+            await store_papers(papers)
+        return papers
+
+    return await flights.do(key, load)
+
+async def fetch_page(endpoint, query, request, ttl, sort_by=None):
+    """Fetch one cursor page of a query, capped at request.max_results overall"""
+    try:
+        start = decode_cursor(request.cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    size = min(request.page_size or DEFAULT_PAGE_SIZE, request.max_results - start)
+    if size <= 0:
+        return PaperResponse({"success": True, "papers": [], "next_cursor": None})
+
+    key = make_cache_key(endpoint, query=query, start=start, page_size=size)
+    papers = await fetch_cached(
+        key, ttl,
+        lambda: scraper.search(query, max_results=size, start=start, sort_by=sort_by),
+    )
+    next_start = start + len(papers)
+    has_more = len(papers) == size and next_start < request.max_results
+    return PaperResponse({
+        "success": True,
+        "papers": project(filtered(papers, request), request.fields),
+        "next_cursor": encode_cursor(next_start) if has_more else None,
+    })
+
+def stream_papers(query, request, sort_by=None):
+    """Stream a query as NDJSON, one arXiv page in memory at a time"""
+    pages = scraper.iter_search(
+        query,
+        max_results=request.max_results,
+        page_size=request.page_size or DEFAULT_PAGE_SIZE,
+        sort_by=sort_by,
+    )
+    lines = ndjson_lines(pages, on_page=store_papers, fields=request.fields,
+                         select=lambda page: filtered(page, request))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 @app.post("/papers/by-author")
 async def get_papers_by_author(request: AuthorSearchRequest):
-    # Dead simple author search
-    search = arxiv.Search(
-        query=f"au:{request.author_id}",
-        max_results=request.max_results
+    check_list_options(request)
+    query = author_query(request.author_id)
+    if request.stream:
+        return stream_papers(query, request)
+    if request.page_size or request.cursor:
+        return await fetch_page("by-author", query, request, AUTHOR_CACHE_TTL)
+
+    key = make_cache_key("by-author", author=request.author_id, max_results=request.max_results)
+    papers = await fetch_cached(
+        key, AUTHOR_CACHE_TTL,
+        lambda: scraper.fetch_by_author(request.author_id, max_results=request.max_results),
     )
-    papers = []
-    for result in search.results():
-        papers.append({
-            "title": result.title,
-            "authors": [author.name for author in result.authors],
-            "summary": result.summary,
-            "published": result.published.isoformat() + "Z",
-            "updated": result.updated.isoformat() + "Z" if result.updated else None,
-            "categories": result.categories,
-            "id": result.entry_id,
-            "pdf_url": result.pdf_url
-        })
-    return {"success": True, "papers": papers}
+    return listed(papers, request)
+
+@app.post("/papers/by-authors")
+async def get_papers_by_authors(request: AuthorsFeedRequest):
+    check_list_options(request)
+    # Few OR-ed queries instead of one per author; each returns its newest
+    # max_results papers, which together contain the newest max_results overall
+    async def fetch(query):
+        key = make_cache_key("by-authors", query=query, max_results=request.max_results)
+        return await fetch_cached(
+            key, AUTHOR_CACHE_TTL,
+            lambda: scraper.search(query, max_results=request.max_results, sort_by="submittedDate"),
+        )
+
+    queries = authors_queries(request.authors)
+    pages = await asyncio.gather(*[fetch(query) for query in queries])
+    # Papers co-authored by several favourites come back from several queries
+    papers = latest_versions(paper for page in pages for paper in page)
+    feed = sorted(papers, key=lambda paper: paper["published_ts"], reverse=True)
+    return listed(feed[:request.max_results], request, queries=len(queries))
+
+async def load_daily_papers(categories, max_results):
+    """Harvest new submissions for stale categories, then serve the feed from the local store"""
+    await harvester.refresh(categories, max_age=HARVEST_MAX_AGE, priority=INTERACTIVE, coalesce=flights)
+    with span("store"):
+        return await asyncio.to_thread(store.latest, categories, max_results)
 
 @app.post("/papers/daily")
 async def get_daily_papers(request: DailySearchRequest):
-    # Simple category-based search
-    if not request.categories:
-        query = "cat:*"  # All categories
-    else:
-        query = " OR ".join([f"cat:{cat}" for cat in request.categories])
-        
-    search = arxiv.Search(
-        query=query,
-        max_results=50,
-        sort_by=arxiv.SortCriterion.SubmittedDate
+    check_list_options(request)
+    query = category_query(request.categories)
+    if request.stream:
+        return stream_papers(query, request, sort_by="submittedDate")
+    if request.page_size or request.cursor:
+        return await fetch_page("daily", query, request, DAILY_CACHE_TTL, sort_by="submittedDate")
+
+    key = make_cache_key(
+        "daily", categories=request.categories, max_results=request.max_results, date_range=request.date_range
     )
-    
-    papers = []
-    for result in search.results():
-        papers.append({
-            "title": result.title,
-            "authors": [author.name for author in result.authors],
-            "summary": result.summary,
-            "published": result.published.isoformat() + "Z",
-            "updated": result.updated.isoformat() + "Z" if result.updated else None,
-            "categories": result.categories,
-            "id": result.entry_id,
-            "pdf_url": result.pdf_url
-        })
-    return {"success": True, "papers": papers}
+    papers = await fetch_cached(
+        key, DAILY_CACHE_TTL,
+        lambda: load_daily_papers(request.categories, request.max_results),
+        write_through=False,
+    )
+    return listed(papers, request)
+
+@app.post("/papers/search")
+async def search_papers(request: PaperSearchRequest):
+    check_list_options(request)
+    # Answer from the local index; only go to arXiv when nothing matches
+    with span("store"):
+        papers = await asyncio.to_thread(store.search, request.query, field=request.field,
+                                         limit=request.max_results)
+    if papers:
+        return listed(papers, request, source="local")
+    prefix = ARXIV_FIELD_PREFIXES[request.field]
+    papers = await scraper.search(f"{prefix}:{request.query}", max_results=request.max_results)
+    await store_papers(papers)
+    return listed(papers, request, source="arxiv")
+
+async def lookup_batch(ids):
+    """Resolve many IDs from the store, fetching the rest from arXiv; papers come back in request order"""
+    wanted = [parse_arxiv_id(raw) for raw in ids]
+    keys = list(dict.fromkeys(key for key in wanted if key))
+
+    # Stored papers answer unversioned requests and requests for their current version
+    resolved = {}
+
+    def resolve(paper):
+        arxiv_id, version = split_arxiv_id(paper["id"])
+        resolved[(arxiv_id, version)] = paper
+        latest = resolved.get((arxiv_id, None))
+        if latest is None or split_arxiv_id(latest["id"])[1] < version:
+            resolved[(arxiv_id, None)] = paper
+
+    with span("store"):
+        stored = await asyncio.to_thread(store.get_many, list(dict.fromkeys(arxiv_id for arxiv_id, _ in keys)))
+    for paper in stored.values():
+        resolve(paper)
+    misses = [key for key in keys if key not in resolved]
+
+    # Everything else in maximal id_list chunks
+    if misses:
+        fetched = await scraper.fetch_by_ids([versioned_id(arxiv_id, version) for arxiv_id, version in misses])
+        await store_papers(fetched)
+        for paper in fetched:
+            resolve(paper)
+
+    papers, missing = [], []
+    for raw, key in zip(ids, wanted):
+        if key in resolved:
+            papers.append(resolved[key])
+        else:
+            missing.append(raw)
+    return {
+        "success": True,
+        "papers": papers,
+        "missing": missing,
+        "sources": {"local": len(keys) - len(misses), "arxiv": len(misses)},
+    }
+
+@app.post("/papers/batch")
+async def get_papers_batch(request: BatchLookupRequest):
+    if len(request.ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} IDs per batch")
+    batch = await lookup_batch(request.ids)
+    return PaperResponse(dict(batch, papers=project(batch["papers"], request.fields)))
+
+async def resolve_version(paper_id):
+    """(arxiv_id, version) for a requested paper, looking up the current version when none is given"""
+    key = parse_arxiv_id(paper_id)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Not an arXiv ID: {paper_id}")
+    arxiv_id, version = key
+    if version:
+        return arxiv_id, version
+    paper = await asyncio.to_thread(store.get, arxiv_id)
+    if paper is None:
+        papers = await scraper.fetch_by_ids([arxiv_id])
+        if not papers:
+            raise HTTPException(status_code=404, detail=f"Unknown paper: {paper_id}")
+        await store_papers(papers)
+        paper = papers[0]
+    return arxiv_id, split_arxiv_id(paper["id"])[1]
+
+async def serve_download(paper_id, kind, media_type, disposition):
+    """Serve a PDF or source archive from the download cache"""
+    arxiv_id, version = await resolve_version(paper_id)
+    try:
+        path = await downloads.get(arxiv_id, version, kind)
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code
+        raise HTTPException(status_code=status if status < 500 else 502, detail=f"arXiv returned {status}")
+    return FileResponse(path, media_type=media_type, filename=path.name, content_disposition_type=disposition)
+
+@app.get("/papers/{paper_id:path}/pdf")
+async def get_paper_pdf(paper_id: str):
+    return await serve_download(paper_id, "pdf", "application/pdf", "inline")
+
+@app.get("/papers/{paper_id:path}/source")
+async def get_paper_source(paper_id: str):
+    return await serve_download(paper_id, "source", "application/gzip", "attachment")
+
+@app.get("/papers/{paper_id:path}/text")
+async def get_paper_text(paper_id: str):
+    text = await asyncio.to_thread(store.get_text, paper_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail=f"No extracted text for {paper_id}")
+    return {"success": True, **text}
+
+@app.get("/papers/{paper_id:path}/versions")
+async def get_paper_versions(paper_id: str):
+    key = parse_arxiv_id(paper_id)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Not an arXiv ID: {paper_id}")
+    versions = await asyncio.to_thread(store.versions, key[0])
+    if not versions:
+        raise HTTPException(status_code=404, detail=f"Unknown paper: {paper_id}")
+    return {"success": True, "arxiv_id": key[0], "versions": versions}
+
+@app.get("/papers/{paper_id:path}/similar")
+async def get_similar_papers(paper_id: str, k: int = 10, probes: Optional[int] = None):
+    # probes trades recall for latency: more inverted lists scanned find more of the true neighbours
+    key = parse_arxiv_id(paper_id)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Not an arXiv ID: {paper_id}")
+    if k < 1 or probes is not None and probes < 1:
+        raise HTTPException(status_code=400, detail="k and probes must be positive")
+    if k > MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be at most {MAX_K}")
+    arxiv_id = key[0]
+    index = await get_similar_index()
+    vector = index.vector(arxiv_id)
+    if vector is None:
+        # Not stored yet: fetch it (which indexes it) and embed it directly
+        papers = await scraper.fetch_by_ids([arxiv_id])
+        if not papers:
+            raise HTTPException(status_code=404, detail=f"Unknown paper: {paper_id}")
+        await store_papers(papers)
+        vector = embed_paper(papers[0], paper_index.idf(), index.dim)
+    with span("index"):
+        ranked = await asyncio.to_thread(index.search, vector, k, probes, [arxiv_id])
+    papers = await asyncio.to_thread(store.get_many, [similar_id for similar_id, _ in ranked])
+    return PaperResponse({
+        "success": True,
+        "arxiv_id": arxiv_id,
+        "papers": [dict(papers[similar_id], score=round(score, 4))
+                   for similar_id, score in ranked if similar_id in papers],
+    })
+
+@app.get("/papers/{paper_id:path}")
+async def get_paper(paper_id: str, fields: Optional[str] = None):
+    # Lets clients list papers with a few fields and load the rest (e.g. ?fields=summary) on demand
+    key = parse_arxiv_id(paper_id)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Not an arXiv ID: {paper_id}")
+    arxiv_id, version = key
+    paper = await asyncio.to_thread(store.get, arxiv_id)
+    if paper is None or version and split_arxiv_id(paper["id"])[1] != version:
+        papers = await scraper.fetch_by_ids([versioned_id(arxiv_id, version)])
+        if not papers:
+            raise HTTPException(status_code=404, detail=f"Unknown paper: {paper_id}")
+        await store_papers(papers)
+        paper = papers[0]
+    selected = [field.strip() for field in (fields or "").split(",") if field.strip()]
+    return PaperResponse({"success": True, "paper": project([paper], selected)[0]})
+
+@app.get("/extraction/stats")
+async def get_extraction_stats():
+    return {"success": True, "extraction": extractor.stats()}
+
+@app.get("/downloads/stats")
+async def get_download_stats():
+    return {"success": True, "downloads": downloads.stats()}
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return {"success": True, "cache": cache.stats(), "singleflight": flights.stats()}
+
+@app.get("/scheduler/stats")
+async def get_scheduler_stats():
+    return {"success": True, "scheduler": scraper.scheduler.stats()}
+
+# The (index, store) pair last checked against each other; afterwards the store listener keeps the index current
+index_checked = (None, None)
+
+async def get_paper_index():
+    """Return the recommendation index, catching up once with papers stored before it was opened"""
+    global index_checked
+    checked_index, checked_store = index_checked
+    if checked_index is not paper_index or checked_store is not store:
+        if len(paper_index) != await asyncio.to_thread(store.count):
+            await flights.do("paper-index", lambda: asyncio.to_thread(sync_index, paper_index, store))
+        index_checked = (paper_index, store)
+    if paper_index.needs_compaction() and not paper_index.compacting:
+        await asyncio.to_thread(queue_once, "compact_index")
+    return paper_index
+
+async def get_similar_index():
+    """Return the similar-papers index, catching up with the store and queueing a rebuild when it is due"""
+    index = await get_paper_index()
+    if len(similar_index) != len(index):
+        await flights.do("similar-index",
+                         lambda: asyncio.to_thread(sync_similar, similar_index, store, index.idf()))
+    if similar_index.needs_rebuild() and not similar_index.building:
+        await asyncio.to_thread(queue_once, "build_similar_index")
+    return similar_index
+
+@app.get("/recommendations/{user_id}")
+async def get_recommendations(user_id: str, k: int = 20):
+    if not 1 <= k <= MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 1 and {MAX_K}")
+    profile = await asyncio.to_thread(profiles.get, user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile for {user_id}")
+    tokens = profile_tokens(profile)
+    if not tokens:
+        return {"success": True, "papers": []}
+
+    index = await get_paper_index()
+    saved = [split_arxiv_id(paper_id)[0] for paper_id in profile.get("saved_papers", [])]
+    with span("index"):
+        ranked = await asyncio.to_thread(index.top_k, tokens, k, saved)
+    papers = await asyncio.to_thread(store.get_many, [arxiv_id for arxiv_id, _ in ranked])
+    return {
+        "success": True,
+        "papers": [dict(papers[arxiv_id], score=round(score, 4)) for arxiv_id, score in ranked if arxiv_id in papers],
+    }
+
+@app.post("/jobs")
+async def submit_job(request: JobRequest):
+    try:
+        job = await asyncio.to_thread(worker.submit, request.task, **request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "job": job}
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 50):
+    jobs = await asyncio.to_thread(worker.recent, limit)
+    return {"success": True, "jobs": jobs}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(worker.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return {"success": True, "job": job}
 
 @app.get("/profile/{user_id}")
 async def get_profile(user_id: str):
-    # Super simple profile response
-    return {"success": True, "profile": {"interests": [], "favorite_authors": []}}
+    with span("store"):
+        profile = await asyncio.to_thread(profiles.get, user_id)
+    if profile is None:
+        profile = {"interests": [], "favorite_authors": []}
+    return {"success": True, "profile": profile}
 
 @app.post("/profile")
 async def save_profile(profile_data: dict):
-    # Just return success for now
+    user_id = profile_data.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+    with span("store"):
+        await asyncio.to_thread(profiles.save, user_id, profile_data)
     return {"success": True}
 
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,302 @@
+import os
+import io
+import time
+import pstats
+import bisect
+import logging
+import cProfile
+import threading
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+# Requests slower than this are logged with their per-stage timings (0 disables)
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "2000"))
+# Opt-in profiling: when enabled, requests sending 'X-Profile: 1' run under cProfile
+PROFILING = os.getenv("PROFILING", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/cprofile")
+
+# Histogram buckets in seconds, from a cache hit to a slow arXiv round trip
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Stage timings of the request being handled (None outside requests, e.g. in background jobs)
+request_spans = contextvars.ContextVar("request_spans", default=None)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (e.g. seconds), optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def count(self, **labels):
+        series = self._series.get(tuple(labels.get(name, "") for name in self.labelnames))
+        return sum(series[:-1]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        samples = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (bound,))
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((f"{self.name}_sum", labels, round(series[-1], 6)))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Callback:
+    """
+    Metric read from existing counters at scrape time.
+
+    ``fn`` returns a number, or a dict of label value (tuple) -> number.
+    """
+
+    def __init__(self, name, documentation, fn, kind="gauge", labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+
+    def samples(self):
+        values = self.fn()
+        if not isinstance(values, dict):
+            return [(self.name, "", values)]
+        return [(self.name, _format_labels(self.labelnames, key if isinstance(key, tuple) else (key,)), value)
+                for key, value in values.items()]
+
+
+class Registry:
+    """Named metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+        self.metrics = {}
+
+    def _add(self, metric):
+        metric.name = self.prefix + metric.name
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, fn, kind="gauge", labelnames=()):
+        return self._add(Callback(name, documentation, fn, kind, labelnames))
+
+    def render(self):
+        """Return every metric as Prometheus text (format version 0.0.4)."""
+        lines = []
+        for metric in self.metrics.values():
+            try:
+                samples = metric.samples()
+            except Exception as e:
+                logger.warning(f"Collecting metric {metric.name} failed: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {value}" for name, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; modules register their metrics at import time
+registry = Registry(prefix="arxiv_agent_")
+
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time from request to the last response byte", ("method", "route", "status")
+)
+RESPONSE_BYTES = registry.counter(
+    "http_response_bytes_total", "Response body bytes sent (after compression)", ("route",)
+)
+STAGE_SECONDS = registry.histogram(
+    "stage_duration_seconds", "Time spent in each stage of request handling", ("stage",)
+)
+UPSTREAM_REQUESTS = registry.counter("arxiv_requests_total", "Requests sent to the arXiv API", ("outcome",))
+UPSTREAM_BYTES = registry.counter("arxiv_response_bytes_total", "Bytes received from the arXiv API")
+
+
+@contextmanager
+def span(stage):
+    """
+    Time a stage of request handling.
+
+    The duration goes into the stage histogram and, inside a request, into
+    that request's timings (reported in Server-Timing and slow-request logs).
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+def record(stage, seconds):
+    """Record an already measured stage duration (see span)."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    spans = request_spans.get()
+    if spans is not None:
+        spans[stage] = spans.get(stage, 0.0) + seconds
+
+
+def route_name(scope):
+    """Route template of a request (e.g. /papers/{paper_id:path}/pdf), so paths with IDs share a label."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    app = scope.get("app")
+    for candidate in getattr(getattr(app, "router", None), "routes", ()):
+        if candidate.matches(scope)[0] == Match.FULL:
+            return candidate.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Per-request latency, response size and stage timings.
+
+    Each request gets a fresh span dict (see span); when the response starts,
+    the stages measured so far are added as a Server-Timing header. Requests
+    slower than SLOW_REQUEST_MS are logged with their stage breakdown. With
+    PROFILING enabled, requests sending ``X-Profile: 1`` run under cProfile
+    and the stats are saved to PROFILE_DIR (one profiled request at a time;
+    the profile also covers anything else the event loop runs meanwhile).
+
+    Args:
+        app: ASGI application
+        profiling (bool): Allow profiled requests
+        slow_request_ms (float): Log requests slower than this (0 disables)
+    """
+
+    def __init__(self, app, profiling=PROFILING, slow_request_ms=SLOW_REQUEST_MS, profile_dir=PROFILE_DIR):
+        self.app = app
+        self.profiling = profiling
+        self.slow_request_ms = slow_request_ms
+        self.profile_dir = Path(profile_dir)
+        self._profiling_now = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans = {}
+        token = request_spans.set(spans)
+        started = time.perf_counter()
+        status = 500
+        sent = 0
+
+        async def send_timed(message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if spans:
+                    headers = MutableHeaders(scope=message)
+                    headers["Server-Timing"] = ", ".join(
+                        f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in spans.items()
+                    )
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        profiler = self._start_profiler(scope)
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_spans.reset(token)
+            route = route_name(scope)
+            if profiler is not None:
+                self._save_profile(profiler, scope, route)
+            REQUEST_SECONDS.observe(elapsed, method=scope["method"], route=route, status=status)
+            RESPONSE_BYTES.inc(sent, route=route)
+            if self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms:
+                stages = ", ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in spans.items())
+                logger.warning(f"Slow request {scope['method']} {scope['path']}: {elapsed * 1000:.0f}ms ({stages})")
+
+    def _start_profiler(self, scope):
+        if not self.profiling:
+            return None
+        if dict(scope["headers"]).get(b"x-profile") != b"1" or not self._profiling_now.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _save_profile(self, profiler, scope, route):
+        profiler.disable()
+        self._profiling_now.release()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        name = route.strip("/").replace("/", "_").replace("{", "").replace("}", "").replace(":", "_") or "root"
+        path = self.profile_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{name}.prof"
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+        logger.info(f"Profiled {scope['method']} {scope['path']} -> {path}\n{summary.getvalue()}")
@@ -0,0 +1,60 @@
+import json
+import base64
+import binascii
+
+from backend.encoding import dumps
+from backend.listing import project
+
+# Results per upstream call when paginating or streaming
+DEFAULT_PAGE_SIZE = 100
+
+
+def encode_cursor(start):
+    """Encode a result offset as an opaque cursor string"""
+    return base64.urlsafe_b64encode(json.dumps({"start": start}).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor string, or None for the first page
+
+    Returns:
+        int: Result offset
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    try:
+        start = json.loads(base64.urlsafe_b64decode(cursor.encode()))["start"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(start, int) or start < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return start
+
+
+async def ndjson_lines(pages, on_page=None, fields=None, select=None):
+    """
+    Turn an async iterator of paper pages into NDJSON lines.
+
+    Args:
+        pages: Async iterator yielding lists of paper dictionaries
+        on_page: Optional coroutine function called with each page before it is sent
+        fields: Optional list of paper fields to send (see listing.project)
+        select: Optional function returning the papers of a page to send (e.g. filters)
+
+    Yields:
+        bytes: One JSON document per paper, newline-terminated
+    """
+    async for page in pages:
+        if on_page is not None:
+            await on_page(page)
+        if select is not None:
+            page = select(page)
+        for paper in project(page, fields):
+            yield dumps(paper) + b"\n"
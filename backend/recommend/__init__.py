@@ -0,0 +1,7 @@
+from backend.recommend.ann import SIMILAR_INDEX_DIR, SimilarityIndex, embed_paper, sync_similar
+from backend.recommend.index import PAPER_INDEX_DIR, PaperIndex, author_token, profile_tokens, sync_index, tokenize
+
+__all__ = [
+    "PAPER_INDEX_DIR", "PaperIndex", "author_token", "profile_tokens", "sync_index", "tokenize",
+    "SIMILAR_INDEX_DIR", "SimilarityIndex", "embed_paper", "sync_similar",
+]
@@ -0,0 +1,489 @@
+import os
+import json
+import math
+import shutil
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from backend.recommend.index import N_FEATURES, TITLE_WEIGHT, tokenize, vectorize
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_INDEX_DIR = os.getenv("SIMILAR_INDEX_DIR", "data/similar")
+MANIFEST = "manifest.json"
+# Files of the pending log: raw float32 embeddings, and one JSON [arxiv_id, updated] line per row
+PENDING_VECTORS = "vectors.f32"
+PENDING_IDS = "ids.jsonl"
+
+# Dimensions of the dense paper embeddings (stored as int8 codes: 132 bytes per paper at 128)
+EMBEDDING_DIM = int(os.getenv("SIMILAR_DIM", "128"))
+# Embedding dimensions each hashed feature is added to, with random signs
+PROJECTION_NNZ = 4
+# Inverted lists scanned per query: more probes find more of the true neighbours but take longer
+SIMILAR_PROBES = int(os.getenv("SIMILAR_PROBES", "8"))
+# Rebuild the inverted lists once this many papers (or this fraction of the listed ones) are unlisted
+REBUILD_MIN_PENDING = 2000
+REBUILD_FRACTION = 0.2
+# k-means iterations and training rows per list when building
+KMEANS_ITERATIONS = 10
+TRAINING_ROWS_PER_LIST = 40
+# Rows scored per matrix product when scanning everything
+SCAN_CHUNK = 65536
+
+# Odd 64-bit constant for multiply-shift hashing of feature ids
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def similarity_tokens(paper):
+    """Feature tokens for finding related papers: title (weighted) and abstract."""
+    return tokenize(paper.get("title")) * TITLE_WEIGHT + tokenize(paper.get("summary"))
+
+
+def embed(features, weights, dim=EMBEDDING_DIM):
+    """
+    Project a sparse vector into a dense unit vector.
+
+    Sparse random projection: every hashed feature is added, with a
+    pseudo-random sign, to PROJECTION_NNZ of the ``dim`` coordinates.
+    Dot products (cosine similarities) are approximately preserved, and
+    the projection is a fixed hash, so nothing needs to be trained or
+    stored and any process embeds a paper the same way.
+
+    Args:
+        features (np.ndarray): Feature ids
+        weights (np.ndarray): Feature weights
+        dim (int): Embedding dimensions
+
+    Returns:
+        np.ndarray: float32 vector of length dim (all zeros for an empty input)
+    """
+    keys = features.astype(np.uint64)[:, None] * np.uint64(PROJECTION_NNZ) + np.arange(PROJECTION_NNZ, dtype=np.uint64)
+    mixed = (keys * _HASH_MULTIPLIER) >> np.uint64(32)
+    signs = np.where(mixed & np.uint64(1), 1.0, -1.0)
+    vector = np.bincount((mixed >> np.uint64(1)).astype(np.int64).ravel() % dim,
+                         weights=(signs * weights[:, None]).ravel(), minlength=dim).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def embed_paper(paper, idf=None, dim=EMBEDDING_DIM):
+    """Dense embedding of a paper's title and abstract (TF-IDF weighted when idf is given)."""
+    features, weights = vectorize(similarity_tokens(paper), N_FEATURES if idf is None else len(idf))
+    if idf is not None:
+        weights = weights * idf[features]
+    return embed(features, weights, dim)
+
+
+def quantize(vectors):
+    """
+    Scalar-quantize rows to int8 with one scale per row.
+
+    Returns:
+        tuple: (codes, scales) with vectors ~= codes * scales[:, None]
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def _scan(codes, scales, query):
+    """Scores of every quantized row, converting a chunk at a time."""
+    return np.concatenate([(codes[i:i + SCAN_CHUNK].astype(np.float32) @ query) * scales[i:i + SCAN_CHUNK]
+                           for i in range(0, len(codes), SCAN_CHUNK)] or [np.empty(0, dtype=np.float32)])
+
+
+def _assign(codes, centroids):
+    """Index of the most similar centroid for every quantized row (row scales don't change the argmax)."""
+    return np.concatenate([(codes[i:i + SCAN_CHUNK].astype(np.float32) @ centroids.T).argmax(axis=1)
+                           for i in range(0, len(codes), SCAN_CHUNK)] or [np.empty(0, dtype=np.int64)])
+
+
+def train_centroids(codes, scales, n_lists, iterations=KMEANS_ITERATIONS, seed=0):
+    """
+    Spherical k-means on a sample of quantized rows.
+
+    Returns:
+        np.ndarray: (n_lists, dim) float32 unit centroids
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(codes), n_lists * TRAINING_ROWS_PER_LIST)
+    rows = np.sort(rng.choice(len(codes), sample_size, replace=False))
+    sample = codes[rows].astype(np.float32) * scales[rows, None]
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        # Lists that attracted nothing restart from random rows
+        empty = np.flatnonzero(np.bincount(assignment, minlength=n_lists) == 0)
+        sums[empty] = sample[rng.choice(sample_size, len(empty))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.maximum(norms, 1e-12)
+    return centroids.astype(np.float32)
+
+
+class SimilarityIndex:
+    """
+    Approximate nearest-neighbour index over dense paper embeddings (IVF).
+
+    Papers are embedded with embed_paper and grouped into inverted lists by
+    their most similar k-means centroid; the rows of each list are stored
+    contiguously as int8 codes with a scale per row (see quantize), a
+    quarter of the memory of float32 and cheap to convert. A query scores the centroids, scans the
+    ``probes`` most similar lists and returns the top k rows, so it touches
+    about probes / n_lists of the papers; ``probes`` trades recall against
+    latency per query, and probing every list is an exact search.
+
+    Papers added after the lists were built go to a pending block that every
+    query scans exactly. A paper's older version is masked out, not
+    rewritten. ``build`` retrains the centroids over everything and empties
+    the pending block (see needs_rebuild); it runs without holding the lock,
+    so queries and adds carry on meanwhile. With a ``path`` each build is
+    saved as .npy files and memory-mapped on open, and pending papers are
+    appended to a log next to it (their embeddings as raw float32), so a
+    restarted backend reloads them instead of embedding them again.
+
+    Args:
+        dim (int): Embedding dimensions
+        path (str): Directory for the on-disk index, or None for memory only
+        probes (int): Default number of lists scanned per query
+    """
+
+    def __init__(self, dim=EMBEDDING_DIM, path=None, probes=SIMILAR_PROBES):
+        self.dim = dim
+        self.path = Path(path) if path else None
+        self.probes = probes
+        # Listed rows, ordered by list
+        self.ids = []
+        self.updated = []
+        self.codes = np.empty((0, dim), dtype=np.int8)
+        self.scales = np.empty(0, dtype=np.float32)
+        self.alive = np.empty(0, dtype=bool)
+        self.centroids = None
+        self.offsets = np.zeros(1, dtype=np.int64)
+        # Pending rows (global row = len(ids) + position); vectors grow by doubling
+        self.pending_ids = []
+        self.pending_updated = []
+        self._pending = np.empty((0, dim), dtype=np.float32)
+        self._pending_alive = np.empty(0, dtype=bool)
+        self.locator = {}  # arxiv_id -> global row
+        self.building = False
+        self._next_build = 0
+        self._build = None
+        self._pending_log = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path, probes=SIMILAR_PROBES):
+        """Open the index saved in path (an empty one if nothing is there yet)."""
+        index = cls(path=path, probes=probes)
+        manifest = index.path / MANIFEST
+        if manifest.exists():
+            with open(manifest) as f:
+                meta = json.load(f)
+            index.dim = meta["dim"]
+            index._next_build = meta["next_build"]
+            index._pending = np.empty((0, index.dim), dtype=np.float32)
+            if meta.get("build"):
+                build = index._build = index.path / meta["build"]
+                with open(build / "ids.json") as f:
+                    rows = json.load(f)
+                index._install(rows["ids"], rows["updated"], np.load(build / "codes.npy", mmap_mode="r"),
+                               np.load(build / "scales.npy"), np.load(build / "centroids.npy"),
+                               np.load(build / "offsets.npy"))
+            if meta.get("pending"):
+                index._load_pending(index.path / meta["pending"])
+            logger.info(f"Opened similarity index with {len(index)} papers "
+                        f"in {len(index.centroids) if index.centroids is not None else 0} lists, {index.pending} pending")
+        return index
+
+    def _load_pending(self, log):
+        """Replay a pending log, dropping a row torn by a crash mid-append."""
+        ids, updated = [], []
+        with open(log / PENDING_IDS) as f:
+            for line in f:
+                try:
+                    arxiv_id, stamp = json.loads(line)
+                except ValueError:
+                    break
+                ids.append(arxiv_id)
+                updated.append(stamp)
+        vectors = np.fromfile(log / PENDING_VECTORS, dtype=np.float32)
+        rows = min(len(ids), len(vectors) // self.dim)
+        if rows < len(ids) or rows * self.dim < len(vectors):
+            logger.warning(f"Truncating the similarity index's pending log to its {rows} complete rows")
+            os.truncate(log / PENDING_VECTORS, rows * self.dim * 4)
+            with open(log / PENDING_IDS, "w") as f:
+                f.writelines(json.dumps([ids[i], updated[i]]) + "\n" for i in range(rows))
+        self._pending_log = log
+        self._add_pending(ids[:rows], vectors[:rows * self.dim].reshape(rows, self.dim), updated[:rows])
+
+    def __len__(self):
+        return len(self.locator)
+
+    @property
+    def pending(self):
+        return len(self.pending_ids)
+
+    def _install(self, ids, updated, codes, scales, centroids, offsets):
+        self.ids, self.updated = ids, updated
+        self.codes, self.scales, self.centroids, self.offsets = codes, scales, centroids, offsets
+        self.alive = np.ones(len(ids), dtype=bool)
+        self.locator = {arxiv_id: row for row, arxiv_id in enumerate(ids)}
+
+    def _updated(self, row):
+        return self.updated[row] if row < len(self.ids) else self.pending_updated[row - len(self.ids)]
+
+    def _kill(self, row):
+        if row < len(self.ids):
+            self.alive[row] = False
+        else:
+            self._pending_alive[row - len(self.ids)] = False
+
+    def add(self, papers, idf=None):
+        """
+        Embed and add new papers and new versions of indexed papers.
+
+        Papers whose 'updated' timestamp is not newer than the indexed copy
+        are skipped.
+
+        Args:
+            papers (list): Dicts with 'arxiv_id', 'title', 'summary', 'updated'
+            idf (np.ndarray): Inverse document frequencies to weight terms by (see PaperIndex.idf)
+
+        Returns:
+            int: Number of papers added
+        """
+        with self._lock:
+            changed = {}
+            for paper in papers:
+                row = self.locator.get(paper["arxiv_id"])
+                if row is not None and (self._updated(row) or "") >= (paper.get("updated") or ""):
+                    continue
+                changed[paper["arxiv_id"]] = paper
+        if not changed:
+            return 0
+        vectors = np.stack([embed_paper(paper, idf, self.dim) for paper in changed.values()])
+        self.add_vectors(list(changed), vectors, [paper.get("updated") for paper in changed.values()])
+        return len(changed)
+
+    def add_vectors(self, ids, vectors, updated=None):
+        """
+        Add already embedded papers (replacing indexed copies of the same IDs).
+
+        Args:
+            ids (list): arXiv IDs
+            vectors (np.ndarray): (len(ids), dim) unit embeddings
+            updated (list): 'updated' timestamp of each paper
+        """
+        updated = updated or [None] * len(ids)
+        with self._lock:
+            self._add_pending(ids, vectors, updated)
+            self._log_pending(ids, vectors, updated)
+
+    def _add_pending(self, ids, vectors, updated):
+        start = len(self.pending_ids)
+        if start + len(ids) > len(self._pending):
+            capacity = max(1024, 2 * (start + len(ids)))
+            grown = np.empty((capacity, self.dim), dtype=np.float32)
+            grown[:start] = self._pending[:start]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:start] = self._pending_alive[:start]
+            self._pending, self._pending_alive = grown, alive
+        self._pending[start:start + len(ids)] = vectors
+        self._pending_alive[start:start + len(ids)] = True
+        for i, arxiv_id in enumerate(ids):
+            row = self.locator.get(arxiv_id)
+            if row is not None:
+                self._kill(row)
+            self.locator[arxiv_id] = len(self.ids) + start + i
+            self.pending_ids.append(arxiv_id)
+            self.pending_updated.append(updated[i])
+
+    def _log_pending(self, ids, vectors, updated):
+        """Append pending rows to the on-disk log, starting one for the current build if needed."""
+        if self.path is None or not len(ids):
+            return
+        if self._pending_log is None:
+            self._pending_log = self.path / f"pending-{self._next_build:06d}"
+            self._pending_log.mkdir(parents=True, exist_ok=True)
+            for name in (PENDING_VECTORS, PENDING_IDS):
+                (self._pending_log / name).touch()
+            self._save_manifest()
+        # Embeddings first: on open, rows without both parts are dropped
+        with open(self._pending_log / PENDING_VECTORS, "ab") as f:
+            np.asarray(vectors, dtype=np.float32).tofile(f)
+        with open(self._pending_log / PENDING_IDS, "a") as f:
+            f.writelines(json.dumps([arxiv_id, updated[i]]) + "\n" for i, arxiv_id in enumerate(ids))
+
+    def vector(self, arxiv_id):
+        """Embedding of an indexed paper (float32), or None."""
+        with self._lock:
+            row = self.locator.get(arxiv_id)
+            if row is None:
+                return None
+            if row < len(self.ids):
+                return self.codes[row].astype(np.float32) * self.scales[row]
+            return self._pending[row - len(self.ids)].copy()
+
+    def needs_rebuild(self):
+        """True when enough papers are pending (or masked out) to retrain the lists."""
+        dead = len(self.ids) - int(self.alive.sum())
+        return self.pending + dead >= max(REBUILD_MIN_PENDING, REBUILD_FRACTION * len(self.ids))
+
+    def search(self, vector, k=10, probes=None, exclude=()):
+        """
+        Return the k indexed papers most similar to an embedding.
+
+        Args:
+            vector (np.ndarray): Query embedding (see embed_paper / vector)
+            k (int): Number of results
+            probes (int): Lists to scan (default: the index's probes); n_lists or more is exact
+            exclude (iterable): arXiv IDs to leave out (e.g. the query paper)
+
+        Returns:
+            list: (arxiv_id, cosine similarity) pairs, most similar first
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            ids, codes, scales, alive = self.ids, self.codes, self.scales, self.alive
+            centroids, offsets = self.centroids, self.offsets
+            n_pending = len(self.pending_ids)
+            pending_ids = self.pending_ids
+            pending, pending_alive = self._pending[:n_pending], self._pending_alive[:n_pending].copy()
+            excluded = [self.locator[arxiv_id] for arxiv_id in exclude if arxiv_id in self.locator]
+
+        probes = probes or self.probes
+        if centroids is None or len(ids) == 0:
+            rows, scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        elif probes >= len(centroids):
+            rows, scores = np.arange(len(ids)), _scan(codes, scales, query)
+        else:
+            lists = np.argpartition(-(centroids @ query), probes - 1)[:probes]
+            rows = np.concatenate([np.arange(offsets[i], offsets[i + 1]) for i in lists])
+            block = np.concatenate([codes[offsets[i]:offsets[i + 1]] for i in lists])
+            scores = (block.astype(np.float32) @ query) * scales[rows]
+        scores = np.where(alive[rows], scores, -np.inf)
+        rows = np.concatenate([rows, len(ids) + np.arange(n_pending)])
+        scores = np.concatenate([scores, np.where(pending_alive, pending @ query, -np.inf)])
+        scores[np.isin(rows, excluded)] = -np.inf
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(ids[rows[i]] if rows[i] < len(ids) else pending_ids[rows[i] - len(ids)], float(scores[i]))
+                for i in top if scores[i] > -np.inf]
+
+    def build(self, n_lists=None, seed=0):
+        """
+        Retrain the inverted lists over every current paper, emptying the pending block.
+
+        Args:
+            n_lists (int): Number of lists (default: about the square root of the number of papers)
+            seed (int): Seed for k-means sampling
+        """
+        with self._lock:
+            if self.building:
+                return
+            self.building = True
+            snapshot = sorted(self.locator.items(), key=lambda item: item[1])
+            n_pending = len(self.pending_ids)
+            rows = np.fromiter((row for _, row in snapshot), dtype=np.int64, count=len(snapshot))
+            listed = rows[rows < len(self.ids)]
+            pending_codes, pending_scales = quantize(self._pending[rows[rows >= len(self.ids)] - len(self.ids)])
+            codes = np.concatenate([self.codes[listed], pending_codes])
+            scales = np.concatenate([self.scales[listed], pending_scales])
+            ids = [arxiv_id for arxiv_id, _ in snapshot]
+            updated = [self._updated(row) for _, row in snapshot]
+        try:
+            if not ids:
+                return
+            n_lists = min(n_lists or max(1, round(math.sqrt(len(ids)))), len(ids))
+            centroids = train_centroids(codes, scales, n_lists, seed=seed)
+            assignment = _assign(codes, centroids)
+            order = np.argsort(assignment, kind="stable")
+            counts = np.bincount(assignment, minlength=n_lists)
+            offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+            codes, scales = np.ascontiguousarray(codes[order]), scales[order]
+            ids = [ids[i] for i in order]
+            updated = [updated[i] for i in order]
+            build = self._save(ids, updated, codes, scales, centroids, offsets)
+
+            replaced = []
+            with self._lock:
+                # Papers added while building stay pending; their older copies in the new lists are dead
+                later_ids = self.pending_ids[n_pending:]
+                later_updated = self.pending_updated[n_pending:]
+                later_vectors = self._pending[n_pending:len(self.pending_ids)].copy()
+                later_alive = self._pending_alive[n_pending:len(self.pending_ids)].copy()
+                if build is not None:
+                    codes = np.load(build / "codes.npy", mmap_mode="r")
+                self._install(ids, updated, codes, scales, centroids, offsets)
+                self._pending, self._pending_alive = later_vectors, later_alive
+                self.pending_ids, self.pending_updated = later_ids, later_updated
+                for i, arxiv_id in enumerate(later_ids):
+                    row = self.locator.get(arxiv_id)
+                    if row is not None and row < len(ids):
+                        self.alive[row] = False
+                    if later_alive[i]:
+                        self.locator[arxiv_id] = len(ids) + i
+                if build is not None:
+                    # Switch the manifest to the new build and a log of just the papers still pending
+                    replaced = [path for path in (self._build, self._pending_log) if path is not None]
+                    self._build, self._pending_log = build, None
+                    if later_ids:
+                        self._log_pending(later_ids, later_vectors, later_updated)
+                    else:
+                        self._save_manifest()
+            for path in replaced:
+                shutil.rmtree(path, ignore_errors=True)
+            logger.info(f"Built similarity index over {len(ids)} papers in {n_lists} lists")
+        finally:
+            self.building = False
+
+    def _save(self, ids, updated, codes, scales, centroids, offsets):
+        """Write a build to a new directory; returns the directory."""
+        if self.path is None:
+            return None
+        build = self.path / f"build-{self._next_build:06d}"
+        self._next_build += 1
+        build.mkdir(parents=True, exist_ok=True)
+        np.save(build / "codes.npy", codes)
+        np.save(build / "scales.npy", scales)
+        np.save(build / "centroids.npy", centroids)
+        np.save(build / "offsets.npy", offsets)
+        with open(build / "ids.json", "w") as f:
+            json.dump({"ids": ids, "updated": updated}, f)
+        return build
+
+    def _save_manifest(self):
+        manifest = {
+            "dim": self.dim,
+            "next_build": self._next_build,
+            "build": self._build.name if self._build else None,
+            "pending": self._pending_log.name if self._pending_log else None,
+        }
+        tmp_path = self.path / (MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.path / MANIFEST)
+
+
+def sync_similar(index, store, idf=None):
+    """
+    Add every paper in a PaperStore that the similarity index is missing or has an older version of.
+
+    Returns:
+        int: Number of papers added
+    """
+    added = sum(index.add(batch, idf) for batch in store.iter_text(batch_size=5000))
+    if added:
+        logger.info(f"Added {added} papers to the similarity index ({len(index)} total)")
+    return added
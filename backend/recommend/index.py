@@ -0,0 +1,306 @@
+import os
+import re
+import json
+import zlib
+import shutil
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from backend.recommend.segment import Segment
+
+logger = logging.getLogger(__name__)
+
+PAPER_INDEX_DIR = os.getenv("PAPER_INDEX_DIR", "data/index")
+MANIFEST = "manifest.json"
+
+# Compact once there are more segments than this, or this fraction of rows is superseded
+MAX_SEGMENTS = 16
+COMPACT_DEAD_FRACTION = 0.2
+
+# Size of the hashed feature space (terms are hashed, so there is no vocabulary to maintain)
+N_FEATURES = 2 ** 20
+
+# Title terms count this many times as much as abstract terms
+TITLE_WEIGHT = 2
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can for from has have in into is it its of on or our over such that the their
+these this those to under using via we which with within without
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word unigrams and bigrams, stopwords removed."""
+    words = [w for w in TOKEN_RE.findall((text or "").lower()) if w not in STOPWORDS and len(w) > 1]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def author_token(name):
+    """Feature token for an author, so favourite authors match their papers."""
+    return "author:" + " ".join(name.lower().split())
+
+
+def hash_tokens(tokens, n_features=N_FEATURES):
+    """Map tokens to (feature ids, counts) in the hashed feature space."""
+    if not tokens:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    hashed = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint32, count=len(tokens))
+    features, counts = np.unique((hashed % n_features).astype(np.int32), return_counts=True)
+    return features, counts.astype(np.float32)
+
+
+def paper_tokens(paper):
+    """All feature tokens for a paper: title (weighted), abstract and authors."""
+    return (tokenize(paper.get("title")) * TITLE_WEIGHT
+            + tokenize(paper.get("summary"))
+            + [author_token(name) for name in paper.get("authors", [])])
+
+
+def vectorize(tokens, n_features=N_FEATURES):
+    """Sublinear (1 + log tf) term weights, L2-normalized."""
+    features, counts = hash_tokens(tokens, n_features)
+    weights = 1 + np.log(counts)
+    norm = np.linalg.norm(weights)
+    if norm:
+        weights /= norm
+    return features, weights
+
+
+class PaperIndex:
+    """
+    Hashed TF-IDF matrix over paper titles, abstracts and authors.
+
+    Weights are L2-normalized sublinear term frequencies. IDF is kept as a
+    separate document-frequency vector and applied on the query side, so
+    adding papers never rewrites existing rows. Scoring a query against every
+    paper is one sparse matrix-vector product, touching only the columns of
+    the query's terms, followed by a top-k selection.
+
+    The matrix is a list of append-only column-major segments (see Segment).
+    ``add`` writes a new segment holding only the new or changed papers and
+    bumps document frequencies; a paper's older version is masked out, not
+    rewritten, and its terms no longer count towards document frequencies.
+    ``compact`` merges segments and drops masked rows. With a ``path`` every
+    segment is saved as .npy files and memory-mapped on open, so a restarted
+    backend has the index available immediately.
+
+    Args:
+        n_features (int): Size of the hashed feature space
+        path (str): Directory for the on-disk index, or None for memory only
+    """
+
+    def __init__(self, n_features=N_FEATURES, path=None):
+        self.n_features = n_features
+        self.path = Path(path) if path else None
+        self.segments = []
+        self.locator = {}  # arxiv_id -> (segment, local row)
+        self.df = np.zeros(n_features, dtype=np.int32)
+        self.compacting = False
+        self._idf = None
+        self._next_segment = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path, n_features=N_FEATURES):
+        """Open the index saved in path (an empty one if nothing is there yet)."""
+        index = cls(n_features, path)
+        manifest = index.path / MANIFEST
+        if manifest.exists():
+            with open(manifest) as f:
+                meta = json.load(f)
+            index.n_features = meta["n_features"]
+            index.df = np.zeros(index.n_features, dtype=np.int32)
+            index._next_segment = meta["next_segment"]
+            for name in meta["segments"]:
+                index._append_segment(Segment.load(index.path / name))
+            logger.info(f"Opened recommendation index with {len(index)} papers in {len(index.segments)} segments")
+        return index
+
+    def __len__(self):
+        return len(self.locator)
+
+    def _append_segment(self, segment):
+        for row, arxiv_id in enumerate(segment.ids):
+            if segment.alive[row]:
+                self.locator[arxiv_id] = (segment, row)
+        self.segments.append(segment)
+        self.df += segment.document_frequencies(self.n_features)
+        self._idf = None
+
+    def add(self, papers):
+        """
+        Index new papers and new versions of indexed papers.
+
+        Papers whose 'updated' timestamp is not newer than the indexed copy
+        are skipped, so the cost is proportional to what actually changed.
+
+        Args:
+            papers (list): Dicts with 'arxiv_id', 'title', 'summary', 'authors', 'updated'
+
+        Returns:
+            int: Number of papers indexed
+        """
+        with self._lock:
+            changed = {}
+            for paper in papers:
+                current = self.locator.get(paper["arxiv_id"])
+                if current and (current[0].updated[current[1]] or "") >= (paper.get("updated") or ""):
+                    continue
+                changed[paper["arxiv_id"]] = paper
+        if not changed:
+            return 0
+
+        papers = list(changed.values())
+        segment = Segment.from_vectors(
+            [p["arxiv_id"] for p in papers],
+            [p.get("updated") for p in papers],
+            [vectorize(paper_tokens(p), self.n_features) for p in papers],
+        )
+        with self._lock:
+            superseded = {}
+            for paper in papers:
+                current = self.locator.get(paper["arxiv_id"])
+                if current:
+                    current[0].alive[current[1]] = False
+                    superseded.setdefault(current[0], []).append(current[1])
+            for old, rows in superseded.items():
+                self.df -= old.document_frequencies(self.n_features, rows)
+            if self.path is not None:
+                segment.save(self.path / f"segment-{self._next_segment:06d}")
+                self._next_segment += 1
+                for old in superseded:
+                    old.save_alive()
+            self._append_segment(segment)
+            self._save_manifest()
+        return len(papers)
+
+    def needs_compaction(self):
+        """True when there are enough small segments (or dead rows) to merge."""
+        dead = sum(int((~segment.alive).sum()) for segment in self.segments)
+        return len(self.segments) > MAX_SEGMENTS or dead > COMPACT_DEAD_FRACTION * max(len(self), 1)
+
+    def compact(self):
+        """
+        Merge all current segments into one, dropping superseded rows.
+
+        The merge runs without holding the lock, so queries and adds carry on;
+        segments added meanwhile are kept as they are.
+        """
+        with self._lock:
+            if self.compacting or len(self.segments) < 2 and not self.needs_compaction():
+                return
+            self.compacting = True
+            snapshot = list(self.segments)
+        try:
+            merged = Segment.merge(snapshot)
+            with self._lock:
+                # Rows superseded while merging point at a newer segment now
+                for row, arxiv_id in enumerate(merged.ids):
+                    current = self.locator.get(arxiv_id)
+                    if current is None or current[0] not in snapshot:
+                        merged.alive[row] = False
+                if self.path is not None:
+                    merged.save(self.path / f"segment-{self._next_segment:06d}")
+                    self._next_segment += 1
+                newer = self.segments[len(snapshot):]
+                self.segments = []
+                self.df = np.zeros(self.n_features, dtype=np.int32)
+                for segment in [merged] + newer:
+                    self._append_segment(segment)
+                self._save_manifest()
+            for old in snapshot:
+                if old.path is not None:
+                    shutil.rmtree(old.path, ignore_errors=True)
+            logger.info(f"Compacted {len(snapshot)} index segments into one of {len(merged)} papers")
+        finally:
+            self.compacting = False
+
+    def _save_manifest(self):
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "n_features": self.n_features,
+            "next_segment": self._next_segment,
+            "segments": [segment.path.name for segment in self.segments],
+        }
+        tmp_path = self.path / (MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.path / MANIFEST)
+
+    def idf(self):
+        """Smoothed inverse document frequency for every feature."""
+        if self._idf is None:
+            self._idf = (np.log((1 + len(self)) / (1 + self.df)) + 1).astype(np.float32)
+        return self._idf
+
+    def query_vector(self, tokens):
+        """Sparse query vector: (features, TF-IDF weights with IDF applied for both sides)."""
+        features, weights = vectorize(tokens, self.n_features)
+        idf = self.idf()[features]
+        return features, (weights * idf * idf).astype(np.float32)
+
+    def top_k(self, tokens, k=20, exclude=()):
+        """
+        Return the k best matching papers for a list of query tokens.
+
+        Args:
+            tokens (list): Query tokens (see tokenize/author_token)
+            k (int): Number of results
+            exclude (iterable): arXiv IDs to leave out (e.g. already saved papers)
+
+        Returns:
+            list: (arxiv_id, score) pairs, best first, only positive scores
+        """
+        features, weights = self.query_vector(tokens)
+        segments = list(self.segments)
+        if not segments:
+            return []
+        scores = np.concatenate([segment.scores(features, weights) for segment in segments])
+        offsets = np.cumsum([0] + [len(segment) for segment in segments])
+        base = {id(segment): offset for segment, offset in zip(segments, offsets)}
+        for arxiv_id in exclude:
+            located = self.locator.get(arxiv_id)
+            if located and id(located[0]) in base:
+                scores[base[id(located[0])] + located[1]] = 0
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for position in top:
+            if scores[position] <= 0:
+                break
+            segment_index = np.searchsorted(offsets, position, side="right") - 1
+            results.append((segments[segment_index].ids[position - offsets[segment_index]], float(scores[position])))
+        return results
+
+
+def profile_tokens(profile):
+    """Query tokens for a research profile: its interests and favourite authors."""
+    tokens = []
+    for interest in profile.get("interests", []):
+        tokens.extend(tokenize(interest))
+    tokens.extend(author_token(name) for name in profile.get("favorite_authors", []))
+    return tokens
+
+
+def sync_index(index, store):
+    """
+    Add every paper in a PaperStore that the index is missing or has an older version of.
+
+    Returns:
+        int: Number of papers indexed
+    """
+    added = sum(index.add(batch) for batch in store.iter_text(batch_size=5000))
+    if added:
+        logger.info(f"Indexed {added} papers from the paper store ({len(index)} total)")
+    return added
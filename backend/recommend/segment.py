@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+# Array files making up a segment on disk (all memory-mapped on load except 'alive')
+ARRAYS = ["features", "indptr", "rows", "data"]
+
+
+class Segment:
+    """
+    Immutable column-major block of the paper matrix.
+
+    Stores, for every feature present in the segment, the local rows that
+    contain it and their weights: ``features`` (sorted unique feature ids),
+    ``indptr`` (offsets into rows/data per feature), ``rows`` and ``data``.
+    Only ``alive`` changes after creation, when a paper is superseded by a
+    newer version in a later segment.
+
+    Args:
+        ids (list): arXiv ID of each local row
+        updated (list): 'updated' timestamp of each local row
+        features, indptr, rows, data (np.ndarray): Column arrays
+        alive (np.ndarray): Boolean mask of rows still current
+    """
+
+    def __init__(self, ids, updated, features, indptr, rows, data, alive=None):
+        self.ids = ids
+        self.updated = updated
+        self.features = features
+        self.indptr = indptr
+        self.rows = rows
+        self.data = data
+        self.alive = np.ones(len(ids), dtype=bool) if alive is None else alive
+        self.path = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_vectors(cls, ids, updated, vectors):
+        """
+        Build a segment from per-row sparse vectors.
+
+        Args:
+            ids (list): arXiv IDs
+            updated (list): 'updated' timestamps
+            vectors (list): (features, weights) per row, as returned by vectorize()
+        """
+        lengths = [len(features) for features, _ in vectors]
+        rows = np.repeat(np.arange(len(vectors), dtype=np.int32), lengths)
+        features = np.concatenate([f for f, _ in vectors] or [np.empty(0, dtype=np.int32)])
+        data = np.concatenate([w for _, w in vectors] or [np.empty(0)]).astype(np.float32)
+        return cls._from_postings(ids, updated, features, rows, data)
+
+    @classmethod
+    def _from_postings(cls, ids, updated, features, rows, data):
+        order = np.argsort(features, kind="stable")
+        unique, counts = np.unique(features[order], return_counts=True)
+        indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(list(ids), list(updated), unique.astype(np.int32), indptr,
+                   rows[order].astype(np.int32), data[order].astype(np.float32))
+
+    @classmethod
+    def merge(cls, segments):
+        """Merge segments into one, dropping rows that are no longer alive."""
+        ids, updated, features, rows, data = [], [], [], [], []
+        base = 0
+        for segment in segments:
+            # New local row number for every alive row (-1 for dead rows)
+            renumber = np.cumsum(segment.alive) - 1 + base
+            renumber[~segment.alive] = -1
+            seg_features = np.repeat(segment.features, np.diff(segment.indptr))
+            keep = segment.alive[segment.rows]
+            features.append(seg_features[keep])
+            rows.append(renumber[segment.rows[keep]])
+            data.append(np.asarray(segment.data)[keep])
+            alive_rows = np.flatnonzero(segment.alive)
+            ids.extend(segment.ids[i] for i in alive_rows)
+            updated.extend(segment.updated[i] for i in alive_rows)
+            base += len(alive_rows)
+        return cls._from_postings(
+            ids, updated,
+            np.concatenate(features or [np.empty(0, dtype=np.int32)]),
+            np.concatenate(rows or [np.empty(0, dtype=np.int32)]),
+            np.concatenate(data or [np.empty(0, dtype=np.float32)]),
+        )
+
+    def document_frequencies(self, n_features, rows=None):
+        """
+        Number of rows containing each feature.
+
+        Args:
+            n_features (int): Size of the feature space
+            rows (list): Local rows to count (default: the alive ones)
+        """
+        if rows is None:
+            selected = self.alive
+        else:
+            selected = np.zeros(len(self.ids), dtype=bool)
+            selected[rows] = True
+        if selected.all():
+            return np.bincount(self.features, weights=np.diff(self.indptr), minlength=n_features).astype(np.int32)
+        # Feature of every selected entry: the column whose indptr range holds its position
+        entries = np.flatnonzero(selected[self.rows])
+        features = self.features[np.searchsorted(self.indptr, entries, side="right") - 1]
+        return np.bincount(features, minlength=n_features).astype(np.int32)
+
+    def scores(self, features, weights):
+        """Dot product of every local row with a sparse query vector."""
+        positions = np.searchsorted(self.features, features)
+        positions = np.minimum(positions, max(len(self.features) - 1, 0))
+        found = (self.features[positions] == features) if len(self.features) else np.zeros(len(features), bool)
+        if not found.any():
+            return np.zeros(len(self.ids), dtype=np.float32)
+        starts = self.indptr[positions[found]]
+        ends = self.indptr[positions[found] + 1]
+        rows = np.concatenate([self.rows[s:e] for s, e in zip(starts, ends)])
+        values = np.concatenate([self.data[s:e] * w for s, e, w in zip(starts, ends, weights[found])])
+        scores = np.bincount(rows, weights=values, minlength=len(self.ids)).astype(np.float32)
+        scores[~self.alive] = 0
+        return scores
+
+    def save(self, path):
+        """Write the segment to a directory of .npy files."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        with open(path / "ids.json", "w") as f:
+            json.dump({"ids": self.ids, "updated": self.updated}, f)
+        self.path = path
+        self.save_alive()
+
+    def save_alive(self):
+        if self.path is not None:
+            np.save(self.path / "alive.npy", self.alive)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved segment, memory-mapping its column arrays."""
+        path = Path(path)
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+        with open(path / "ids.json") as f:
+            meta = json.load(f)
+        segment = cls(meta["ids"], meta["updated"], alive=np.load(path / "alive.npy").copy(), **arrays)
+        segment.path = path
+        return segment
@@ -0,0 +1,49 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one upstream call.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same task and get the same result (or exception).
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key, fn):
+        """
+        Run ``fn()`` once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Normalized request key
+            fn (callable): Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of ``fn()``
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.shared += 1
+        # Shield so one cancelled caller doesn't cancel the fetch for the rest
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self):
+        """Return upstream call and saved call counters."""
+        return {
+            "upstream_calls": self.calls,
+            "saved_calls": self.shared,
+            "in_flight": len(self._inflight),
+        }
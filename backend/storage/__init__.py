@@ -0,0 +1,4 @@
+from backend.storage.papers import PaperStore
+from backend.storage.profiles import ProfileStore
+
+__all__ = ["PaperStore", "ProfileStore"]
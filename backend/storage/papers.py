@@ -0,0 +1,543 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+from backend.arxiv_scraper.ids import split_arxiv_id
+from backend.arxiv_scraper.parser import date_key
+
+logger = logging.getLogger(__name__)
+
+PAPER_DB_PATH = os.getenv("PAPER_DB_PATH", "data/papers/papers.db")
+
+# Columns that can be targeted by a field-restricted search
+SEARCH_FIELDS = {"all": None, "title": "title", "abstract": "summary", "author": "authors"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    arxiv_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 1,
+    entry_id TEXT,
+    title TEXT,
+    authors TEXT,
+    summary TEXT,
+    published TEXT,
+    updated TEXT,
+    categories TEXT,
+    pdf_url TEXT,
+    primary_category TEXT,
+    doi TEXT,
+    journal_ref TEXT,
+    comment TEXT,
+    published_ts INTEGER,
+    updated_ts INTEGER
+);
+CREATE INDEX IF NOT EXISTS papers_published ON papers(published);
+CREATE TABLE IF NOT EXISTS paper_versions (
+    arxiv_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated TEXT,
+    seen_at REAL,
+    PRIMARY KEY (arxiv_id, version)
+);
+CREATE TABLE IF NOT EXISTS paper_categories (
+    arxiv_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (arxiv_id, category)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_categories_category ON paper_categories(category, arxiv_id);
+CREATE TABLE IF NOT EXISTS harvest_state (
+    category TEXT PRIMARY KEY,
+    watermark TEXT,
+    harvested_at REAL,
+    resume_offset INTEGER,
+    resume_newest TEXT
+);
+CREATE TABLE IF NOT EXISTS import_state (
+    harvest TEXT PRIMARY KEY,
+    token TEXT,
+    records INTEGER,
+    complete_list_size INTEGER,
+    done INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS paper_text (
+    arxiv_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    pages INTEGER,
+    text TEXT,
+    extracted_at REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, summary, authors, content='papers', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+    INSERT INTO papers_fts(rowid, title, summary, authors)
+    VALUES (new.rowid, new.title, new.summary, new.authors);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, summary, authors)
+    VALUES ('delete', old.rowid, old.title, old.summary, old.authors);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN
+    INSERT INTO papers_fts(papers_fts, rowid, title, summary, authors)
+    VALUES ('delete', old.rowid, old.title, old.summary, old.authors);
+    INSERT INTO papers_fts(rowid, title, summary, authors)
+    VALUES (new.rowid, new.title, new.summary, new.authors);
+END;
+"""
+
+# Columns added after the first release (name -> type), created on open if missing
+ADDED_COLUMNS = {
+    "primary_category": "TEXT",
+    "doi": "TEXT",
+    "journal_ref": "TEXT",
+    "comment": "TEXT",
+    "published_ts": "INTEGER",
+    "updated_ts": "INTEGER",
+}
+# Columns added to harvest_state after the first release
+ADDED_HARVEST_COLUMNS = {
+    "resume_offset": "INTEGER",
+    "resume_newest": "TEXT",
+}
+
+# Only replace a stored paper when the incoming record is a newer version (or a later copy of the same one)
+UPSERT = """
+INSERT INTO papers (arxiv_id, version, entry_id, title, authors, summary, published, updated, categories, pdf_url,
+                    primary_category, doi, journal_ref, comment, published_ts, updated_ts)
+VALUES (:arxiv_id, :version, :entry_id, :title, :authors, :summary, :published, :updated, :categories, :pdf_url,
+        :primary_category, :doi, :journal_ref, :comment, :published_ts, :updated_ts)
+ON CONFLICT(arxiv_id) DO UPDATE SET
+    version = excluded.version,
+    entry_id = excluded.entry_id,
+    title = excluded.title,
+    authors = excluded.authors,
+    summary = excluded.summary,
+    published = excluded.published,
+    updated = excluded.updated,
+    categories = excluded.categories,
+    pdf_url = excluded.pdf_url,
+    primary_category = excluded.primary_category,
+    doi = excluded.doi,
+    journal_ref = excluded.journal_ref,
+    comment = excluded.comment,
+    published_ts = excluded.published_ts,
+    updated_ts = excluded.updated_ts
+WHERE excluded.version > papers.version
+   OR excluded.version = papers.version AND (excluded.updated > papers.updated OR papers.updated IS NULL)
+"""
+
+COLUMNS = ", ".join(f"papers.{c}" for c in [
+    "arxiv_id", "version", "entry_id", "title", "authors", "summary", "published", "updated", "categories", "pdf_url",
+    *ADDED_COLUMNS,
+])
+
+
+def _fts_query(text, field=None):
+    """Turn free text into an FTS5 query matching all terms (prefix on the last)."""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    query = " ".join(quoted)
+    return f"{field} : ({query})" if field else query
+
+
+def _is_newer(row, current):
+    """Whether a paper row supersedes the current copy (a row or None), mirroring UPSERT's condition."""
+    if current is None or row["version"] > current["version"]:
+        return True
+    return row["version"] == current["version"] and (
+        current["updated"] is None or (row["updated"] or "") > current["updated"]
+    )
+
+
+class PaperStore:
+    """
+    SQLite paper store with an FTS5 index over titles, abstracts and authors.
+
+    Papers are keyed by canonical, version-less arXiv ID; a stored record is
+    only replaced when a newer version (or a newer copy of the same version)
+    arrives, and every version seen is kept in ``paper_versions``. Records
+    that match what is stored are not written at all, so listeners only see
+    papers that actually changed. Each paper's categories are also kept in
+    ``paper_categories``, so category feeds are index lookups.
+
+    Args:
+        db_path (str): Path of the SQLite database (':memory:' for tests)
+    """
+
+    def __init__(self, db_path=PAPER_DB_PATH):
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Called with the text fields of every stored batch (e.g. to update the recommendation index)
+        self.listeners = []
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        has_fts = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'papers_fts'").fetchone()
+        has_versions = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'paper_versions'").fetchone()
+        has_categories = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'paper_categories'"
+        ).fetchone()
+        self.conn.executescript(SCHEMA)
+        if not has_fts:
+            # Index rows stored before the full-text index existed
+            self.conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+        if not has_versions:
+            # Record the stored version of papers stored before versions were tracked
+            self.conn.execute(
+                "INSERT OR IGNORE INTO paper_versions (arxiv_id, version, updated, seen_at) "
+                "SELECT arxiv_id, version, updated, ? FROM papers",
+                (time.time(),),
+            )
+        if not has_categories:
+            # Index the categories of papers stored before they had their own table
+            rows = self.conn.execute("SELECT arxiv_id, categories FROM papers").fetchall()
+            self._write_categories(rows)
+        self._migrate()
+
+    def _migrate(self):
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(papers)")}
+        for column, kind in ADDED_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE papers ADD COLUMN {column} {kind}")
+        if "published_ts" not in existing:
+            rows = self.conn.execute("SELECT arxiv_id, published, updated FROM papers").fetchall()
+            self.conn.executemany(
+                "UPDATE papers SET published_ts = ?, updated_ts = ? WHERE arxiv_id = ?",
+                [(date_key(row["published"]), date_key(row["updated"]), row["arxiv_id"]) for row in rows],
+            )
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(harvest_state)")}
+        for column, kind in ADDED_HARVEST_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE harvest_state ADD COLUMN {column} {kind}")
+        self.conn.commit()
+
+    def add_papers(self, papers, checkpoint=None):
+        """
+        Insert or update papers in a single transaction.
+
+        Args:
+            papers (list): Paper dictionaries as returned by ArxivScraper
+            checkpoint (dict): Optional bulk import progress (see set_import_state),
+                committed in the same transaction as the papers
+
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        rows, versions = {}, set()
+        for paper in papers:
+            arxiv_id, version = split_arxiv_id(paper.get("id"))
+            row = {
+                "arxiv_id": arxiv_id,
+                "version": version,
+                "entry_id": paper.get("id"),
+                "title": paper.get("title"),
+                "authors": json.dumps(paper.get("authors", [])),
+                "summary": paper.get("summary"),
+                "published": paper.get("published"),
+                "updated": paper.get("updated"),
+                "categories": json.dumps(paper.get("categories", [])),
+                "pdf_url": paper.get("pdf_url"),
+                "primary_category": paper.get("primary_category"),
+                "doi": paper.get("doi"),
+                "journal_ref": paper.get("journal_ref"),
+                "comment": paper.get("comment"),
+                "published_ts": paper.get("published_ts") or date_key(paper.get("published")),
+                "updated_ts": paper.get("updated_ts") or date_key(paper.get("updated")),
+            }
+            # Overlapping queries can return a paper twice; keep the newest copy
+            if _is_newer(row, rows.get(arxiv_id)):
+                rows[arxiv_id] = row
+            # OAI-PMH records list every version, search results only the current one
+            for seen in paper.get("versions") or [{"version": version, "updated": paper.get("updated")}]:
+                versions.add((arxiv_id, seen["version"], seen["updated"]))
+
+        now = time.time()
+        with self._lock, self.conn:
+            stored = self._stored_versions(list(rows))
+            fresh = [row for row in rows.values() if _is_newer(row, stored.get(row["arxiv_id"]))]
+            changed = self.conn.executemany(UPSERT, fresh).rowcount if fresh else 0
+            self._write_categories(fresh)
+            if versions:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO paper_versions (arxiv_id, version, updated, seen_at) VALUES (?, ?, ?, ?)",
+                    [(arxiv_id, version, updated, now) for arxiv_id, version, updated in versions],
+                )
+            if checkpoint is not None:
+                self._write_import_state(**checkpoint)
+        logger.debug(f"Stored {changed} of {len(rows)} papers")
+        if fresh and self.listeners:
+            batch = [{"arxiv_id": row["arxiv_id"], "title": row["title"], "summary": row["summary"],
+                      "authors": json.loads(row["authors"]), "updated": row["updated"]} for row in fresh]
+            for listener in self.listeners:
+                listener(batch)
+        return changed
+
+    def _write_categories(self, rows):
+        """Replace the paper_categories entries of rows (caller holds the lock)."""
+        if not rows:
+            return
+        self.conn.executemany("DELETE FROM paper_categories WHERE arxiv_id = ?", [(row["arxiv_id"],) for row in rows])
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO paper_categories (arxiv_id, category) VALUES (?, ?)",
+            [(row["arxiv_id"], category) for row in rows for category in json.loads(row["categories"] or "[]")],
+        )
+
+    def _stored_versions(self, arxiv_ids):
+        """arxiv_id -> {'version', 'updated'} of the stored copies (caller holds the lock)."""
+        stored = {}
+        for i in range(0, len(arxiv_ids), 500):
+            chunk = arxiv_ids[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT arxiv_id, version, updated FROM papers WHERE arxiv_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            stored.update((row["arxiv_id"], row) for row in rows)
+        return stored
+
+    def versions(self, arxiv_id):
+        """
+        Every version of a paper seen so far, oldest first.
+
+        Returns:
+            list: Dicts with 'version', 'updated' (the version's date, when known) and 'seen_at'
+        """
+        arxiv_id, _ = split_arxiv_id(arxiv_id)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT version, updated, seen_at FROM paper_versions WHERE arxiv_id = ? ORDER BY version",
+                (arxiv_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, arxiv_id):
+        """Return the stored paper for an arXiv ID (with or without version), or None."""
+        arxiv_id, _ = split_arxiv_id(arxiv_id)
+        with self._lock:
+            row = self.conn.execute(f"SELECT {COLUMNS} FROM papers WHERE arxiv_id = ?", (arxiv_id,)).fetchone()
+        return self._to_paper(row) if row else None
+
+    def search(self, text, field="all", limit=50):
+        """
+        Full-text search over the local index, best matches first.
+
+        Args:
+            text (str): Free-text query
+            field (str): One of 'all', 'title', 'abstract', 'author'
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Paper dictionaries
+        """
+        query = _fts_query(text, SEARCH_FIELDS[field])
+        if query is None:
+            return []
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {COLUMNS} FROM papers_fts JOIN papers ON papers.rowid = papers_fts.rowid "
+                "WHERE papers_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [self._to_paper(row) for row in rows]
+
+    def get_many(self, arxiv_ids):
+        """Return stored papers for the given IDs as a dict of arxiv_id -> paper."""
+        ids = [split_arxiv_id(arxiv_id)[0] for arxiv_id in arxiv_ids]
+        found = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT {COLUMNS} FROM papers WHERE arxiv_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((row["arxiv_id"], self._to_paper(row)) for row in rows)
+        return found
+
+    def iter_text(self, batch_size=1000):
+        """
+        Yield batches of the text fields of every stored paper.
+
+        Yields:
+            list: Dicts with 'arxiv_id', 'title', 'summary', 'authors' and 'updated'
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT arxiv_id, title, summary, authors, updated FROM papers WHERE arxiv_id > ? "
+                    "ORDER BY arxiv_id LIMIT ?",
+                    (last, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield [{"arxiv_id": row["arxiv_id"], "title": row["title"], "summary": row["summary"],
+                    "authors": json.loads(row["authors"]), "updated": row["updated"]} for row in rows]
+            last = rows[-1]["arxiv_id"]
+
+    def latest(self, categories=None, limit=50):
+        """
+        Return the most recently published papers, optionally by category.
+
+        Args:
+            categories (list): Category codes to match (any of); all when empty
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Paper dictionaries, newest first
+        """
+        join, params = "", []
+        if categories:
+            join = (
+                "JOIN (SELECT DISTINCT arxiv_id FROM paper_categories "
+                f"WHERE category IN ({','.join('?' * len(categories))})) AS matched USING (arxiv_id)"
+            )
+            params = list(categories)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {COLUMNS} FROM papers {join} ORDER BY papers.published DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [self._to_paper(row) for row in rows]
+
+    def get_harvest_state(self, category):
+        """Return (watermark, harvested_at) for a category, or (None, None)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT watermark, harvested_at FROM harvest_state WHERE category = ?", (category,)
+            ).fetchone()
+        return (row["watermark"], row["harvested_at"]) if row else (None, None)
+
+    def get_harvest_resume(self, category):
+        """Return (offset, newest updated seen) of a harvest that stopped short of its watermark, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT resume_offset, resume_newest FROM harvest_state WHERE category = ?", (category,)
+            ).fetchone()
+        return (row["resume_offset"], row["resume_newest"]) if row and row["resume_offset"] is not None else None
+
+    def set_harvest_state(self, category, watermark, harvested_at, resume=None):
+        """
+        Save a category's harvest progress.
+
+        Args:
+            category (str): Category code
+            watermark (str): Newest 'updated' timestamp up to which everything is stored
+            harvested_at (float): Time of the harvest
+            resume (tuple): (offset, newest updated seen) when the walk stopped before the watermark
+        """
+        offset, newest = resume or (None, None)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO harvest_state (category, watermark, harvested_at, resume_offset, resume_newest) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (category, watermark, harvested_at, offset, newest),
+            )
+
+    def get_import_state(self, harvest):
+        """Return the saved progress of a bulk import as a dict, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT token, records, complete_list_size, done, updated_at FROM import_state WHERE harvest = ?",
+                (harvest,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def set_import_state(self, harvest, token, records, complete_list_size=None, done=False):
+        """
+        Save the progress of a bulk import.
+
+        Args:
+            harvest (str): Key of the import (source, set and date range)
+            token (str): Resumption token to continue from, None to start over
+            records (int): Records processed so far
+            complete_list_size (int): Size of the whole list, if the source reports it
+            done (bool): Whether the import finished
+        """
+        with self._lock, self.conn:
+            self._write_import_state(harvest, token, records, complete_list_size, done)
+
+    def _write_import_state(self, harvest, token, records, complete_list_size=None, done=False):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO import_state (harvest, token, records, complete_list_size, done, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (harvest, token, records, complete_list_size, int(done), time.time()),
+        )
+
+    def save_texts(self, texts):
+        """
+        Store extracted full texts in a single transaction.
+
+        Args:
+            texts (list): (arxiv_id, version, pages, text) tuples
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO paper_text (arxiv_id, version, pages, text, extracted_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(arxiv_id, version, pages, text, now) for arxiv_id, version, pages, text in texts],
+            )
+
+    def get_text(self, arxiv_id):
+        """Return {'version', 'pages', 'text', 'extracted_at'} for a paper's full text, or None."""
+        arxiv_id, _ = split_arxiv_id(arxiv_id)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT version, pages, text, extracted_at FROM paper_text WHERE arxiv_id = ?", (arxiv_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def text_versions(self, arxiv_ids):
+        """Return arxiv_id -> version of the stored full text, for those that have one."""
+        versions = {}
+        arxiv_ids = list(arxiv_ids)
+        for i in range(0, len(arxiv_ids), 500):
+            chunk = arxiv_ids[i:i + 500]
+            with self._lock:
+                rows = self.conn.execute(
+                    f"SELECT arxiv_id, version FROM paper_text WHERE arxiv_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+            versions.update((row["arxiv_id"], row["version"]) for row in rows)
+        return versions
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    @staticmethod
+    def _to_paper(row):
+        return {
+            "arxiv_id": row["arxiv_id"],
+            "version": row["version"],
+            "title": row["title"],
+            "authors": json.loads(row["authors"]),
+            "summary": row["summary"],
+            "published": row["published"],
+            "updated": row["updated"],
+            "categories": json.loads(row["categories"]),
+            "id": row["entry_id"],
+            "pdf_url": row["pdf_url"],
+            "primary_category": row["primary_category"],
+            "doi": row["doi"],
+            "journal_ref": row["journal_ref"],
+            "comment": row["comment"],
+            "published_ts": row["published_ts"] or 0,
+            "updated_ts": row["updated_ts"] or 0,
+        }
+
+    def close(self):
+        self.conn.close()
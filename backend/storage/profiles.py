@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DB_PATH = os.getenv("PROFILE_DB_PATH", "data/profiles/profiles.db")
+# Profiles from before the SQLite store, imported once when the database is created
+LEGACY_PROFILES_FILE = "data/user_profiles.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class ProfileStore:
+    """
+    Per-user profile records in SQLite (WAL mode).
+
+    Each profile is one row keyed by user_id, so reads are a primary-key
+    lookup and each save is a single atomic upsert. WAL mode lets several
+    uvicorn worker processes read while one writes; writers wait on the busy
+    timeout instead of failing.
+
+    Args:
+        db_path (str): Path of the SQLite database (':memory:' for tests)
+        legacy_file (str): JSON file of {user_id: profile} imported when the
+            database is first created
+    """
+
+    def __init__(self, db_path=PROFILE_DB_PATH, legacy_file=LEGACY_PROFILES_FILE):
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if legacy_file and self.count() == 0:
+            self._import_legacy(legacy_file)
+
+    def _import_legacy(self, legacy_file):
+        path = Path(legacy_file)
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r') as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading legacy profiles from {path}: {e}")
+            return
+        for user_id, profile in legacy.items():
+            self.save(user_id, profile)
+        if legacy:
+            logger.info(f"Imported {len(legacy)} profiles from {path}")
+
+    def get(self, user_id):
+        """Return the profile dict for user_id, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, user_id, profile):
+        """Create or replace the profile for user_id in one atomic write."""
+        data = json.dumps(profile)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO profiles (user_id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (user_id, data, time.time()),
+            )
+
+    def delete(self, user_id):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+
+    def all(self):
+        """Yield (user_id, profile) for every stored profile."""
+        with self._lock:
+            rows = self.conn.execute("SELECT user_id, data FROM profiles ORDER BY user_id").fetchall()
+        for user_id, data in rows:
+            yield user_id, json.loads(data)
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
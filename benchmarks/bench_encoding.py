@@ -0,0 +1,85 @@
+"""Micro-benchmark: response encodings for a page of papers.
+
+Encodes a list response of synthetic papers with
+  * dict:     FastAPI's default path (jsonable_encoder, then json.dumps),
+              which is what the endpoints returned before PaperResponse
+  * fast:     backend.encoding.dumps (orjson when installed)
+  * msgpack:  msgpack.packb (when installed)
+  * titles:   the fast path with a fields=["title"] projection
+
+and reports serialization time plus bytes on the wire uncompressed, with
+gzip (GZIP_LEVEL) and with brotli (BROTLI_QUALITY, when installed).
+Synthetic abstracts repeat more than real ones, so real compression
+ratios are somewhat lower.
+
+Usage:
+    python -m benchmarks.bench_encoding --papers 500 --repeat 20
+"""
+import argparse
+import json
+import time
+import zlib
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.arxiv_scraper.parser import AtomParser
+from backend.encoding import BROTLI_QUALITY, GZIP_LEVEL, brotli, dumps, msgpack
+from backend.listing import project
+from benchmarks.stub_arxiv import make_feed
+
+
+def dict_response(body):
+    return json.dumps(jsonable_encoder(body), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def best_time(encode, body, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = encode(body)
+        best = min(best, time.perf_counter() - started)
+    return data, best
+
+
+def measure(encode, body, repeat):
+    data, encode_s = best_time(encode, body, repeat)
+    result = {"encode_ms": round(encode_s * 1e3, 3), "bytes": len(data)}
+    gzipped, gzip_s = best_time(lambda d: zlib.compress(d, GZIP_LEVEL, wbits=16 + zlib.MAX_WBITS), data, repeat)
+    result.update(gzip_bytes=len(gzipped), gzip_ms=round(gzip_s * 1e3, 3))
+    if brotli is not None:
+        compressed, br_s = best_time(lambda d: brotli.compress(d, quality=BROTLI_QUALITY), data, repeat)
+        result.update(br_bytes=len(compressed), br_ms=round(br_s * 1e3, 3))
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--papers", type=int, default=500, help="Papers in the response")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    feed = AtomParser()
+    papers = feed.feed(make_feed(args.papers).encode()) + feed.close()
+    body = {"success": True, "papers": papers, "total": len(papers)}
+
+    encoders = {"dict": dict_response, "fast": dumps}
+    if msgpack is not None:
+        encoders["msgpack"] = lambda b: msgpack.packb(b, use_bin_type=True)
+    results = {name: measure(encode, body, args.repeat) for name, encode in encoders.items()}
+    results["titles"] = measure(dumps, dict(body, papers=project(papers, ["title"])), args.repeat)
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"Response: {len(papers)} papers")
+    for name, r in results.items():
+        line = (f"{name:>8}: encode {r['encode_ms']:>8} ms  {r['bytes']:>9} B  "
+                f"gzip {r['gzip_bytes']:>8} B ({r['gzip_ms']} ms)")
+        if "br_bytes" in r:
+            line += f"  br {r['br_bytes']:>8} B ({r['br_ms']} ms)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,81 @@
+"""Benchmark: OAI-PMH bulk import throughput and memory.
+
+Harvests synthetic arXivRaw records from the stub server's /oai endpoint
+(benchmarks/stub_arxiv.py) into an empty paper store in a temporary
+directory with BulkImporter, and reports records per second, papers
+stored and peak memory. Peak memory should stay roughly flat as --records
+grows, since responses are parsed while they stream in and at most two
+batches are held at once; --tracemalloc measures the Python heap exactly
+but slows parsing several times over.
+
+Usage:
+    python -m benchmarks.bench_import --records 20000 --page-size 1000 --batch-size 5000
+"""
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend.arxiv_scraper.oai import OAIClient
+from backend.bulk_import import BulkImporter
+from backend.storage import PaperStore
+from benchmarks.stub_arxiv import StubArxivServer
+
+
+async def run(args, oai_url, directory):
+    store = PaperStore(str(Path(directory) / "papers.db"))
+    importer = BulkImporter(store, OAIClient(oai_url), batch_size=args.batch_size)
+    if args.tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        stats = (await importer.run())["*"]
+    finally:
+        await importer.close()
+    elapsed = time.perf_counter() - started
+    stored = store.count()
+    store.close()
+    result = {
+        "records": stats["records"],
+        "stored": stored,
+        "pages": stats["pages"],
+        "wall_s": round(elapsed, 3),
+        "records_per_s": round(stats["records"] / elapsed),
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        "rss_peak_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                             / (1e6 if sys.platform == "darwin" else 1e3), 1),
+    }
+    if args.tracemalloc:
+        result["heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+        tracemalloc.stop()
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20000, help="Records the stub lists")
+    parser.add_argument("--page-size", type=int, default=1000, help="Records per OAI-PMH response")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Papers per transaction")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per response in seconds")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also measure peak Python heap (slower)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    with StubArxivServer(latency=args.latency, total_results=args.records, oai_page_size=args.page_size) as stub, \
+            tempfile.TemporaryDirectory() as directory:
+        result = asyncio.run(run(args, stub.oai_url, directory))
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"{result['records']} records in {result['pages']} pages, {result['stored']} papers stored: "
+          f"{result['records_per_s']} records/s ({result['wall_s']} s), rss {result['rss_peak_mb']} MB"
+          + (f", heap {result['heap_peak_mb']} MB" if "heap_peak_mb" in result else ""))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,88 @@
+"""Concurrent load benchmark for the /papers endpoints.
+
+Runs N concurrent clients against the FastAPI app (in-process, over ASGI)
+while the backend talks to a local stub Atom server with fixed latency.
+With a non-blocking fetch layer, requests overlap and wall time stays close
+to ``requests_per_client * latency`` instead of growing with N.
+
+Usage:
+    python -m benchmarks.bench_load --clients 20 --requests 5 --latency 0.2
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from backend import main
+from benchmarks.bench_suite import close_backend, percentile, reset_backend
+from benchmarks.stub_arxiv import StubArxivServer
+
+
+async def run_client(client, client_id, requests_per_client, latencies):
+    for i in range(requests_per_client):
+        if (client_id + i) % 2:
+            url, payload = "/papers/by-author", {"author_id": f"Author{client_id}", "max_results": 25}
+        else:
+            url, payload = "/papers/daily", {"categories": ["cs.LG"]}
+        started = time.perf_counter()
+        response = await client.post(url, json=payload)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(clients, requests_per_client, stub_url):
+    # Scraper, harvester, store and caches all point at the stub and a scratch directory
+    with tempfile.TemporaryDirectory() as directory:
+        reset_backend(directory, stub_url, clients)
+        latencies = []
+        transport = httpx.ASGITransport(app=main.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                started = time.perf_counter()
+                await asyncio.gather(*[
+                    run_client(client, i, requests_per_client, latencies) for i in range(clients)
+                ])
+                wall = time.perf_counter() - started
+        finally:
+            await close_backend()
+    return latencies, wall
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=5, help="Requests per client")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub upstream latency in seconds")
+    parser.add_argument("--stub-url", help="Use an already running stub (python -m benchmarks.stub_arxiv)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.stub_url:
+        latencies, wall = asyncio.run(run(args.clients, args.requests, args.stub_url))
+    else:
+        with StubArxivServer(latency=args.latency) as stub:
+            latencies, wall = asyncio.run(run(args.clients, args.requests, stub.url))
+
+    results = {
+        "clients": args.clients,
+        "requests": len(latencies),
+        "upstream_latency_s": args.latency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+    }
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for key, value in results.items():
+            print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main_cli()
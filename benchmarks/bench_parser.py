@@ -0,0 +1,89 @@
+"""Micro-benchmark: incremental Atom parser vs. the ElementTree tree parser.
+
+Parses a synthetic 2,000-entry arXiv feed with
+  * legacy:      ArxivScraper._parse_results from the archived v1 scraper
+                 (ET.fromstring + per-entry find/findall namespace lookups)
+  * incremental: backend.arxiv_scraper.parser.AtomParser fed in 64 KiB chunks
+
+and reports throughput (entries/s, MB/s) and peak traced memory.
+
+Usage:
+    python -m benchmarks.bench_parser --entries 2000 --repeat 5
+"""
+import argparse
+import importlib.util
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend.arxiv_scraper.parser import AtomParser
+from benchmarks.stub_arxiv import make_feed
+
+ARCHIVED_SCRAPER = Path(__file__).resolve().parent.parent / "archive/scrapers/arxiv_scraper_v1/scraper.py"
+CHUNK_SIZE = 64 * 1024
+
+
+def load_legacy_parser():
+    spec = importlib.util.spec_from_file_location("arxiv_scraper_v1", ARCHIVED_SCRAPER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # _parse_results doesn't touch instance state, so skip creating an HTTP client
+    return lambda data: module.ArxivScraper._parse_results(None, data.decode())
+
+
+def parse_incremental(data):
+    parser = AtomParser()
+    papers = []
+    for i in range(0, len(data), CHUNK_SIZE):
+        papers.extend(parser.feed(data[i:i + CHUNK_SIZE]))
+    papers.extend(parser.close())
+    return papers
+
+
+def measure(parse, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        papers = parse(data)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "entries": len(papers),
+        "best_s": round(best, 4),
+        "entries_per_s": round(len(papers) / best),
+        "mb_per_s": round(len(data) / best / 1e6, 1),
+        "peak_mem_mb": round(peak / 1e6, 2),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000, help="Entries in the fixture feed")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    data = make_feed(args.entries).encode()
+    results = {
+        "feed_mb": round(len(data) / 1e6, 2),
+        "legacy": measure(load_legacy_parser(), data, args.repeat),
+        "incremental": measure(parse_incremental, data, args.repeat),
+    }
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"Feed: {args.entries} entries, {results['feed_mb']} MB")
+    for name in ["legacy", "incremental"]:
+        r = results[name]
+        print(f"{name:>12}: {r['entries_per_s']:>8} entries/s  {r['mb_per_s']:>6} MB/s  "
+              f"peak {r['peak_mem_mb']} MB  ({r['entries']} entries)")
+
+
+if __name__ == "__main__":
+    main_cli()
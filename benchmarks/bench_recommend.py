@@ -0,0 +1,100 @@
+"""Benchmark: recommendation scoring over a large synthetic paper corpus.
+
+Builds a PaperIndex over N synthetic papers (Zipf-distributed vocabulary)
+and times profile queries: one sparse matrix-vector product plus top-k.
+Also times the incremental path: adding a daily batch of new papers and
+revised versions, compacting the segments, and reopening the saved index.
+
+Usage:
+    python -m benchmarks.bench_recommend --papers 100000 --queries 50
+"""
+import argparse
+import json
+import tempfile
+import time
+
+import numpy as np
+
+from backend.recommend import PaperIndex, author_token, tokenize
+
+VOCABULARY_SIZE = 20000
+
+
+def make_corpus(n_papers, seed=0):
+    """Generate synthetic papers with Zipf-distributed words and authors."""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    words = rng.zipf(1.3, size=(n_papers, 130)) % VOCABULARY_SIZE
+    authors = rng.integers(0, n_papers // 5 + 1, size=(n_papers, 3))
+    for i in range(n_papers):
+        yield {
+            "arxiv_id": f"{2400 + i // 100000}.{i % 100000:05d}",
+            "title": " ".join(vocabulary[w] for w in words[i, :10]),
+            "summary": " ".join(vocabulary[w] for w in words[i, 10:]),
+            "authors": [f"Author {a}" for a in authors[i]],
+            "updated": "2024-01-01T00:00:00Z",
+        }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--papers", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--daily", type=int, default=1000, help="Papers in the incremental batch")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    index = PaperIndex(path=directory.name)
+    papers = list(make_corpus(args.papers + args.daily))
+    started = time.perf_counter()
+    for start in range(0, args.papers, 5000):
+        index.add(papers[start:min(start + 5000, args.papers)])
+    build_s = time.perf_counter() - started
+
+    # A day's harvest: new submissions plus revised versions of older papers
+    daily = papers[args.papers:] + [dict(p, updated="2024-02-01T00:00:00Z") for p in papers[:args.daily // 10]]
+    started = time.perf_counter()
+    index.add(daily)
+    add_daily_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    index.compact()
+    compact_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = PaperIndex.open(directory.name)
+    index.idf()
+    open_ms = (time.perf_counter() - started) * 1000
+
+    rng = np.random.default_rng(1)
+    timings = []
+    for _ in range(args.queries):
+        terms = rng.integers(0, 2000, size=5)
+        tokens = tokenize(" ".join(f"term{t}" for t in terms)) + [author_token(f"Author {rng.integers(0, 100)}")]
+        started = time.perf_counter()
+        index.top_k(tokens, k=args.k)
+        timings.append(time.perf_counter() - started)
+
+    timings_ms = np.array(timings) * 1000
+    results = {
+        "papers": len(index),
+        "nnz": int(sum(len(segment.data) for segment in index.segments)),
+        "build_s": round(build_s, 1),
+        "add_daily_ms": round(add_daily_ms, 1),
+        "compact_s": round(compact_s, 2),
+        "open_ms": round(open_ms, 1),
+        "query_p50_ms": round(float(np.percentile(timings_ms, 50)), 1),
+        "query_p99_ms": round(float(np.percentile(timings_ms, 99)), 1),
+    }
+    directory.cleanup()
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for key, value in results.items():
+            print(f"{key:>14}: {value}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,131 @@
+"""Benchmark: "similar papers" queries, IVF index against brute force.
+
+Builds a SimilarityIndex over N papers and times queries for papers in the
+index with several probe counts, against an exact brute-force scan of the
+full float32 embedding matrix. For each probe count it reports latency
+(p50/p99) and recall@k: the fraction of the true k nearest neighbours the
+index returns.
+
+Two corpora:
+  * text (default): synthetic papers from bench_recommend (Zipf-distributed
+    words), embedded from title and abstract as the backend does; embedding
+    takes a few minutes per million papers. Random words have no topics, so
+    true neighbours are barely closer than other papers and recall here is
+    a pessimistic bound
+  * --vectors: clustered random unit vectors, for quickly checking latency
+    at a million papers and more
+
+Usage:
+    python -m benchmarks.bench_similar --papers 100000
+    python -m benchmarks.bench_similar --vectors --papers 1000000 --probes 1 4 8 16 32
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from backend.recommend import PaperIndex
+from backend.recommend.ann import EMBEDDING_DIM, SimilarityIndex, embed_paper
+from benchmarks.bench_recommend import make_corpus
+
+
+def text_embeddings(n_papers, dim):
+    """arXiv IDs and embeddings of synthetic papers (TF-IDF weighted over the corpus)."""
+    papers = list(make_corpus(n_papers))
+    index = PaperIndex()
+    for start in range(0, n_papers, 5000):
+        index.add(papers[start:start + 5000])
+    idf = index.idf()
+    return [p["arxiv_id"] for p in papers], np.stack([embed_paper(p, idf, dim) for p in papers])
+
+
+def clustered_embeddings(n_papers, dim, seed=0):
+    """Unit vectors around n_papers / 200 random topic directions."""
+    rng = np.random.default_rng(seed)
+    topics = rng.standard_normal((max(1, n_papers // 200), dim)).astype(np.float32)
+    vectors = np.empty((n_papers, dim), dtype=np.float32)
+    for start in range(0, n_papers, 100000):
+        end = min(start + 100000, n_papers)
+        chunk = topics[rng.integers(0, len(topics), end - start)]
+        chunk += 0.5 * rng.standard_normal(chunk.shape).astype(np.float32)
+        vectors[start:end] = chunk / np.linalg.norm(chunk, axis=1, keepdims=True)
+    return [f"{2400 + i // 100000}.{i % 100000:05d}" for i in range(n_papers)], vectors
+
+
+def brute_force(vectors, query, k):
+    scores = vectors @ query
+    top = np.argpartition(-scores, k)[:k + 1]
+    return top[np.argsort(-scores[top])]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--papers", type=int, default=100000)
+    parser.add_argument("--vectors", action="store_true", help="Use clustered random vectors instead of text")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    parser.add_argument("--lists", type=int, help="Inverted lists (default: about sqrt(papers))")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.vectors:
+        ids, vectors = clustered_embeddings(args.papers, args.dim)
+    else:
+        ids, vectors = text_embeddings(args.papers, args.dim)
+    embed_s = time.perf_counter() - started
+
+    index = SimilarityIndex(dim=args.dim)
+    index.add_vectors(ids, vectors)
+    started = time.perf_counter()
+    index.build(n_lists=args.lists)
+    build_s = time.perf_counter() - started
+
+    rng = np.random.default_rng(1)
+    queries = rng.choice(len(ids), size=args.queries, replace=False)
+    exact, exact_ms = [], []
+    for row in queries:
+        started = time.perf_counter()
+        top = brute_force(vectors, vectors[row], args.k)
+        exact_ms.append((time.perf_counter() - started) * 1000)
+        exact.append({ids[i] for i in top if i != row})
+
+    results = {
+        "papers": len(ids),
+        "lists": len(index.centroids),
+        "embed_s": round(embed_s, 2),
+        "build_s": round(build_s, 2),
+        "brute_force": {"p50_ms": round(float(np.percentile(exact_ms, 50)), 3),
+                        "p99_ms": round(float(np.percentile(exact_ms, 99)), 3)},
+        "probes": {},
+    }
+    for probes in args.probes:
+        timings, recalls = [], []
+        for row, truth in zip(queries, exact):
+            vector = index.vector(ids[row])
+            started = time.perf_counter()
+            found = index.search(vector, args.k, probes=probes, exclude=[ids[row]])
+            timings.append((time.perf_counter() - started) * 1000)
+            recalls.append(len(truth & {arxiv_id for arxiv_id, _ in found}) / args.k)
+        results["probes"][probes] = {
+            "p50_ms": round(float(np.percentile(timings, 50)), 3),
+            "p99_ms": round(float(np.percentile(timings, 99)), 3),
+            f"recall@{args.k}": round(float(np.mean(recalls)), 3),
+        }
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    print(f"{results['papers']} papers, {results['lists']} lists: embedded in {results['embed_s']} s, "
+          f"built in {results['build_s']} s")
+    print(f"brute force: p50 {results['brute_force']['p50_ms']} ms  p99 {results['brute_force']['p99_ms']} ms")
+    for probes, r in results["probes"].items():
+        print(f"probes {probes:>4}: p50 {r['p50_ms']:>7} ms  p99 {r['p99_ms']:>7} ms  "
+              f"recall@{args.k} {r[f'recall@{args.k}']}")
+
+
+if __name__ == "__main__":
+    main_cli()
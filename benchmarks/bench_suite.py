@@ -0,0 +1,250 @@
+"""Offline benchmark suite: the backend's main workloads against a stub arXiv.
+
+Runs each workload with N concurrent clients against the FastAPI app
+(in-process, over ASGI) while the backend talks to a local stub Atom server
+(benchmarks/stub_arxiv.py) with configurable latency, jitter and injected
+503s. Every workload starts from an empty paper store, cache and index in
+a temporary directory, and random choices are seeded, so runs on different
+commits are comparable.
+
+Workloads:
+  * author:  POST /papers/by-author over a rotating set of author names
+  * daily:   POST /papers/daily for a few categories (harvest, then store reads)
+  * batch:   POST /papers/batch with 100 random IDs (id_list, then local hits)
+  * profile: POST /profile, GET /profile/{id} and GET /recommendations/{id}
+
+For each it reports throughput, p50/p95/p99/mean latency, errors and peak
+memory. Results are printed, or written as JSON with --output; --compare
+prints the change against an earlier JSON result.
+
+Usage:
+    python -m benchmarks.bench_suite --clients 10 --requests 20 --latency 0.05
+    python -m benchmarks.bench_suite --output before.json
+    python -m benchmarks.bench_suite --compare before.json --error-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+
+from backend import main
+from backend.arxiv_scraper import ArxivScraper, RequestScheduler
+from backend.arxiv_scraper.parser import parse_feed
+from backend.cache import ResultCache
+from backend.harvester import DailyHarvester
+from backend.recommend import PaperIndex
+from backend.singleflight import SingleFlight
+from backend.storage import PaperStore, ProfileStore
+from benchmarks.stub_arxiv import StubArxivServer, make_feed
+
+WORKLOADS = ["author", "daily", "batch", "profile"]
+CATEGORIES = ["cs.LG", "cs.AI", "stat.ML", "cs.CL"]
+INTERESTS = ["scalable methods", "research agents", "benchmarking", "synthetic workloads", "baselines"]
+BATCH_SIZE = 100
+
+
+def author_request(rng, client_id, i, args):
+    author = f"Alice Author{(client_id * args.requests + i) % args.authors}"
+    return "POST", "/papers/by-author", {"author_id": author, "max_results": 50}
+
+
+def daily_request(rng, client_id, i, args):
+    category = CATEGORIES[(client_id * args.requests + i) % len(CATEGORIES)]
+    return "POST", "/papers/daily", {"categories": [category], "max_results": 50}
+
+
+def batch_request(rng, client_id, i, args):
+    ids = [f"2504.{n:05d}" for n in rng.sample(range(args.total_results), BATCH_SIZE)]
+    return "POST", "/papers/batch", {"ids": ids}
+
+
+def profile_request(rng, client_id, i, args):
+    # Each client is one user: save the profile, read it back, get recommendations
+    user_id = f"user{client_id}"
+    step = i % 3
+    if step == 0:
+        profile = {"user_id": user_id, "interests": rng.sample(INTERESTS, 2), "favorite_authors": ["Bob Builder"]}
+        return "POST", "/profile", profile
+    if step == 1:
+        return "GET", f"/profile/{user_id}", None
+    return "GET", f"/recommendations/{user_id}", None
+
+
+REQUESTS = {"author": author_request, "daily": daily_request, "batch": batch_request, "profile": profile_request}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def reset_backend(directory, stub_url, clients, papers=0):
+    """Point the backend at the stub, with an empty store, cache and index in directory (plus papers stub papers)"""
+    main.scraper = ArxivScraper(base_url=stub_url, max_connections=clients, scheduler=RequestScheduler(interval=0))
+    main.cache = ResultCache(max_entries=256)
+    main.flights = SingleFlight()
+    main.store = PaperStore(str(Path(directory) / "papers.db"))
+    main.profiles = ProfileStore(str(Path(directory) / "profiles.db"), legacy_file=None)
+    main.paper_index = PaperIndex()
+    main.store.listeners.append(lambda papers: main.paper_index.add(papers))
+    main.harvester = DailyHarvester(main.scraper, main.store)
+    if papers:
+        main.store.add_papers(parse_feed(make_feed(papers)))
+
+
+async def close_backend():
+    await main.scraper.close()
+    main.store.close()
+    main.profiles.close()
+
+
+async def run_client(client, workload, client_id, args, latencies, errors):
+    rng = random.Random(args.seed * 1000 + client_id)
+    for i in range(args.requests):
+        method, url, payload = REQUESTS[workload](rng, client_id, i, args)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, json=payload)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        latencies.append(time.perf_counter() - started)
+        if not ok:
+            errors.append(url)
+
+
+async def run_workload(workload, args, stub_url):
+    with tempfile.TemporaryDirectory() as directory:
+        # Recommendations need papers to rank
+        reset_backend(directory, stub_url, args.clients, papers=args.total_results if workload == "profile" else 0)
+        latencies, errors = [], []
+        if args.tracemalloc:
+            tracemalloc.start()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*[
+                run_client(client, workload, i, args, latencies, errors) for i in range(args.clients)
+            ])
+            wall = time.perf_counter() - started
+        result = {
+            "requests": len(latencies),
+            "errors": len(errors),
+            "wall_s": round(wall, 3),
+            "throughput_rps": round(len(latencies) / wall, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+            # ru_maxrss is KiB on Linux and bytes on macOS; it only grows over the run
+            "rss_peak_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                                 / (1e6 if sys.platform == "darwin" else 1e3), 1),
+        }
+        if args.tracemalloc:
+            result["heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+            tracemalloc.stop()
+        await close_backend()
+    return result
+
+
+async def run(args, stub):
+    results = {}
+    for workload in args.workloads:
+        results[workload] = await run_workload(workload, args, stub.url)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Lines describing the change of each workload against a baseline result"""
+    lines = [f"Compared with {baseline['meta'].get('commit') or 'baseline'}:"]
+    for workload, current in results["workloads"].items():
+        before = baseline["workloads"].get(workload)
+        if not before:
+            continue
+        changes = []
+        for key in ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]:
+            if before[key]:
+                changes.append(f"{key} {(current[key] - before[key]) / before[key] * 100:+.1f}%")
+        lines.append(f"{workload:>8}: " + "  ".join(changes))
+    return lines
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent clients per workload")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds of latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests failing with 503")
+    parser.add_argument("--total-results", type=int, default=1000, help="Papers the stub knows about")
+    parser.add_argument("--authors", type=int, default=20, help="Distinct authors / users requested")
+    parser.add_argument("--feeds", help="Replay recorded feeds from this directory (see stub_arxiv --record-from)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tracemalloc", action="store_true", help="Also measure peak Python heap (slower)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Earlier JSON result to compare against")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--log-level", default="WARNING", help="Backend log level during the run")
+    args = parser.parse_args()
+    # Loggers keep their configured levels (config/logging.conf); the output is filtered instead
+    for handler in logging.getLogger().handlers:
+        handler.setLevel(args.log_level)
+
+    with StubArxivServer(latency=args.latency, total_results=args.total_results, jitter=args.jitter,
+                         error_rate=args.error_rate, feeds_dir=args.feeds, seed=args.seed) as stub:
+        workloads = asyncio.run(run(args, stub))
+        stub_stats = stub.stats()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "compare", "json", "log_level")},
+            "stub": stub_stats,
+        },
+        "workloads": workloads,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"{args.clients} clients x {args.requests} requests, upstream latency {args.latency}s, "
+              f"error rate {args.error_rate} ({stub_stats['requests']} upstream requests)")
+        for workload, r in workloads.items():
+            print(f"{workload:>8}: {r['throughput_rps']:>7} req/s  p50 {r['p50_ms']:>7} ms  p95 {r['p95_ms']:>7} ms  "
+                  f"p99 {r['p99_ms']:>7} ms  errors {r['errors']}  rss {r['rss_peak_mb']} MB"
+                  + (f"  heap {r['heap_peak_mb']} MB" if "heap_peak_mb" in r else ""))
+    if args.compare:
+        for line in compare(results, json.loads(Path(args.compare).read_text())):
+            print(line)
+
+
+if __name__ == "__main__":
+    main_cli()
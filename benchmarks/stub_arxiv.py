@@ -0,0 +1,331 @@
+"""Local stub of the arXiv Atom API for offline benchmarks.
+
+Serves Atom feeds on ``/api/query`` with configurable latency and injected
+errors, so the backend can be load-tested without touching export.arxiv.org.
+Feeds are generated, or replayed from a directory of recorded responses
+(record one with ``--record-from http://export.arxiv.org/api/query``).
+"""
+import hashlib
+import random
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+FEED_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title type="html">ArXiv Query: stub</title>
+  <id>http://arxiv.org/api/stub</id>
+  <updated>2025-04-25T00:00:00-04:00</updated>
+  <opensearch:totalResults>{total}</opensearch:totalResults>
+  <opensearch:startIndex>{start}</opensearch:startIndex>
+  <opensearch:itemsPerPage>{count}</opensearch:itemsPerPage>
+"""
+
+ENTRY_TEMPLATE = """  <entry>
+    <id>http://arxiv.org/abs/2504.{num:05d}v{version}</id>
+    <updated>2025-04-{day:02d}T12:00:00Z</updated>
+    <published>2025-04-{day:02d}T10:00:00Z</published>
+    <title>Stub Paper {num}: Scalable Methods for
+      Benchmarking Research Agents</title>
+    <summary>  We study synthetic workloads for paper {num}. This abstract is long enough
+to look like a real arXiv abstract and exercises whitespace handling in the parser.
+Results are reported for several configurations and compared to baselines.
+</summary>
+    <author>
+      <name>Alice Author{mod}</name>
+    </author>
+    <author>
+      <name>Bob Builder</name>
+      <arxiv:affiliation>Stub University</arxiv:affiliation>
+    </author>
+    <arxiv:doi>10.0000/stub.{num}</arxiv:doi>
+    <link title="doi" href="http://dx.doi.org/10.0000/stub.{num}" rel="related"/>
+    <arxiv:comment>{pages} pages, 3 figures</arxiv:comment>
+    <arxiv:journal_ref>Stub J. {num} (2025)</arxiv:journal_ref>
+    <link href="http://arxiv.org/abs/2504.{num:05d}v{version}" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2504.{num:05d}v{version}" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="stat.ML" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+"""
+
+
+OAI_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<responseDate>2025-04-25T00:00:00Z</responseDate>
+<request verb="ListRecords">http://export.arxiv.org/oai2</request>
+<ListRecords>
+"""
+
+OAI_RECORD_TEMPLATE = """<record><header><identifier>oai:arXiv.org:2504.{num:05d}</identifier>
+<datestamp>2025-04-{day:02d}</datestamp><setSpec>cs</setSpec></header>
+<metadata><arXivRaw xmlns="http://arxiv.org/OAI/arXivRaw/">
+<id>2504.{num:05d}</id><submitter>Alice Author{mod}</submitter>
+<version version="v1"><date>Tue, {day} Apr 2025 10:00:00 GMT</date><size>120kb</size></version>
+<version version="v2"><date>Tue, {day} Apr 2025 12:00:00 GMT</date><size>121kb</size></version>
+<title>Stub Paper {num}: Scalable Methods for
+  Benchmarking Research Agents</title>
+<authors>Alice Author{mod}, Bob Builder and Carol Coder</authors>
+<categories>{categories}</categories>
+<comments>{pages} pages, 3 figures</comments>
+<doi>10.0000/stub.{num}</doi>
+<license>http://arxiv.org/licenses/nonexclusive-distrib/1.0/</license>
+<abstract>  We study synthetic workloads for paper {num}. This abstract is long enough
+to look like a real arXiv abstract and exercises whitespace handling in the parser.
+</abstract>
+</arXivRaw></metadata></record>
+"""
+
+# Categories of the synthetic OAI records, by number modulo 3
+OAI_CATEGORIES = ["cs.LG stat.ML", "cs.CL", "cs.AI cs.LG"]
+
+
+def make_entry(num, version=1):
+    """Render a single synthetic Atom entry."""
+    return ENTRY_TEMPLATE.format(num=num, version=version, day=num % 28 + 1, mod=num % 7, pages=num % 30 + 5)
+
+
+def make_id_list_feed(ids, max_version=2):
+    """
+    Render the feed for an id_list query over synthetic 2504.NNNNN papers.
+
+    Unversioned IDs resolve to max_version; other IDs are left out, as arXiv does.
+    """
+    entries = []
+    for arxiv_id in ids:
+        number, _, version = arxiv_id.removeprefix("2504.").partition("v")
+        if arxiv_id.startswith("2504.") and number.isdigit() and int(version or max_version) <= max_version:
+            entries.append(make_entry(int(number), version=int(version or max_version)))
+    return FEED_HEADER.format(total=len(entries), start=0, count=len(entries)) + "".join(entries) + "</feed>\n"
+
+
+def make_oai_page(start, count, total, token=None):
+    """
+    Render one OAI-PMH ListRecords response with synthetic arXivRaw records.
+
+    Every fifth record is a deletion. token is the resumption token of the
+    next page (None for the last one).
+    """
+    parts = [OAI_HEADER]
+    for num in range(start, start + count):
+        if num % 5 == 4:
+            parts.append(f'<record><header status="deleted"><identifier>oai:arXiv.org:2504.{num:05d}</identifier>'
+                         "<datestamp>2025-04-01</datestamp></header></record>\n")
+        else:
+            parts.append(OAI_RECORD_TEMPLATE.format(num=num, day=num % 28 + 1, mod=num % 7, pages=num % 30 + 5,
+                                                    categories=OAI_CATEGORIES[num % 3]))
+    parts.append(f'<resumptionToken cursor="{start}" completeListSize="{total}">{token or ""}</resumptionToken>\n')
+    parts.append("</ListRecords>\n</OAI-PMH>\n")
+    return "".join(parts)
+
+
+def recording_key(params):
+    """File name of the recorded response for a query's parameters."""
+    canonical = urlencode(sorted((key, values[0]) for key, values in params.items()))
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16] + ".xml"
+
+
+def make_feed(count, start=0, total=None):
+    """
+    Render a synthetic arXiv Atom feed.
+
+    Args:
+        count (int): Number of entries in the feed
+        start (int): Number of the first entry
+        total (int): Value reported as opensearch:totalResults
+
+    Returns:
+        str: Atom XML document
+    """
+    total = start + count if total is None else total
+    parts = [FEED_HEADER.format(total=total, start=start, count=count)]
+    parts.extend(make_entry(num) for num in range(start, start + count))
+    parts.append("</feed>\n")
+    return "".join(parts)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent load
+    request_queue_size = 128
+
+
+class StubArxivServer:
+    """
+    Threaded HTTP server that answers arXiv API queries with generated or recorded feeds.
+
+    Search queries get a page of a ``total_results``-paper result set and
+    id_list queries get the synthetic papers they name. With ``feeds_dir``
+    a recorded response for the exact query is replayed when there is one;
+    with ``record_from`` every query is forwarded there and saved into
+    ``feeds_dir``. Latency and errors are drawn from a seeded generator, so
+    a run can be reproduced.
+
+    Args:
+        latency (float): Seconds to sleep before answering each request
+        total_results (int): Size of the simulated result set
+        port (int): Port to bind (0 picks a free port)
+        jitter (float): Up to this many extra seconds of latency, uniformly drawn
+        error_rate (float): Fraction of requests answered with error_status
+        error_status (int): Injected error status (arXiv throttles with 503)
+        feeds_dir (str): Directory of recorded feeds to replay
+        record_from (str): Upstream API URL to record feeds from
+        seed (int): Seed for latency jitter and error injection
+        oai_page_size (int): Records per OAI-PMH ListRecords response (served on /oai)
+    """
+
+    def __init__(self, latency=0.0, total_results=1000, port=0, jitter=0.0, error_rate=0.0, error_status=503,
+                 feeds_dir=None, record_from=None, seed=0, oai_page_size=1000):
+        self.latency = latency
+        self.oai_page_size = oai_page_size
+        self.total_results = total_results
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.feeds_dir = Path(feeds_dir) if feeds_dir else None
+        self.record_from = record_from
+        self.request_count = 0
+        self.error_count = 0
+        self.replayed = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", port), self._make_handler())
+        self._thread = None
+
+    def _draw(self):
+        """(delay, inject an error) for the next request"""
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self.error_count += 1
+        return delay, failed
+
+    def feed_for(self, params):
+        """Response body for a query's parameters"""
+        if self.feeds_dir is not None:
+            recorded = self.feeds_dir / recording_key(params)
+            if self.record_from:
+                with urllib.request.urlopen(f"{self.record_from}?{urlencode(params, doseq=True)}") as response:
+                    body = response.read()
+                self.feeds_dir.mkdir(parents=True, exist_ok=True)
+                recorded.write_bytes(body)
+                return body
+            if recorded.exists():
+                with self._lock:
+                    self.replayed += 1
+                return recorded.read_bytes()
+        if "id_list" in params:
+            return make_id_list_feed(params["id_list"][0].split(",")).encode()
+        start = int(params.get("start", ["0"])[0])
+        max_results = int(params.get("max_results", ["10"])[0])
+        count = max(0, min(max_results, self.total_results - start))
+        return make_feed(count, start=start, total=self.total_results).encode()
+
+    def oai_page(self, params):
+        """ListRecords response for an OAI-PMH query (the resumption token is the next offset)"""
+        start = int(params.get("resumptionToken", ["0"])[0])
+        count = max(0, min(self.oai_page_size, self.total_results - start))
+        next_start = start + count
+        return make_oai_page(start, count, self.total_results,
+                             token=str(next_start) if next_start < self.total_results else None).encode()
+
+    def stats(self):
+        return {"requests": self.request_count, "errors": self.error_count, "replayed": self.replayed}
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/query"
+
+    @property
+    def oai_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/oai"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                delay, failed = stub._draw()
+                if delay:
+                    time.sleep(delay)
+                if failed:
+                    body = b"Rate exceeded."
+                    self.send_response(stub.error_status)
+                    self.send_header("Content-Type", "text/plain")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                if urlparse(self.path).path == "/oai":
+                    body = stub.oai_page(params)
+                else:
+                    body = stub.feed_for(params)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main_cli():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve synthetic or recorded arXiv Atom feeds")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--total-results", type=int, default=1000)
+    parser.add_argument("--feeds", help="Directory of recorded feeds to replay (or record into)")
+    parser.add_argument("--record-from", help="Record feeds from this API URL into --feeds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.record_from and not args.feeds:
+        parser.error("--record-from needs --feeds")
+
+    server = StubArxivServer(latency=args.latency, total_results=args.total_results, port=args.port,
+                             jitter=args.jitter, error_rate=args.error_rate, feeds_dir=args.feeds,
+                             record_from=args.record_from, seed=args.seed)
+    print(f"Stub arXiv API listening on {server.url}", flush=True)
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -4,7 +4,7 @@ setup(
     name="arxiv-agent",
     version="0.1",
     packages=find_packages(include=['backend*', 'worker*']),
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     install_requires=[
         "httpx",
         "backoff",
@@ -1,3 +1,77 @@
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
\ No newline at end of file
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep test jobs (and the daily schedules) out of the real job database
+os.environ.setdefault("JOB_DB_PATH", ":memory:")
+
+import httpx
+import pytest
+
+from sample_feeds import SAMPLE_FEED
+
+
+@pytest.fixture
+def mock_arxiv(monkeypatch):
+    """Point the backend at an in-memory arXiv API that serves SAMPLE_FEED.
+
+    Yields the list of upstream requests so tests can inspect the queries.
+    """
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=SAMPLE_FEED)
+
+    yield from _install_arxiv(monkeypatch, handler, requests)
+
+
+@pytest.fixture
+def paged_arxiv(monkeypatch):
+    """Like mock_arxiv, but serves a 250-paper result set honouring start/max_results."""
+    from benchmarks.stub_arxiv import make_feed
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        start = int(request.url.params.get("start", 0))
+        max_results = int(request.url.params.get("max_results", 10))
+        count = max(0, min(max_results, 250 - start))
+        return httpx.Response(200, text=make_feed(count, start=start, total=250))
+
+    yield from _install_arxiv(monkeypatch, handler, requests)
+
+
+@pytest.fixture
+def id_list_arxiv(monkeypatch):
+    """Like mock_arxiv, but answers id_list lookups for synthetic 2504.NNNNN papers (versions up to v2)."""
+    from benchmarks.stub_arxiv import make_id_list_feed
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=make_id_list_feed(request.url.params["id_list"].split(",")))
+
+    yield from _install_arxiv(monkeypatch, handler, requests)
+
+
+def _install_arxiv(monkeypatch, handler, requests):
+    from backend import main
+    from backend.arxiv_scraper import ArxivScraper, RequestScheduler
+    from backend.cache import ResultCache
+    from backend.storage import PaperStore
+    from backend.singleflight import SingleFlight
+    from backend.harvester import DailyHarvester
+
+    scraper = ArxivScraper(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        scheduler=RequestScheduler(interval=0),
+    )
+    monkeypatch.setattr(main, "scraper", scraper)
+    monkeypatch.setattr(main, "cache", ResultCache())
+    store = PaperStore(":memory:")
+    monkeypatch.setattr(main, "store", store)
+    monkeypatch.setattr(main, "flights", SingleFlight())
+    monkeypatch.setattr(main, "harvester", DailyHarvester(scraper, store))
+    yield requests
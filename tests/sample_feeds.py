@@ -0,0 +1,36 @@
+# Atom feeds shared by the tests and fixtures
+
+SAMPLE_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title type="html">ArXiv Query: sample</title>
+  <entry>
+    <id>http://arxiv.org/abs/2401.01234v2</id>
+    <updated>2024-01-05T10:00:00Z</updated>
+    <published>2024-01-02T09:30:00Z</published>
+    <title>Deep Learning for
+      Loop Quantum Gravity</title>
+    <summary>  We apply neural networks to spin foams.
+</summary>
+    <author><name>Yoshua Bengio</name></author>
+    <author><name>Deepak Vaid</name></author>
+    <arxiv:doi>10.1000/xyz123</arxiv:doi>
+    <arxiv:comment>12 pages</arxiv:comment>
+    <arxiv:journal_ref>Phys. Rev. D 1 (2024)</arxiv:journal_ref>
+    <link href="http://arxiv.org/abs/2401.01234v2" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.01234v2" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="gr-qc" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="gr-qc" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/hep-th/9901001v1</id>
+    <updated>1999-01-01T00:00:00Z</updated>
+    <published>1999-01-01T00:00:00Z</published>
+    <title>The Large N Limit of Superconformal Field Theories</title>
+    <summary>We show that the large N limit is holographic.</summary>
+    <author><name>Juan Maldacena</name></author>
+    <link title="pdf" href="http://arxiv.org/pdf/hep-th/9901001v1" rel="related" type="application/pdf"/>
+    <category term="hep-th" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>
+</feed>
+"""
@@ -7,6 +7,7 @@ from backend.main import app
 
 client = TestClient(app)
 
+
 def test_author_search():
     response = client.post("/papers/by-author", json={"author_id": "Bengio"})
     assert response.status_code == 200
@@ -15,10 +16,28 @@ def test_author_search():
     assert len(data["papers"]) > 0
     assert "title" in data["papers"][0]
 
+
 def test_daily_papers():
     response = client.post("/papers/daily", json={"categories": ["cs.AI"]})
     assert response.status_code == 200
     data = response.json()
     assert data["success"] == True
     assert len(data["papers"]) > 0
-    assert "title" in data["papers"][0]
\ No newline at end of file
+    assert "title" in data["papers"][0]
+
+
+def test_author_search_offline(mock_arxiv):
+    response = client.post("/papers/by-author", json={"author_id": "Bengio", "max_results": 10})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] == True
+    assert data["papers"][0]["title"] == "Deep Learning for Loop Quantum Gravity"
+    assert mock_arxiv[0].url.params["search_query"] == "au:Bengio"
+
+
+def test_daily_papers_offline(mock_arxiv):
+    response = client.post("/papers/daily", json={"categories": ["gr-qc", "hep-th"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["published"][:4] for p in data["papers"]] == ["2024", "1999"]
+    assert sorted(r.url.params["search_query"] for r in mock_arxiv) == ["cat:gr-qc", "cat:hep-th"]
@@ -0,0 +1,103 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from api_client import BackendClient
+
+
+class Backend(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.requests = []
+        self.connections = set()
+        self.failures = 0
+        self.delay = 0
+        self.body = {"success": True}
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers)
+        server.connections.add(self.client_address)
+        time.sleep(server.delay)
+        if server.failures:
+            server.failures -= 1
+            self.reply(503, b"", "text/plain")
+        elif "application/msgpack" in self.headers.get("Accept", ""):
+            import msgpack
+            self.reply(200, msgpack.packb(server.body), "application/msgpack")
+        else:
+            self.reply(200, gzip.compress(json.dumps(server.body).encode()), "application/json", gzipped=True)
+
+    def reply(self, status, body, content_type, gzipped=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_reuses_connections_and_decodes_gzip():
+    with Backend() as backend:
+        client = BackendClient(backend.url, use_msgpack=False)
+        for _ in range(5):
+            assert client.get("/profile/dana") == {"success": True}
+    assert len(backend.connections) == 1
+    assert "gzip" in backend.requests[0]["Accept-Encoding"]
+
+
+def test_retries_gateway_errors_then_gives_up():
+    with Backend() as backend:
+        backend.failures = 2
+        client = BackendClient(backend.url, retries=3, backoff_factor=0.01, use_msgpack=False)
+        assert client.get("/cache/stats") == {"success": True}
+        assert len(backend.requests) == 3
+
+        backend.failures = 10
+        with pytest.raises(requests.HTTPError):
+            client.get("/cache/stats")
+
+
+def test_read_timeout_is_bounded_and_not_retried():
+    with Backend() as backend:
+        backend.delay = 0.5
+        client = BackendClient(backend.url, read_timeout=0.1, use_msgpack=False)
+        started = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            client.get("/profile/dana")
+        assert time.monotonic() - started < 0.45
+        assert len(backend.requests) == 1
+
+
+def test_msgpack_responses():
+    pytest.importorskip("msgpack")
+    with Backend() as backend:
+        backend.body = {"success": True, "papers": [{"title": "Spin foams", "published_ts": 1704067200}]}
+        assert BackendClient(backend.url).get("/papers") == backend.body
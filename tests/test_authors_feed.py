@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+
+def test_authors_feed(mock_arxiv):
+    authors = [f"Favourite Author {i}" for i in range(60)]
+    response = client.post("/papers/by-authors", json={"authors": authors, "max_results": 10})
+    assert response.status_code == 200
+    data = response.json()
+
+    # 60 authors fit in two OR-ed queries; the shared papers are returned once, newest first
+    assert data["queries"] == len(mock_arxiv) == 2
+    assert all(" OR " in r.url.params["search_query"] for r in mock_arxiv)
+    assert {r.url.params["sortBy"] for r in mock_arxiv} == {"submittedDate"}
+    assert [p["published"][:4] for p in data["papers"]] == ["2024", "1999"]
@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+from sample_feeds import SAMPLE_FEED
+
+client = TestClient(main.app)
+
+
+def test_batch_lookup(id_list_arxiv):
+    main.store.add_papers(main.scraper._parse_results(SAMPLE_FEED))
+
+    ids = [f"2504.{n:05d}" for n in range(450)]
+    requested = ["http://arxiv.org/abs/2401.01234v2", ids[3], "not-an-id", "9999.99999"] + ids + ["2504.00007v1"]
+    response = client.post("/papers/batch", json={"ids": requested})
+    assert response.status_code == 200
+    data = response.json()
+
+    # Local hit, then arXiv results in request order; the 450 misses take ceil(450 / 200) requests
+    assert len(id_list_arxiv) == 3
+    assert data["sources"] == {"local": 1, "arxiv": 452}
+    assert data["missing"] == ["not-an-id", "9999.99999"]
+    assert [p["id"] for p in data["papers"][:3]] == [
+        "http://arxiv.org/abs/2401.01234v2", "http://arxiv.org/abs/2504.00003v2", "http://arxiv.org/abs/2504.00000v2",
+    ]
+    assert len(data["papers"]) == 453
+    assert data["papers"][-1]["id"] == "http://arxiv.org/abs/2504.00007v1"
+
+    # Everything is in the store now
+    response = client.post("/papers/batch", json={"ids": ids[::-1]})
+    assert response.json()["sources"] == {"local": 450, "arxiv": 0}
+    assert response.json()["papers"][0]["id"] == "http://arxiv.org/abs/2504.00449v2"
+    assert len(id_list_arxiv) == 3
+
+    # The explicitly requested v1 was recorded as a version without replacing v2
+    versions = client.get("/papers/arXiv:2504.00007/versions").json()
+    assert [v["version"] for v in versions["versions"]] == [1, 2]
+    assert client.get("/papers/2504.99999/versions").status_code == 404
@@ -0,0 +1,163 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from backend.arxiv_scraper.oai import DEFAULT_RETRY_AFTER, OAIClient, OAIParser, oai_set, retry_after, split_authors
+from backend.bulk_import import BulkImporter, harvest_key
+from backend.storage import PaperStore
+from benchmarks.stub_arxiv import make_oai_page
+
+BAD_TOKEN = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+<error code="badResumptionToken">The value of the resumptionToken argument is invalid or expired.</error>
+</OAI-PMH>
+"""
+
+
+class FakeOAI:
+    """In-memory OAI-PMH endpoint serving `total` synthetic records, `page_size` per response."""
+
+    def __init__(self, total=25, page_size=10):
+        self.total = total
+        self.page_size = page_size
+        self.requests = []
+        self.fail_at = None
+        self.busy = 0
+        self.expired = set()
+
+    def handler(self, request):
+        self.requests.append(dict(request.url.params))
+        if self.busy:
+            self.busy -= 1
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        token = request.url.params.get("resumptionToken")
+        if token in self.expired:
+            self.expired.discard(token)
+            return httpx.Response(200, text=BAD_TOKEN)
+        start = int(token or 0)
+        if start == self.fail_at:
+            raise httpx.ConnectError("connection reset")
+        count = min(self.page_size, self.total - start)
+        following = start + count
+        return httpx.Response(200, text=make_oai_page(start, count, self.total,
+                                                      str(following) if following < self.total else None))
+
+    def importer(self, store, batch_size=10):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return BulkImporter(store, OAIClient("http://oai.test/oai", client, max_retries=1), batch_size=batch_size)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PaperStore(str(tmp_path / "papers.db"))
+    yield store
+    store.close()
+
+
+def test_parser_streams_arxiv_raw_records():
+    page = make_oai_page(0, 5, 5).encode()
+    parser = OAIParser()
+    papers = []
+    for i in range(0, len(page), 97):
+        papers.extend(parser.feed(page[i:i + 97]))
+    papers.extend(parser.close())
+
+    # Record 4 is a deletion
+    assert parser.records == 5
+    assert [p["id"] for p in papers] == [f"http://arxiv.org/abs/2504.{n:05d}v2" for n in range(4)]
+    paper = papers[1]
+    assert paper["title"] == "Stub Paper 1: Scalable Methods for Benchmarking Research Agents"
+    assert paper["authors"] == ["Alice Author1", "Bob Builder", "Carol Coder"]
+    assert paper["published"] == "2025-04-02T10:00:00Z"
+    assert paper["updated"] == "2025-04-02T12:00:00Z"
+    assert paper["categories"] == ["cs.CL"] and paper["primary_category"] == "cs.CL"
+    assert paper["doi"] == "10.0000/stub.1"
+    assert paper["arxiv_id"] == "2504.00001" and paper["version"] == 2
+    assert [v["version"] for v in paper["versions"]] == [1, 2]
+    assert paper["published_ts"] < paper["updated_ts"]
+    assert parser.token == "" and parser.complete_list_size == 5
+
+
+def test_oai_sets_and_authors():
+    assert oai_set("cs.LG") == "cs"
+    assert oai_set("stat") == "stat"
+    assert oai_set("hep-th") == "physics:hep-th"
+    assert oai_set("astro-ph.CO") == "physics:astro-ph"
+    assert split_authors("A. Einstein, B. Podolsky,\n  and N. Rosen") == ["A. Einstein", "B. Podolsky", "N. Rosen"]
+    assert split_authors("Alice and Bob") == ["Alice", "Bob"]
+
+
+def test_retry_after():
+    now = datetime(2025, 5, 1, 12, 0, tzinfo=timezone.utc)
+    assert retry_after("120", now) == 120
+    assert retry_after("Thu, 01 May 2025 12:00:30 GMT", now) == 30
+    assert retry_after("Thu, 01 May 2025 11:00:00 GMT", now) == 0
+    assert retry_after(None) == retry_after("soon") == DEFAULT_RETRY_AFTER
+
+
+@pytest.mark.asyncio
+async def test_import_follows_resumption_tokens(store):
+    oai = FakeOAI(total=25, page_size=10)
+    importer = oai.importer(store)
+    result = await importer.run(["cs.LG"], from_date="2025-04-01")
+    await importer.close()
+
+    assert oai.requests[0] == {"verb": "ListRecords", "metadataPrefix": "arXivRaw", "set": "cs",
+                               "from": "2025-04-01"}
+    assert [r.get("resumptionToken") for r in oai.requests[1:]] == ["10", "20"]
+    # 20 records survive deletion, 14 of them in cs.LG (n % 3 != 1)
+    stats = result["cs"]
+    assert stats["records"] == 25 and stats["pages"] == 3 and stats["done"]
+    assert store.count() == stats["stored"] == 14
+    assert store.get("2504.00000")["categories"] == ["cs.LG", "stat.ML"]
+    assert store.get("2504.00001") is None
+    assert store.get_import_state(harvest_key("cs", "2025-04-01"))["done"] == 1
+
+
+@pytest.mark.asyncio
+async def test_interrupted_import_resumes_from_checkpoint(store):
+    oai = FakeOAI(total=30, page_size=10)
+    oai.fail_at = 20
+    importer = oai.importer(store)
+    with pytest.raises(httpx.ConnectError):
+        await importer.run()
+    state = store.get_import_state(harvest_key(None))
+    assert state["token"] == "20" and state["records"] == 20 and not state["done"]
+    stored = store.count()
+
+    oai.fail_at = None
+    oai.requests.clear()
+    result = await importer.run()
+    await importer.close()
+    assert [r.get("resumptionToken") for r in oai.requests] == ["20"]
+    assert result["*"]["resumed"] and result["*"]["records"] == 30
+    assert store.count() == stored + 8
+
+    # A finished import is not fetched again unless restarted
+    oai.requests.clear()
+    importer = oai.importer(store)
+    assert (await importer.run())["*"]["stored"] == 0
+    await importer.close()
+    assert oai.requests == []
+
+
+@pytest.mark.asyncio
+async def test_import_waits_out_503_and_restarts_on_expired_token(store):
+    oai = FakeOAI(total=20, page_size=10)
+    oai.busy = 1
+    oai.expired = {"10"}
+    store.set_import_state(harvest_key("cs"), "10", 10)
+
+    importer = oai.importer(store)
+    result = await importer.run(["cs"])
+    await importer.close()
+
+    # A 503 (retried after Retry-After: 0), the expired token, then the whole listing from scratch
+    assert [r.get("resumptionToken") for r in oai.requests] == ["10", "10", None, "10"]
+    assert result["cs"]["records"] == 20 and not result["cs"]["resumed"]
+    assert store.count() == 16
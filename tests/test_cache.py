@@ -0,0 +1,49 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.cache import ResultCache, make_cache_key
+from backend.main import app
+
+client = TestClient(app)
+
+
+def test_key_normalization():
+    assert make_cache_key("daily", categories=["cs.LG", "cs.AI", "cs.LG"]) == \
+        make_cache_key("daily", categories=["cs.AI", "cs.LG"])
+    assert make_cache_key("by-author", author=" Yoshua  Bengio") == \
+        make_cache_key("by-author", author="yoshua bengio")
+    assert make_cache_key("by-author", author="Bengio", max_results=10) != \
+        make_cache_key("by-author", author="Bengio", max_results=20)
+
+
+def test_hit_miss_and_ttl():
+    cache = ResultCache()
+    assert cache.get("a") is None
+    cache.set("a", [1], ttl=0.05)
+    assert cache.get("a") == [1]
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_repeat_search_is_cached(mock_arxiv):
+    for author in ["Bengio", "bengio "]:
+        response = client.post("/papers/by-author", json={"author_id": author, "max_results": 10})
+        assert response.status_code == 200
+    assert len(mock_arxiv) == 1
+    stats = client.get("/cache/stats").json()["cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
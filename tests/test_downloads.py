@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.arxiv_scraper import BACKGROUND, INTERACTIVE, RequestScheduler
+from backend.downloads import DownloadManager
+
+CONTENT = bytes(range(256)) * 400  # 100 KiB
+
+
+def file_server(requests, content=CONTENT, delay=0.0):
+    """Handler serving the same bytes for every URL, honouring Range requests."""
+
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(delay)
+        range_header = request.headers.get("Range")
+        if range_header:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            return httpx.Response(206, content=content[start:])
+        return httpx.Response(200, content=content)
+
+    return handler
+
+
+class RecordingScheduler(RequestScheduler):
+    """Unpaced scheduler that records the priority of every request."""
+
+    def __init__(self):
+        super().__init__(interval=0)
+        self.priorities = []
+
+    async def acquire(self, priority=INTERACTIVE):
+        self.priorities.append(priority)
+        await super().acquire(priority)
+
+
+def manager(tmp_path, handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    kwargs.setdefault("scheduler", RecordingScheduler())
+    return DownloadManager(tmp_path, base_url="http://files.test", client=client, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_downloads_once_per_version(tmp_path):
+    requests = []
+    downloads = manager(tmp_path, file_server(requests, delay=0.05))
+
+    paths = await asyncio.gather(*[downloads.get("2401.01234", 2) for _ in range(5)])
+    assert len(requests) == 1
+    assert requests[0].url == "http://files.test/pdf/2401.01234v2"
+    assert downloads.scheduler.priorities == [INTERACTIVE]
+    assert paths[0].read_bytes() == CONTENT
+
+    await downloads.get("2401.01234", 2)
+    await downloads.get("hep-th/9901001", 1, kind="source")
+    assert [str(r.url) for r in requests[1:]] == ["http://files.test/e-print/hep-th/9901001v1"]
+    assert downloads.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_resumes_partial_download(tmp_path):
+    requests = []
+    downloads = manager(tmp_path, file_server(requests))
+    path = downloads.path_for("2401.01234", 1)
+    path.with_name(path.name + ".part").write_bytes(CONTENT[:1000])
+
+    assert (await downloads.get("2401.01234", 1)).read_bytes() == CONTENT
+    assert requests[0].headers["Range"] == "bytes=1000-"
+    assert downloads.stats()["bytes_downloaded"] == len(CONTENT) - 1000
+
+
+@pytest.mark.asyncio
+async def test_bounded_concurrency_and_lru_eviction(tmp_path):
+    active = peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return httpx.Response(200, content=CONTENT)
+
+    downloads = manager(tmp_path, handler, concurrency=2, max_bytes=3 * len(CONTENT))
+    await asyncio.gather(*[downloads.get(f"2401.{n:05d}", 1) for n in range(6)])
+    assert peak == 2
+
+    # Only the three most recently used files are kept, and reopening the cache keeps that order
+    assert downloads.stats()["files"] == 3
+    assert downloads.stats()["evictions"] == 3
+    reopened = manager(tmp_path, handler)
+    assert list(reopened._files) == list(downloads._files)
+
+
+def test_pdf_endpoint(mock_arxiv, tmp_path, monkeypatch):
+    requests = []
+    monkeypatch.setattr(main, "downloads", manager(tmp_path, file_server(requests)))
+    client = TestClient(main.app)
+
+    # The current version is looked up on arXiv, then the PDF is served from the cache
+    for _ in range(2):
+        response = client.get("/papers/2401.01234/pdf")
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["content-type"] == "application/pdf"
+    assert len(mock_arxiv) == 1
+    assert [str(r.url) for r in requests] == ["http://files.test/pdf/2401.01234v2"]
+
+    assert client.get("/papers/hep-th/9901001v1/source").status_code == 200
+    assert client.get("/papers/nonsense/pdf").status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_download_task(mock_arxiv, tmp_path, monkeypatch):
+    from worker.tasks import download_papers
+
+    requests = []
+    downloads = manager(tmp_path, file_server(requests))
+    monkeypatch.setattr(main, "downloads", downloads)
+
+    results = await download_papers(["2401.01234", "hep-th/9901001v1", "bogus"])
+    assert results == {
+        "2401.01234": "2401.01234v2.pdf",
+        "hep-th/9901001v1": "hep-th_9901001v1.pdf",
+        "bogus": "error: not found",
+    }
+    assert len(mock_arxiv) == 1
+    assert downloads.scheduler.priorities == [BACKGROUND, BACKGROUND]
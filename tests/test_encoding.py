@@ -0,0 +1,82 @@
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import encoding
+from backend.main import app
+
+client = TestClient(app)
+
+DAILY = {"categories": ["cs.LG"], "max_results": 100, "page_size": 100}
+
+
+def test_large_responses_are_gzipped(paged_arxiv):
+    response = client.post("/papers/daily", json=DAILY, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content) / 3
+    assert len(response.json()["papers"]) == 100
+
+    # Small bodies and clients that don't accept gzip get identity
+    assert "content-encoding" not in client.get("/jobs", headers={"Accept-Encoding": "gzip"}).headers
+    response = client.post("/papers/daily", json=DAILY, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_brotli_preferred_when_available(paged_arxiv):
+    pytest.importorskip("brotli")
+    response = client.post("/papers/daily", json=DAILY, headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()["papers"]) == 100
+
+    response = client.post("/papers/daily", json=DAILY, headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_streamed_responses_are_compressed_per_chunk(paged_arxiv):
+    request = {"categories": ["cs.LG"], "max_results": 120, "page_size": 50, "stream": True, "fields": ["title"]}
+    with client.stream("POST", "/papers/daily", json=request, headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        papers = [json.loads(line) for line in response.iter_lines() if line]
+    assert len(papers) == 120
+    assert set(papers[0]) == {"id", "title"}
+
+
+def test_msgpack_negotiation(paged_arxiv):
+    msgpack = pytest.importorskip("msgpack")
+    as_json = client.post("/papers/daily", json=DAILY).json()
+    response = client.post("/papers/daily", json=DAILY, headers={"Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content, raw=False) == as_json
+
+
+def test_field_projection(mock_arxiv):
+    request = {"author_id": "Bengio", "max_results": 10}
+    data = client.post("/papers/by-author", json={**request, "fields": ["title", "published"]}).json()
+    assert data["papers"][0] == {
+        "id": "http://arxiv.org/abs/2401.01234v2",
+        "title": "Deep Learning for Loop Quantum Gravity",
+        "published": "2024-01-02T09:30:00Z",
+    }
+    assert data["total"] == 2
+
+    # The abstract is loaded on demand, from the store
+    response = client.get("/papers/2401.01234?fields=summary")
+    assert response.json()["paper"] == {
+        "id": "http://arxiv.org/abs/2401.01234v2",
+        "summary": "We apply neural networks to spin foams.",
+    }
+    assert len(mock_arxiv) == 1
+    assert client.get("/papers/not-an-id").status_code == 400
+
+
+def test_dumps_without_orjson(monkeypatch):
+    paper = {"title": "Über Räume", "authors": ["A"], "published_ts": 1}
+    fast = encoding.dumps(paper)
+    monkeypatch.setattr(encoding, "orjson", None)
+    assert encoding.dumps(paper) == fast
+    assert json.loads(fast) == paper
@@ -0,0 +1,105 @@
+import time
+import zlib
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from backend import main
+from backend.extraction import TextExtractor
+from backend.storage import PaperStore
+
+pytest.importorskip("pypdf")
+
+SAMPLE_PDF = Path(__file__).parent.parent / "docs/examples/1605.08386v1.Heat_bath_random_walks_with_Markov_bases.pdf"
+
+
+def write_slow_pdf(path, operations=2_000_000):
+    """A one-page PDF whose text sits in a form XObject of `operations` text operators.
+
+    Parsing takes minutes, and pypdf extracts forms inside ``except Exception``,
+    so an alarm that derives from Exception would be swallowed there.
+    """
+    content = zlib.compress(b"BT /F1 12 Tf " + b"(x) Tj " * operations + b"ET")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /XObject << /Fm0 5 0 R >> >> "
+        b"/Contents 4 0 R >>",
+        b"<< /Length 8 >>\nstream\n/Fm0 Do\nendstream",
+        b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792] /Filter /FlateDecode "
+        b"/Resources << /Font << /F1 6 0 R >> >> /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+@pytest.mark.asyncio
+async def test_extracts_text_into_store():
+    store = PaperStore(":memory:")
+    extractor = TextExtractor(store, workers=2, max_pending=1)
+    try:
+        pages = await asyncio.gather(*[extractor.extract(f"1605.0838{n}", 1, SAMPLE_PDF) for n in range(3)])
+    finally:
+        extractor.close()
+
+    assert pages == [20, 20, 20]
+    text = store.get_text("1605.08381v1")
+    assert text["version"] == 1 and text["pages"] == 20
+    assert "Markov bases" in text["text"]
+    stats = extractor.stats()
+    assert stats["documents"] == 3 and stats["pending"] == 0
+    assert stats["pages_per_s"] > 0
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_bad_files(tmp_path):
+    store = PaperStore(":memory:")
+    slow = tmp_path / "slow.pdf"
+    write_slow_pdf(slow)
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    extractor = TextExtractor(store, workers=1, timeout=2)
+    try:
+        started = time.monotonic()
+        assert await extractor.extract("2401.00002", 1, slow) is None
+        # Stopped by the alarm in the pool process, not the backstop
+        assert time.monotonic() - started < extractor.timeout + 5
+        assert await extractor.extract("2401.00001", 1, broken) is None
+        # The worker is free again
+        assert await extractor.extract("1605.08386", 1, SAMPLE_PDF) == 20
+    finally:
+        extractor.close()
+    assert extractor.stats()["timeouts"] == 1
+    assert extractor.stats()["failures"] == 1
+    assert store.get_text("2401.00002") is None
+    assert store.get_text("2401.00001") is None
+
+
+@pytest.mark.asyncio
+async def test_extract_papers_task(mock_arxiv, tmp_path, monkeypatch):
+    from backend.downloads import DownloadManager
+    from worker.tasks import extract_papers
+
+    pdf = SAMPLE_PDF.read_bytes()
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=pdf))
+    monkeypatch.setattr(main, "downloads", DownloadManager(tmp_path, client=httpx.AsyncClient(transport=transport),
+                                                              scheduler=main.scraper.scheduler))
+    extractor = TextExtractor(main.store, workers=1)
+    monkeypatch.setattr(main, "extractor", extractor)
+    try:
+        assert await extract_papers(["2401.01234"]) == {"extracted": 1, "pages": 20, "skipped": 0, "failed": 0}
+        assert await extract_papers(["2401.01234"]) == {"extracted": 0, "pages": 0, "skipped": 1, "failed": 0}
+    finally:
+        extractor.close()
+    assert main.store.get_text("2401.01234")["version"] == 2
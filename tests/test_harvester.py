@@ -0,0 +1,111 @@
+import httpx
+import pytest
+
+from backend.arxiv_scraper import ArxivScraper, RequestScheduler
+from backend.harvester import DailyHarvester
+from backend.storage import PaperStore
+from benchmarks.stub_arxiv import FEED_HEADER
+
+ENTRY = """<entry>
+  <id>http://arxiv.org/abs/2505.{num:05d}v1</id>
+  <updated>2025-05-{day:02d}T00:00:00Z</updated>
+  <published>2025-05-{day:02d}T00:00:00Z</published>
+  <title>Paper {num}</title>
+  <category term="cs.LG"/>
+</entry>
+"""
+
+
+class FakeArxiv:
+    """Serves a category feed sorted by updated date, newest first."""
+
+    def __init__(self):
+        self.entries = []  # (updated, xml)
+        self.requests = []
+
+    def add(self, num, day):
+        self.entries.append((day, ENTRY.format(num=num, day=day)))
+
+    def handler(self, request):
+        self.requests.append(request)
+        start = int(request.url.params["start"])
+        size = int(request.url.params["max_results"])
+        ordered = [xml for _, xml in sorted(self.entries, key=lambda e: -e[0])]
+        page = ordered[start:start + size]
+        body = FEED_HEADER.format(total=len(ordered), start=start, count=len(page)) + "".join(page) + "</feed>"
+        return httpx.Response(200, text=body)
+
+
+@pytest.fixture
+def fake():
+    return FakeArxiv()
+
+
+def make_harvester(fake, store, max_results=2000):
+    scraper = ArxivScraper(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)),
+        scheduler=RequestScheduler(interval=0),
+    )
+    return DailyHarvester(scraper, store, page_size=5, initial_results=10, max_results=max_results)
+
+
+@pytest.mark.asyncio
+async def test_harvest_only_fetches_new_papers(fake):
+    store = PaperStore(":memory:")
+    harvester = make_harvester(fake, store)
+    for num in range(20):
+        fake.add(num, day=num + 1)
+
+    # First harvest is bounded by initial_results
+    assert await harvester.harvest_category("cs.LG") == 10
+    assert len(fake.requests) == 2
+    watermark, _ = store.get_harvest_state("cs.LG")
+    assert watermark == "2025-05-20T00:00:00Z"
+
+    # Two new papers: one page, stops at the watermark
+    fake.requests.clear()
+    fake.add(100, day=25)
+    fake.add(101, day=26)
+    assert await harvester.harvest_category("cs.LG") == 2
+    assert len(fake.requests) == 1
+    assert fake.requests[0].url.params["sortBy"] == "lastUpdatedDate"
+    assert store.get_harvest_state("cs.LG")[0] == "2025-05-26T00:00:00Z"
+    assert store.count() == 12
+
+
+@pytest.mark.asyncio
+async def test_harvest_resumes_backlog_beyond_max_results(fake):
+    store = PaperStore(":memory:")
+    harvester = make_harvester(fake, store, max_results=5)
+    fake.add(0, day=1)
+    assert await harvester.harvest_category("cs.LG") == 1
+
+    # Twelve new papers but only five per harvest: the watermark stays until the walk reaches it
+    for num in range(1, 13):
+        fake.add(num, day=num + 1)
+    assert await harvester.harvest_category("cs.LG") == 5
+    assert store.get_harvest_state("cs.LG")[0] == "2025-05-01T00:00:00Z"
+    assert store.get_harvest_resume("cs.LG") == (5, "2025-05-13T00:00:00Z")
+
+    # A paper updated meanwhile is picked up at the top before the backlog continues
+    fake.add(50, day=20)
+    assert await harvester.harvest_category("cs.LG") == 3
+    assert fake.requests[-2].url.params["start"] == "0"
+    assert fake.requests[-1].url.params["start"] == "5"
+    assert store.get_harvest_state("cs.LG")[0] == "2025-05-01T00:00:00Z"
+
+    while store.get_harvest_resume("cs.LG"):
+        await harvester.harvest_category("cs.LG")
+    assert store.get_harvest_state("cs.LG")[0] == "2025-05-20T00:00:00Z"
+    assert store.count() == 14
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_fresh_categories(fake):
+    store = PaperStore(":memory:")
+    harvester = make_harvester(fake, store)
+    fake.add(1, day=1)
+
+    assert await harvester.refresh(["cs.LG"], max_age=60) == {"cs.LG": 1}
+    assert await harvester.refresh(["cs.LG"], max_age=60) == {}
+    assert len(fake.requests) == 1
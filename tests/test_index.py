@@ -0,0 +1,91 @@
+import numpy as np
+
+from backend.recommend import PaperIndex, sync_index, tokenize
+from backend.storage import PaperStore
+from benchmarks.bench_recommend import make_corpus
+
+
+def corpus(n, updated="2024-01-01T00:00:00Z"):
+    return [dict(paper, updated=updated) for paper in make_corpus(n)]
+
+
+def test_add_skips_unchanged_and_replaces_new_versions():
+    index = PaperIndex(n_features=2 ** 16)
+    assert index.add(corpus(50)) == 50
+    assert index.add(corpus(50)) == 0
+    assert len(index.segments) == 1
+
+    revised = {"arxiv_id": "2400.00003", "title": "Entirely new loop quantum gravity title",
+               "summary": "", "authors": [], "updated": "2024-02-01T00:00:00Z"}
+    assert index.add([revised]) == 1
+    assert len(index) == 50
+    assert index.top_k(tokenize("loop quantum gravity"), k=1)[0][0] == "2400.00003"
+    # The superseded row is masked out rather than rewritten
+    assert not index.segments[0].alive[3]
+    assert "2400.00003" not in [i for i, _ in index.top_k(tokenize(corpus(50)[3]["title"]), k=50)]
+
+
+def test_document_frequencies_count_current_versions_only(tmp_path):
+    papers = corpus(200)
+    revised = [dict(p, summary="Entirely rewritten abstract", updated="2024-02-01T00:00:00Z") for p in papers[:40]]
+    index = PaperIndex(n_features=2 ** 16, path=tmp_path)
+    index.add(papers[:100])
+    index.add(papers[100:])
+    index.add(revised)
+    fresh = PaperIndex(n_features=2 ** 16)
+    fresh.add(revised + papers[40:])
+
+    assert np.array_equal(index.df, fresh.df)
+    assert np.allclose(index.idf(), fresh.idf())
+    assert np.array_equal(PaperIndex.open(tmp_path).df, fresh.df)
+
+
+def test_compaction_preserves_rankings():
+    papers = corpus(300)
+    incremental = PaperIndex(n_features=2 ** 16)
+    for start in range(0, 300, 15):
+        incremental.add(papers[start:start + 15])
+    incremental.add([dict(p, updated="2024-03-01T00:00:00Z") for p in papers[:30]])
+    full = PaperIndex(n_features=2 ** 16)
+    full.add(papers)
+
+    assert incremental.needs_compaction()
+    incremental.compact()
+    assert len(incremental.segments) == 1
+    assert len(incremental.segments[0]) == 300
+    assert np.array_equal(incremental.df, full.df)
+
+    query = tokenize(papers[7]["title"])
+    assert [i for i, _ in incremental.top_k(query, k=10)] == [i for i, _ in full.top_k(query, k=10)]
+
+
+def test_saved_index_reopens(tmp_path):
+    index = PaperIndex(n_features=2 ** 16, path=tmp_path)
+    papers = corpus(100)
+    index.add(papers[:60])
+    index.add(papers[60:])
+    index.add([dict(papers[0], updated="2024-03-01T00:00:00Z")])
+    index.compact()
+    index.add(corpus(5, updated="2024-04-01T00:00:00Z"))
+
+    reopened = PaperIndex.open(tmp_path)
+    assert len(reopened) == 100
+    assert len(reopened.segments) == 2
+    assert isinstance(reopened.segments[0].data, np.memmap)
+    query = tokenize(papers[42]["summary"])
+    assert reopened.top_k(query, k=5) == index.top_k(query, k=5)
+    # Compacted-away segment directories are removed
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 2
+
+
+def test_store_listener_and_sync():
+    store = PaperStore(":memory:")
+    index = PaperIndex(n_features=2 ** 16)
+    store.add_papers([{"id": f"http://arxiv.org/abs/{p['arxiv_id']}v1", **p} for p in corpus(10)])
+    assert sync_index(index, store) == 10
+    assert sync_index(index, store) == 0
+
+    store.listeners.append(index.add)
+    store.add_papers([{"id": "http://arxiv.org/abs/2401.99999v1", "title": "Spin foams",
+                       "updated": "2024-05-01T00:00:00Z"}])
+    assert len(index) == 11
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.arxiv_scraper.parser import date_key
+from backend.listing import list_papers
+from backend.main import app
+
+client = TestClient(app)
+
+PAPERS = [
+    {"title": "beta", "published": "2024-01-02T09:30:00Z", "updated": "2024-03-01T00:00:00Z", "categories": ["cs.LG"]},
+    {"title": "Alpha", "published": "2023-12-31T23:59:59Z", "updated": "2024-01-01T00:00:00Z", "categories": ["gr-qc"]},
+    {"title": "gamma", "published": "2024-01-02T00:00:00Z", "updated": "2024-01-02T00:00:00Z",
+     "categories": ["hep-th", "gr-qc"]},
+]
+for paper in PAPERS:
+    paper["published_ts"] = date_key(paper["published"])
+    paper["updated_ts"] = date_key(paper["updated"])
+
+
+def titles(papers):
+    return [p["title"] for p in papers]
+
+
+def test_date_key():
+    assert date_key("1970-01-02T00:00:01Z") == 86401
+    assert date_key("1970-01-02") == 86400
+    assert date_key(None) == date_key("garbage") == 0
+
+
+def test_sorting():
+    assert titles(list_papers(PAPERS, sort_by="published")[0]) == ["beta", "gamma", "Alpha"]
+    assert titles(list_papers(PAPERS, sort_by="updated", order="asc")[0]) == ["Alpha", "gamma", "beta"]
+    assert titles(list_papers(PAPERS, sort_by="title", order="asc")[0]) == ["Alpha", "beta", "gamma"]
+    # No sort_by keeps the upstream (relevance) order
+    assert list_papers(PAPERS) == (PAPERS, 3)
+
+
+def test_filters_and_slicing():
+    assert titles(list_papers(PAPERS, categories=["gr-qc"])[0]) == ["Alpha", "gamma"]
+    # A bare date_to includes the whole day
+    assert titles(list_papers(PAPERS, date_from="2024-01-01", date_to="2024-01-02")[0]) == ["beta", "gamma"]
+    assert titles(list_papers(PAPERS, date_to="2024-01-02T00:00:00Z")[0]) == ["Alpha", "gamma"]
+    assert titles(list_papers(PAPERS, date_from="2024-02-01", date_field="updated")[0]) == ["beta"]
+    for malformed in ("yesterday", "2024-13-01", "2024-01-02T25:00:00Z"):
+        with pytest.raises(ValueError):
+            list_papers(PAPERS, date_from=malformed)
+
+    page, total = list_papers(PAPERS, sort_by="title", order="asc", offset=1, limit=1)
+    assert titles(page) == ["beta"] and total == 3
+
+
+def test_server_side_listing(mock_arxiv):
+    request = {"author_id": "Bengio", "max_results": 10}
+    data = client.post("/papers/by-author", json={**request, "sort_by": "published", "order": "asc"}).json()
+    assert [p["published"][:4] for p in data["papers"]] == ["1999", "2024"]
+    assert data["papers"][0]["published_ts"] == 915148800
+
+    data = client.post("/papers/by-author", json={**request, "filter_categories": ["cs.LG"]}).json()
+    assert [p["id"] for p in data["papers"]] == ["http://arxiv.org/abs/2401.01234v2"]
+    data = client.post("/papers/by-author", json={**request, "date_from": "2000-01-01", "limit": 5}).json()
+    assert data["total"] == 1
+    data = client.post("/papers/by-author", json={**request, "sort_by": "title", "offset": 1, "limit": 1}).json()
+    assert [p["title"] for p in data["papers"]] == ["Deep Learning for Loop Quantum Gravity"]
+    assert data["total"] == 2
+    # All of the above were served from one cached upstream response
+    assert len(mock_arxiv) == 1
+    assert client.post("/papers/by-author", json={**request, "sort_by": "citations"}).status_code == 422
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pstats
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.metrics import MetricsMiddleware, Registry, request_spans, span
+
+client = TestClient(app)
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry(prefix="test_")
+    requests = registry.counter("requests_total", "Requests", ("outcome",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    registry.callback("queue_depth", "Queue depth", lambda: 3)
+    requests.inc(outcome="200")
+    requests.inc(2, outcome="200")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE test_requests_total counter" in lines
+    assert 'test_requests_total{outcome="200"} 3' in lines
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{le="1"} 2' in lines
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_latency_seconds_sum 5.55" in lines
+    assert "test_latency_seconds_count 3" in lines
+    assert "test_queue_depth 3" in lines
+
+
+def test_spans_are_collected_per_request():
+    spans = {}
+    token = request_spans.set(spans)
+    try:
+        with span("store"):
+            pass
+        with span("store"):
+            pass
+    finally:
+        request_spans.reset(token)
+    assert list(spans) == ["store"]
+    # Outside a request, spans only feed the histogram
+    with span("store"):
+        pass
+
+
+def test_metrics_endpoint(mock_arxiv):
+    response = client.post("/papers/by-author", json={"author_id": "Bengio", "max_results": 10})
+    assert response.status_code == 200
+    stages = {entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")}
+    assert {"queue", "upstream", "parse", "store", "serialize"} <= stages
+    client.get("/papers/2401.01234/text")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'arxiv_agent_arxiv_requests_total{outcome="200"}' in text
+    assert "arxiv_agent_arxiv_response_bytes_total" in text
+    assert 'arxiv_agent_stage_duration_seconds_count{stage="upstream"}' in text
+    assert ('arxiv_agent_http_request_duration_seconds_count{method="POST",route="/papers/by-author",status="200"}'
+            in text)
+    # Paths with IDs are reported by route template
+    assert 'route="/papers/{paper_id:path}/text",status="404"' in text
+    assert "arxiv_agent_cache_misses_total 1" in text
+
+
+def test_profiling_is_opt_in(tmp_path):
+    profiled = FastAPI()
+    profiled.add_middleware(MetricsMiddleware, profiling=True, profile_dir=tmp_path)
+
+    @profiled.get("/work")
+    async def work():
+        return {"total": sum(range(10000))}
+
+    profiled_client = TestClient(profiled)
+    assert profiled_client.get("/work").status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+    assert profiled_client.get("/work", headers={"X-Profile": "1"}).status_code == 200
+    [profile] = tmp_path.iterdir()
+    assert profile.name.endswith("-GET-work.prof")
+    assert pstats.Stats(str(profile)).total_calls > 0
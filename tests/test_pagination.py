@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.pagination import decode_cursor, encode_cursor
+
+client = TestClient(app)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(None) == 0
+    assert decode_cursor(encode_cursor(150)) == 150
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_pagination(paged_arxiv):
+    ids = []
+    cursor = None
+    while True:
+        response = client.post("/papers/daily", json={
+            "categories": ["cs.LG"], "max_results": 220, "page_size": 100, "cursor": cursor,
+        })
+        data = response.json()
+        ids.extend(p["id"] for p in data["papers"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(ids) == 220 == len(set(ids))
+    assert [r.url.params["start"] for r in paged_arxiv] == ["0", "100", "200"]
+    assert paged_arxiv[-1].url.params["max_results"] == "20"
+
+
+def test_invalid_cursor(paged_arxiv):
+    response = client.post("/papers/by-author", json={"author_id": "Alice", "cursor": "bogus"})
+    assert response.status_code == 400
+
+
+def test_ndjson_stream(paged_arxiv):
+    with client.stream("POST", "/papers/by-author", json={
+        "author_id": "Alice", "max_results": 1000, "page_size": 100, "stream": True,
+    }) as response:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        papers = [json.loads(line) for line in response.iter_lines() if line]
+
+    # The stub result set has 250 papers, so the stream stops at the short page
+    assert len(papers) == 250
+    assert len(paged_arxiv) == 3
+    assert papers[0]["title"].startswith("Stub Paper 0:")
+
+
+def test_paged_requests_apply_filters(paged_arxiv):
+    # Filters apply to each page; the cursor still follows the upstream position
+    data = client.post("/papers/daily", json={
+        "categories": ["cs.LG"], "max_results": 220, "page_size": 100, "date_from": "2025-04-27",
+    }).json()
+    assert len(data["papers"]) == 6
+    assert decode_cursor(data["next_cursor"]) == 100
+
+    with client.stream("POST", "/papers/by-author", json={
+        "author_id": "Alice", "max_results": 1000, "stream": True, "date_from": "2025-04-27",
+    }) as response:
+        papers = [json.loads(line) for line in response.iter_lines() if line]
+    assert len(papers) == 16
+
+    # Sorting and slicing need the whole result, so they are refused rather than ignored
+    for options in ({"sort_by": "title"}, {"offset": 10}, {"limit": 5}, {"stream": True, "sort_by": "title"}):
+        response = client.post("/papers/by-author", json={"author_id": "Alice", "page_size": 100, **options})
+        assert response.status_code == 400
+    assert client.post("/papers/daily", json={"date_to": "2025-13-01"}).status_code == 400
@@ -0,0 +1,35 @@
+from backend.arxiv_scraper.parser import AtomParser, parse_feed
+from benchmarks.stub_arxiv import make_feed
+from sample_feeds import SAMPLE_FEED
+
+
+def test_extracts_arxiv_metadata():
+    paper = parse_feed(SAMPLE_FEED)[0]
+    assert paper["categories"] == ["gr-qc", "cs.LG"]
+    assert paper["primary_category"] == "gr-qc"
+    assert paper["doi"] == "10.1000/xyz123"
+    assert paper["journal_ref"] == "Phys. Rev. D 1 (2024)"
+    assert paper["comment"] == "12 pages"
+
+    old_style = parse_feed(SAMPLE_FEED)[1]
+    assert old_style["doi"] is None
+    assert old_style["primary_category"] is None
+
+
+def test_incremental_feed_matches_whole_document():
+    data = make_feed(300, total=1000).encode()
+    parser = AtomParser()
+    papers = []
+    for i in range(0, len(data), 1000):
+        papers.extend(parser.feed(data[i:i + 1000]))
+        # Finished entries are detached from the tree as they complete
+        assert len(parser._root) < 10
+    papers.extend(parser.close())
+
+    assert papers == parse_feed(data)
+    assert len(papers) == 300
+    assert parser.total_results == 1000
+
+
+def test_malformed_feed():
+    assert parse_feed(b"<feed><entry>") == []
@@ -0,0 +1,56 @@
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.storage import ProfileStore
+
+
+def test_save_and_get(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"), legacy_file=None)
+    assert store.get("alice") is None
+    store.save("alice", {"interests": ["lqg"], "favorite_authors": []})
+    store.save("alice", {"interests": ["spin foams"], "favorite_authors": ["Rovelli"]})
+    assert store.get("alice")["interests"] == ["spin foams"]
+    assert store.count() == 1
+    assert dict(store.all()) == {"alice": {"interests": ["spin foams"], "favorite_authors": ["Rovelli"]}}
+
+
+def test_imports_legacy_json_once(tmp_path):
+    legacy = tmp_path / "user_profiles.json"
+    legacy.write_text(json.dumps({"bob": {"interests": ["strings"]}}))
+    db_path = str(tmp_path / "profiles.db")
+
+    assert ProfileStore(db_path, legacy_file=str(legacy)).get("bob") == {"interests": ["strings"]}
+    legacy.write_text(json.dumps({"bob": {"interests": ["changed"]}}))
+    assert ProfileStore(db_path, legacy_file=str(legacy)).get("bob") == {"interests": ["strings"]}
+
+
+def test_concurrent_writers(tmp_path):
+    db_path = str(tmp_path / "profiles.db")
+    # Separate connections stand in for separate uvicorn worker processes
+    stores = [ProfileStore(db_path, legacy_file=None) for _ in range(4)]
+
+    def write(store, worker_id):
+        for i in range(50):
+            store.save(f"user{worker_id}-{i}", {"interests": [str(i)]})
+
+    threads = [threading.Thread(target=write, args=(store, n)) for n, store in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ProfileStore(db_path, legacy_file=None).count() == 200
+
+
+def test_profile_endpoints(monkeypatch):
+    monkeypatch.setattr(main, "profiles", ProfileStore(":memory:", legacy_file=None))
+    client = TestClient(main.app)
+
+    assert client.get("/profile/carol").json()["profile"] == {"interests": [], "favorite_authors": []}
+    profile = {"user_id": "carol", "interests": ["qft"], "favorite_authors": ["Witten"], "saved_papers": []}
+    assert client.post("/profile", json=profile).json()["success"] == True
+    assert client.get("/profile/carol").json()["profile"] == profile
+    assert client.post("/profile", json={"interests": []}).status_code == 400
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.recommend import PaperIndex, author_token, profile_tokens, tokenize
+from backend.storage import ProfileStore
+
+PAPERS = [
+    {"arxiv_id": "2401.00001", "title": "Spin foam models of loop quantum gravity",
+     "summary": "We compute amplitudes of spin foams.", "authors": ["Carlo Rovelli"]},
+    {"arxiv_id": "2401.00002", "title": "Transformers for protein folding",
+     "summary": "Attention models predict protein structure.", "authors": ["Jane Doe"]},
+    {"arxiv_id": "2401.00003", "title": "Black hole entropy",
+     "summary": "Entropy of black holes in string theory.", "authors": ["Andrew Strominger"]},
+    {"arxiv_id": "2401.00004", "title": "", "summary": "", "authors": []},
+]
+
+
+def test_tokenize():
+    assert tokenize("The Loop-Quantum gravity of A") == ["loop-quantum", "gravity", "loop-quantum gravity"]
+    assert author_token("Carlo  Rovelli") == "author:carlo rovelli"
+
+
+def test_ranks_matching_papers_first():
+    index = PaperIndex(n_features=2 ** 16)
+    index.add(PAPERS)
+
+    ranked = index.top_k(tokenize("loop quantum gravity"), k=3)
+    assert ranked[0][0] == "2401.00001"
+    assert all(arxiv_id != "2401.00004" for arxiv_id, _ in ranked)
+
+    assert index.top_k([author_token("Andrew Strominger")], k=1)[0][0] == "2401.00003"
+    assert index.top_k(tokenize("quantum gravity"), k=3, exclude=["2401.00001"]) == []
+    assert index.top_k(tokenize("loop quantum gravity"), k=0) == []
+    assert index.top_k(tokenize("loop quantum gravity"), k=-5) == []
+
+
+def test_recommendations_endpoint(monkeypatch):
+    profiles = ProfileStore(":memory:", legacy_file=None)
+    monkeypatch.setattr(main, "profiles", profiles)
+    monkeypatch.setattr(main, "paper_index", PaperIndex(n_features=2 ** 16))
+    from backend.storage import PaperStore
+    store = PaperStore(":memory:")
+    store.add_papers([
+        {"id": f"http://arxiv.org/abs/{p['arxiv_id']}v1", "updated": "2024-01-01T00:00:00Z", **p} for p in PAPERS
+    ])
+    monkeypatch.setattr(main, "store", store)
+    client = TestClient(main.app)
+
+    assert client.get("/recommendations/nobody").status_code == 404
+    assert client.get("/recommendations/nobody?k=0").status_code == 400
+    assert client.get("/recommendations/nobody?k=-5").status_code == 400
+    assert client.get(f"/recommendations/nobody?k={main.MAX_K + 1}").status_code == 400
+
+    profiles.save("dana", {"interests": ["protein structure"], "favorite_authors": ["Carlo Rovelli"]})
+    papers = client.get("/recommendations/dana?k=5").json()["papers"]
+    assert {p["id"] for p in papers} == {"http://arxiv.org/abs/2401.00001v1", "http://arxiv.org/abs/2401.00002v1"}
+    assert papers[0]["score"] >= papers[1]["score"] > 0
+
+    # The index is checked against the store once, not counted again on every request
+    def count():
+        raise AssertionError("store counted again")
+
+    monkeypatch.setattr(store, "count", count)
+    profiles.save("dana", {"interests": ["protein"], "saved_papers": ["http://arxiv.org/abs/2401.00002v1"]})
+    assert client.get("/recommendations/dana").json()["papers"] == []
+    assert profile_tokens({"interests": [], "favorite_authors": []}) == []
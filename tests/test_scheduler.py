@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.arxiv_scraper import BACKGROUND, INTERACTIVE, RequestScheduler
+
+
+@pytest.mark.asyncio
+async def test_requests_are_paced():
+    scheduler = RequestScheduler(interval=0.05)
+    started = time.monotonic()
+    for _ in range(4):
+        await scheduler.acquire()
+    # First token is available immediately, the rest are spaced by the interval
+    assert time.monotonic() - started >= 0.14
+    assert scheduler.stats()["granted"] == 4
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_overtake_background():
+    scheduler = RequestScheduler(interval=0.05)
+    await scheduler.acquire()
+    order = []
+
+    async def request(name, priority):
+        await scheduler.acquire(priority)
+        order.append(name)
+
+    background = [asyncio.create_task(request(f"bg{i}", BACKGROUND)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    assert scheduler.stats()["queue_depth_by_priority"] == {BACKGROUND: 3}
+    interactive = asyncio.create_task(request("user", INTERACTIVE))
+    await asyncio.gather(*background, interactive)
+
+    assert order == ["user", "bg0", "bg1", "bg2"]
+    assert scheduler.stats()["queue_depth"] == 0
+    assert scheduler.stats()["max_wait_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    scheduler = RequestScheduler(interval=10)
+    await scheduler.acquire()
+    task = asyncio.create_task(scheduler.acquire())
+    await asyncio.sleep(0.01)
+    assert scheduler.stats()["queue_depth"] == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert scheduler.stats()["queue_depth"] == 0
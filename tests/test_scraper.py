@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.arxiv_scraper import ArxivScraper, RequestScheduler, authors_queries
+from sample_feeds import SAMPLE_FEED
+
+
+def test_parse_results():
+    papers = ArxivScraper()._parse_results(SAMPLE_FEED)
+    assert len(papers) == 2
+    paper = papers[0]
+    assert paper["title"] == "Deep Learning for Loop Quantum Gravity"
+    assert paper["authors"] == ["Yoshua Bengio", "Deepak Vaid"]
+    assert paper["summary"] == "We apply neural networks to spin foams."
+    assert paper["published"] == "2024-01-02T09:30:00Z"
+    assert paper["categories"] == ["gr-qc", "cs.LG"]
+    assert paper["id"] == "http://arxiv.org/abs/2401.01234v2"
+    assert paper["pdf_url"] == "http://arxiv.org/pdf/2401.01234v2"
+
+
+def test_authors_queries():
+    assert authors_queries(["Bengio", "Yoshua  Bengio", "Bengio", " "]) == ['au:Bengio OR au:"Yoshua Bengio"']
+
+    authors = [f"Author Number {i}" for i in range(100)]
+    queries = authors_queries(authors, max_length=200)
+    assert all(len(query) <= 200 for query in queries)
+    assert len(queries) == 13  # 8 quoted names per query
+    assert sum(query.count("au:") for query in queries) == 100
+
+
+def test_parse_results_invalid_xml():
+    assert ArxivScraper()._parse_results("<feed>") == []
+
+
+@pytest.mark.asyncio
+async def test_query_parameters():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.params)
+        return httpx.Response(200, text=SAMPLE_FEED)
+
+    scraper = ArxivScraper(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        scheduler=RequestScheduler(interval=0),
+    )
+    await scraper.fetch_daily_submissions(["cs.LG", "stat.ML"])
+    await scraper.fetch_by_author("Bengio", max_results=5)
+    await scraper.close()
+
+    assert seen[0]["search_query"] == "cat:cs.LG OR cat:stat.ML"
+    assert seen[0]["sortBy"] == "submittedDate"
+    assert seen[1]["search_query"] == "au:Bengio"
+    assert seen[1]["max_results"] == "5"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_overlap():
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, text=SAMPLE_FEED)
+
+    scraper = ArxivScraper(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        scheduler=RequestScheduler(interval=0),
+    )
+    started = time.perf_counter()
+    results = await asyncio.gather(*[scraper.fetch_by_author(f"Author {i}") for i in range(5)])
+    elapsed = time.perf_counter() - started
+    await scraper.close()
+
+    assert all(len(papers) == 2 for papers in results)
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_retries_throttled_requests():
+    statuses = [503, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), text=SAMPLE_FEED)
+
+    scraper = ArxivScraper(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        scheduler=RequestScheduler(interval=0),
+    )
+    papers = await scraper.fetch_by_author("Bengio")
+    await scraper.close()
+    assert len(papers) == 2
+    assert scraper.scheduler.granted == 2
@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+
+def test_search_uses_local_store_first(mock_arxiv):
+    client.post("/papers/daily", json={"categories": ["gr-qc"]})
+    response = client.post("/papers/search", json={"query": "spin foams", "field": "abstract"})
+    data = response.json()
+    assert data["source"] == "local"
+    assert data["papers"][0]["title"] == "Deep Learning for Loop Quantum Gravity"
+    assert len(mock_arxiv) == 1
+
+    response = client.post("/papers/search", json={"query": "tachyons", "field": "title"})
+    assert response.json()["source"] == "arxiv"
+    assert mock_arxiv[1].url.params["search_query"] == "ti:tachyons"
@@ -0,0 +1,115 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.recommend import PaperIndex, SimilarityIndex, ann
+from backend.recommend.ann import embed_paper, quantize
+from backend.storage import PaperStore
+from benchmarks.bench_recommend import make_corpus
+from benchmarks.bench_similar import clustered_embeddings
+from worker import Worker
+from worker.tasks import TASKS
+
+PAPERS = [
+    {"arxiv_id": "2401.00001", "title": "Spin foam models of loop quantum gravity",
+     "summary": "We compute amplitudes of spin foams in loop quantum gravity.", "authors": []},
+    {"arxiv_id": "2401.00002", "title": "Transformers for protein folding",
+     "summary": "Attention models predict protein structure.", "authors": []},
+    {"arxiv_id": "2401.00003", "title": "Spin foam amplitudes and quantum gravity",
+     "summary": "Asymptotics of spin foam amplitudes.", "authors": []},
+]
+
+
+def test_embeddings_preserve_similarity():
+    a, b, c = (embed_paper(p) for p in PAPERS)
+    assert np.isclose(np.linalg.norm(a), 1)
+    assert a @ c > a @ b
+    codes, scales = quantize(np.stack([a, b]))
+    assert codes.dtype == np.int8
+    assert np.allclose(codes * scales[:, None], [a, b], atol=scales.max())
+
+
+def test_search_recall_and_probes():
+    ids, vectors = clustered_embeddings(5000, 64)
+    index = SimilarityIndex(dim=64, probes=4)
+    index.add_vectors(ids, vectors)
+    # Before the lists are built everything is pending and scanned exactly
+    exact = index.search(vectors[7], k=10, exclude=[ids[7]])
+    index.build()
+    assert len(index.centroids) == 71 and index.pending == 0
+
+    truth = {arxiv_id for arxiv_id, _ in exact}
+    approximate = {arxiv_id for arxiv_id, _ in index.search(vectors[7], k=10, exclude=[ids[7]])}
+    assert len(truth & approximate) >= 8
+    everything = index.search(vectors[7], k=10, probes=71, exclude=[ids[7]])
+    assert {arxiv_id for arxiv_id, _ in everything} == truth
+    assert ids[7] not in truth
+
+
+def test_new_versions_replace_listed_papers(tmp_path):
+    papers = [dict(p, updated="2024-01-01T00:00:00Z") for p in make_corpus(300)]
+    index = SimilarityIndex(dim=32, path=tmp_path)
+    assert index.add(papers) == 300
+    assert index.add(papers) == 0
+    index.build()
+
+    revised = dict(PAPERS[0], arxiv_id=papers[3]["arxiv_id"], updated="2024-02-01T00:00:00Z")
+    assert index.add([revised, dict(PAPERS[2], updated="2024-01-01T00:00:00Z")]) == 2
+    assert len(index) == 301 and index.pending == 2
+    # The revised paper is found once, at its new (pending) version
+    results = index.search(embed_paper(PAPERS[0], dim=32), k=2, probes=1000)
+    assert [arxiv_id for arxiv_id, _ in results] == [papers[3]["arxiv_id"], "2401.00003"]
+
+    # Pending papers are reloaded from their log rather than embedded again
+    reopened = SimilarityIndex.open(tmp_path)
+    assert len(reopened) == 301 and reopened.pending == 2
+    assert reopened.search(embed_paper(PAPERS[0], dim=32), k=2, probes=1000) == results
+    assert np.allclose(reopened.vector(papers[5]["arxiv_id"]), index.vector(papers[5]["arxiv_id"]))
+
+    # A build folds the log into the lists; a paper added meanwhile starts the next log
+    index.add([dict(PAPERS[1], updated="2024-01-01T00:00:00Z")])
+    index.build()
+    index.add([dict(PAPERS[1], updated="2024-03-01T00:00:00Z")])
+    reopened = SimilarityIndex.open(tmp_path)
+    assert len(reopened) == 302 and reopened.pending == 1
+    assert [arxiv_id for arxiv_id, _ in reopened.search(embed_paper(PAPERS[0], dim=32), k=2, probes=1000)] == \
+        [arxiv_id for arxiv_id, _ in results]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["build-000001", "manifest.json", "pending-000002"]
+
+    # A row torn by a crash mid-append is dropped
+    with open(tmp_path / "pending-000002" / "ids.jsonl", "a") as f:
+        f.write('["2401.0')
+    assert SimilarityIndex.open(tmp_path).pending == 1
+
+
+def test_similar_endpoint(monkeypatch):
+    store = PaperStore(":memory:")
+    store.add_papers([{"id": f"http://arxiv.org/abs/{p['arxiv_id']}v1", "updated": "2024-01-01T00:00:00Z", **p}
+                      for p in PAPERS])
+    monkeypatch.setattr(main, "store", store)
+    monkeypatch.setattr(main, "paper_index", PaperIndex(n_features=2 ** 16))
+    monkeypatch.setattr(main, "similar_index", SimilarityIndex())
+    client = TestClient(main.app)
+
+    data = client.get("/papers/arXiv:2401.00001v1/similar?k=1").json()
+    assert data["arxiv_id"] == "2401.00001"
+    assert [p["id"] for p in data["papers"]] == ["http://arxiv.org/abs/2401.00003v1"]
+    assert data["papers"][0]["score"] > 0
+    assert len(client.get("/papers/2401.00002/similar").json()["papers"]) == 2
+    assert client.get("/papers/2401.00002/similar?k=0").status_code == 400
+    assert client.get(f"/papers/2401.00002/similar?k={main.MAX_K + 1}").status_code == 400
+    assert client.get("/papers/not-an-id/similar").status_code == 400
+
+
+def test_storing_papers_queues_a_rebuild(monkeypatch):
+    monkeypatch.setattr(ann, "REBUILD_MIN_PENDING", 2)
+    monkeypatch.setattr(main, "paper_index", PaperIndex(n_features=2 ** 16))
+    monkeypatch.setattr(main, "similar_index", SimilarityIndex())
+    monkeypatch.setattr(main, "worker", Worker(TASKS, db_path=":memory:"))
+
+    main.index_similar(PAPERS[:1])
+    assert main.worker.unfinished("build_similar_index") == 0
+    # The write that fills the pending block queues one rebuild, without waiting for a /similar request
+    main.index_similar(PAPERS[1:])
+    main.index_similar([dict(PAPERS[0], updated="2024-02-01T00:00:00Z")])
+    assert main.worker.unfinished("build_similar_index") == 1
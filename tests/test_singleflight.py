@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend import main
+from backend.singleflight import SingleFlight
+from sample_feeds import SAMPLE_FEED
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_result():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ["paper"]
+
+    results = await asyncio.gather(*[flights.do("key", fetch) for _ in range(5)])
+    assert results == [["paper"]] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"upstream_calls": 1, "saved_calls": 4, "in_flight": 0}
+
+    await flights.do("key", fetch)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(*[flights.do("key", fail) for _ in range(3)], return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_daily_requests_coalesce(mock_arxiv):
+    async def slow_handler(request):
+        mock_arxiv.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text=SAMPLE_FEED)
+
+    main.scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(slow_handler))
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*[
+            client.post("/papers/daily", json={"categories": ["cs.LG", "cs.AI"][::(-1) ** i]})
+            for i in range(4)
+        ])
+        stats = (await client.get("/cache/stats")).json()["singleflight"]
+
+    assert all(len(r.json()["papers"]) == 1 for r in responses)
+    # One harvest per category, shared by all four requests
+    assert len(mock_arxiv) == 2
+    assert stats["saved_calls"] == 3
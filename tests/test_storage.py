@@ -0,0 +1,109 @@
+from backend.arxiv_scraper import ArxivScraper
+from backend.arxiv_scraper.ids import latest_versions, parse_arxiv_id
+from backend.storage import PaperStore
+from backend.storage.papers import split_arxiv_id
+from sample_feeds import SAMPLE_FEED
+
+
+def make_store():
+    store = PaperStore(":memory:")
+    store.add_papers(ArxivScraper()._parse_results(SAMPLE_FEED))
+    return store
+
+
+def test_split_arxiv_id():
+    assert split_arxiv_id("http://arxiv.org/abs/2401.01234v2") == ("2401.01234", 2)
+    assert split_arxiv_id("http://arxiv.org/abs/hep-th/9901001v1") == ("hep-th/9901001", 1)
+    assert split_arxiv_id("math.GT/0309136") == ("math.GT/0309136", 1)
+
+
+def test_parse_arxiv_id():
+    assert parse_arxiv_id("arXiv:2401.01234v2") == ("2401.01234", 2)
+    assert parse_arxiv_id(" https://arxiv.org/pdf/2401.01234v3.pdf ") == ("2401.01234", 3)
+    assert parse_arxiv_id("HEP-TH/9901001") == ("hep-th/9901001", None)
+    assert parse_arxiv_id("math.gt/0309136v1") == ("math.GT/0309136", 1)
+    assert parse_arxiv_id("not-an-id") is None
+
+
+def test_latest_versions():
+    papers = [{"id": "http://arxiv.org/abs/2401.01234v1", "title": "a"}, {"id": "hep-th/9901001v1"},
+              {"id": "http://arxiv.org/abs/2401.01234v2", "title": "b"}]
+    assert [p["id"] for p in latest_versions(papers)] == ["http://arxiv.org/abs/2401.01234v2", "hep-th/9901001v1"]
+
+
+def test_full_text_search():
+    store = make_store()
+    assert store.count() == 2
+    assert store.search("quantum grav")[0]["id"] == "http://arxiv.org/abs/2401.01234v2"
+    assert store.search("Maldacena", field="author")[0]["title"].startswith("The Large N")
+    assert store.search("holographic", field="title") == []
+    assert store.search("holographic", field="abstract")[0]["authors"] == ["Juan Maldacena"]
+
+
+def test_newer_version_replaces_older():
+    store = make_store()
+    paper = store.get("2401.01234")
+    stale = dict(paper, title="Stale Title", updated="2023-12-31T00:00:00Z", id="http://arxiv.org/abs/2401.01234v1")
+    assert store.add_papers([stale]) == 0
+    assert store.get("2401.01234v1")["title"] == paper["title"]
+
+    newer = dict(paper, title="Revised Title", updated="2024-02-01T00:00:00Z", id="http://arxiv.org/abs/2401.01234v3")
+    assert store.add_papers([newer]) == 1
+    assert store.get("2401.01234")["id"].endswith("v3")
+    assert store.search("revised")[0]["title"] == "Revised Title"
+    assert store.search("learning", field="title") == []
+
+
+def test_latest_by_category():
+    store = make_store()
+    assert [p["title"][:4] for p in store.latest()] == ["Deep", "The "]
+    assert [p["title"][:4] for p in store.latest(["cs.LG", "gr-qc"])] == ["Deep"]
+    assert [p["title"][:4] for p in store.latest(["hep-th", "gr-qc"], limit=1)] == ["Deep"]
+
+    # A new version moving to another category leaves the old one
+    paper = store.get("2401.01234")
+    store.add_papers([dict(paper, id="http://arxiv.org/abs/2401.01234v3", categories=["hep-th"])])
+    assert store.latest(["gr-qc"]) == []
+    assert len(store.latest(["hep-th"])) == 2
+
+
+def test_unchanged_papers_are_not_rewritten():
+    store = make_store()
+    seen = []
+    store.listeners.append(seen.extend)
+    papers = ArxivScraper()._parse_results(SAMPLE_FEED)
+    assert papers[0]["arxiv_id"] == "2401.01234" and papers[0]["version"] == 2
+
+    # Re-fetched results are a no-op: nothing is written or re-indexed
+    assert store.add_papers(papers) == 0
+    assert seen == []
+
+    newer = dict(papers[0], id="http://arxiv.org/abs/2401.01234v3", updated="2024-03-01T00:00:00Z")
+    assert store.add_papers([papers[0], newer, papers[1]]) == 1
+    assert [p["arxiv_id"] for p in seen] == ["2401.01234"]
+    assert store.get("2401.01234")["version"] == 3
+    assert [v["version"] for v in store.versions("http://arxiv.org/abs/2401.01234v1")] == [2, 3]
+
+
+def test_adds_columns_to_old_databases(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "papers.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE papers (arxiv_id TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 1, "
+                 "entry_id TEXT, title TEXT, authors TEXT, summary TEXT, published TEXT, updated TEXT, "
+                 "categories TEXT, pdf_url TEXT)")
+    conn.execute("INSERT INTO papers (arxiv_id, entry_id, title, authors, published, updated, categories) "
+                 "VALUES ('2301.00001', 'http://arxiv.org/abs/2301.00001v1', 'Old', '[]', "
+                 "'1970-01-02T00:00:00Z', '1970-01-02T00:00:00Z', '[\"math.GT\"]')")
+    conn.commit()
+    conn.close()
+
+    store = PaperStore(str(db_path))
+    store.add_papers(ArxivScraper()._parse_results(SAMPLE_FEED))
+    assert store.get("2401.01234")["doi"] == "10.1000/xyz123"
+    # Sort keys are backfilled for rows stored before they existed
+    assert store.get("2301.00001")["published_ts"] == 86400
+    assert store.versions("2301.00001")[0]["version"] == 1
+    # Their categories are indexed too
+    assert [p["title"] for p in store.latest(["math.GT"])] == ["Old"]
@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from backend.arxiv_scraper.parser import parse_feed
+from benchmarks.stub_arxiv import StubArxivServer, make_feed, recording_key
+
+
+def statuses(stub, n):
+    with httpx.Client() as client:
+        return [client.get(stub.url, params={"search_query": "cat:cs.LG", "max_results": 1}).status_code
+                for _ in range(n)]
+
+
+def test_error_injection_is_seeded():
+    with StubArxivServer(error_rate=0.3, seed=7) as stub:
+        first = statuses(stub, 50)
+    with StubArxivServer(error_rate=0.3, seed=7) as stub:
+        assert statuses(stub, 50) == first
+        assert stub.stats()["errors"] == first.count(503)
+    assert 5 < first.count(503) < 25
+    assert set(first) == {200, 503}
+
+
+def test_id_list_queries():
+    with StubArxivServer() as stub, httpx.Client() as client:
+        response = client.get(stub.url, params={"id_list": "2504.00003,2504.00004v1,2504.00005v3,1234.5678"})
+    papers = parse_feed(response.content)
+    assert [paper["id"] for paper in papers] == ["http://arxiv.org/abs/2504.00003v2", "http://arxiv.org/abs/2504.00004v1"]
+
+
+def test_recorded_feeds_are_replayed(tmp_path):
+    params = {"search_query": ["au:Bengio"], "start": ["0"], "max_results": ["10"]}
+    (tmp_path / recording_key(params)).write_text(make_feed(2, start=500))
+    with StubArxivServer(feeds_dir=tmp_path) as stub, httpx.Client() as client:
+        replayed = client.get(stub.url, params={"max_results": 10, "start": 0, "search_query": "au:Bengio"})
+        generated = client.get(stub.url, params={"search_query": "au:LeCun", "max_results": 10})
+        assert stub.stats()["replayed"] == 1
+    assert len(parse_feed(replayed.content)) == 2
+    assert len(parse_feed(generated.content)) == 10
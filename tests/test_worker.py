@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from worker import Worker
+from worker.worker import next_daily
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_background():
+    async def add(a, b):
+        await asyncio.sleep(0.01)
+        return a + b
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    worker = Worker({"add": add, "fail": fail}, concurrency=2, db_path=":memory:")
+    ok = worker.submit("add", a=1, b=2)
+    bad = worker.submit("fail")
+    assert ok["status"] == "queued"
+
+    await worker.start()
+    await worker.join()
+
+    assert worker.get(ok["id"])["status"] == "finished"
+    assert worker.get(ok["id"])["result"] == 3
+    assert worker.get(bad["id"])["status"] == "failed"
+    assert worker.get(bad["id"])["error"] == "boom"
+
+    with pytest.raises(ValueError):
+        worker.submit("missing")
+
+    # Stopping closes the job database
+    await worker.stop()
+    assert worker.store._conn is None
+
+
+def test_prefetch_job_warms_author_cache(mock_arxiv):
+    with TestClient(app) as client:
+        response = client.post("/jobs", json={"task": "prefetch_authors", "params": {"authors": ["Bengio"]}})
+        job_id = response.json()["job"]["id"]
+
+        deadline = time.time() + 5
+        while client.get(f"/jobs/{job_id}").json()["job"]["status"] in ("queued", "running"):
+            assert time.time() < deadline
+            time.sleep(0.01)
+        job = client.get(f"/jobs/{job_id}").json()["job"]
+        assert job["status"] == "finished"
+        assert job["result"] == {"Bengio": 2}
+
+        # The interactive search is now served from the warmed cache
+        client.post("/papers/by-author", json={"author_id": "Bengio", "max_results": 25})
+        assert len(mock_arxiv) == 1
+        assert client.get("/jobs/unknown").status_code == 404
+        assert client.post("/jobs", json={"task": "nope"}).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_shared_between_processes_and_survive_restarts(tmp_path):
+    ran = []
+
+    async def record(n):
+        ran.append(n)
+        return n
+
+    db_path = str(tmp_path / "jobs.db")
+    api = Worker({"record": record}, db_path=db_path)
+    queued = [api.submit("record", n=n)["id"] for n in range(3)]
+
+    # Another process (or this one after a restart) runs them, each exactly once
+    first, second = (Worker({"record": record}, db_path=db_path, poll_interval=0.01) for _ in range(2))
+    await first.start()
+    await second.start()
+    await first.join()
+    await first.stop()
+    await second.stop()
+
+    assert sorted(ran) == [0, 1, 2]
+    assert [api.get(job_id)["result"] for job_id in queued] == [0, 1, 2]
+    assert api.counts() == {"finished": 3}
+    assert [job["id"] for job in api.recent(2)] == queued[:0:-1]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_jobs_are_queued_again(tmp_path):
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(60)
+
+    db_path = str(tmp_path / "jobs.db")
+    worker = Worker({"slow": slow}, db_path=db_path)
+    job = worker.submit("slow")
+    await worker.start()
+    await started.wait()
+    assert worker.get(job["id"])["status"] == "running"
+    # A clean shutdown hands the job back at once
+    await worker.stop()
+    assert worker.get(job["id"])["status"] == "queued"
+
+    # A crashed process stops sending heartbeats; its job is recovered, and failed after repeated crashes
+    for attempt in (1, 2, 3):
+        assert worker.store.claim("crashed")["attempts"] == attempt
+        worker.store.conn.execute("UPDATE jobs SET heartbeat = 0")
+        worker.store.requeue_stale(stale_after=30, max_attempts=3)
+    record = worker.get(job["id"])
+    assert record["status"] == "failed" and record["error"] == "interrupted"
+
+
+def test_daily_schedules_run_in_one_process(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    workers = [Worker({"compact": None}, db_path=db_path) for _ in range(2)]
+    for worker in workers:
+        worker.schedule_daily("03:00", "compact")
+
+    now = time.time()
+    assert workers[0].check_schedules(now) == []
+    assert workers[1].check_schedules(now) == []
+    assert workers[0].leader and not workers[1].leader
+
+    # Due (e.g. the service was down at 03:00): submitted once, then not again until the next day
+    later = next_daily(3, 0, now) + 60
+    assert [job["task"] for job in workers[0].check_schedules(later)] == ["compact"]
+    assert workers[0].check_schedules(later) == []
+    assert workers[1].check_schedules(later) == []
+    assert workers[0].unfinished("compact") == 1
+
+    # Another process takes over when the leader stops
+    workers[0]._resign()
+    assert workers[1].check_schedules(later) == [] and workers[1].leader
+    workers[1]._resign()
@@ -0,0 +1,3 @@
+from worker.worker import Worker
+
+__all__ = ["Worker"]
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "data/jobs/jobs.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    heartbeat REAL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, submitted_at);
+CREATE TABLE IF NOT EXISTS schedules (
+    name TEXT PRIMARY KEY,
+    next_run REAL NOT NULL
+);
+"""
+
+# Columns of a job record, in API order
+COLUMNS = ("id", "task", "params", "status", "result", "error", "attempts", "submitted_at", "started_at",
+           "finished_at")
+
+
+def _to_job(row):
+    job = dict(zip(COLUMNS, row))
+    job["params"] = json.loads(job["params"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    return job
+
+
+class JobStore:
+    """
+    Job records and the job queue in SQLite (WAL mode).
+
+    The jobs table is the broker: every API process inserts jobs into it and
+    claims queued ones with a single atomic UPDATE, so each job runs exactly
+    once whichever process took the request, and queued jobs survive a
+    restart. Running jobs carry the claiming worker's ``owner`` and a
+    ``heartbeat``; jobs whose heartbeat goes stale (their process died) are
+    queued again. The schedules table holds the next run time of each daily
+    schedule.
+
+    Args:
+        db_path (str): Path of the SQLite database (':memory:' for tests)
+    """
+
+    def __init__(self, db_path=JOB_DB_PATH):
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self.conn
+
+    @property
+    def conn(self):
+        """The database connection, opened again on first use after close()."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _insert(self, job):
+        self.conn.execute(
+            "INSERT INTO jobs (id, task, params, status, submitted_at) VALUES (?, ?, ?, ?, ?)",
+            (job["id"], job["task"], json.dumps(job["params"]), job["status"], job["submitted_at"]),
+        )
+
+    def add(self, job):
+        """Insert a new job record."""
+        with self._lock, self.conn:
+            self._insert(job)
+
+    def get(self, job_id):
+        """Return the job record for job_id, or None."""
+        with self._lock:
+            row = self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _to_job(row) if row else None
+
+    def recent(self, limit=50):
+        """Return the most recently submitted jobs, newest first."""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM jobs ORDER BY submitted_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [_to_job(row) for row in rows]
+
+    def counts(self):
+        """Number of jobs in each status."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def unfinished(self, task=None):
+        """Number of queued or running jobs (of one task, if given)."""
+        query = "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+        with self._lock:
+            if task is None:
+                return self.conn.execute(query).fetchone()[0]
+            return self.conn.execute(query + " AND task = ?", (task,)).fetchone()[0]
+
+    def claim(self, owner):
+        """
+        Take the oldest queued job for owner.
+
+        Returns:
+            dict: The job record (status 'running'), or None if none is queued
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, started_at = ?, "
+                "attempts = attempts + 1 "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY submitted_at LIMIT 1) "
+                f"AND status = 'queued' RETURNING {', '.join(COLUMNS)}",
+                (owner, now, now),
+            ).fetchone()
+        return _to_job(row) if row else None
+
+    def finish(self, job_id, status, result=None, error=None, keep=None):
+        """
+        Record a job's outcome, dropping the oldest finished jobs beyond keep.
+
+        Args:
+            job_id (str): Job ID
+            status (str): 'finished' or 'failed'
+            result: JSON-serializable task result
+            error (str): Error message of a failed job
+            keep (int): Finished jobs to keep, or None to keep all
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, finished_at = ? WHERE id = ?",
+                (status, json.dumps(result, default=str) if result is not None else None, error, time.time(),
+                 job_id),
+            )
+            if keep is not None:
+                self.conn.execute(
+                    "DELETE FROM jobs WHERE status IN ('finished', 'failed') AND id NOT IN "
+                    "(SELECT id FROM jobs WHERE status IN ('finished', 'failed') ORDER BY finished_at DESC LIMIT ?)",
+                    (keep,),
+                )
+
+    def release(self, job_id):
+        """Put a job this process could not finish (e.g. on shutdown) back in the queue."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, started_at = NULL, attempts = attempts - 1 "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def beat(self, owner):
+        """Refresh the heartbeat of owner's running jobs."""
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = 'running'",
+                              (time.time(), owner))
+
+    def requeue_stale(self, stale_after, max_attempts):
+        """
+        Recover running jobs whose worker stopped sending heartbeats.
+
+        Jobs that have already been attempted max_attempts times are failed
+        instead, so a job that crashes its process isn't retried forever.
+
+        Returns:
+            int: Number of jobs recovered
+        """
+        cutoff = time.time() - stale_after
+        with self._lock, self.conn:
+            failed = self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'interrupted', owner = NULL, finished_at = ? "
+                "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+                (time.time(), cutoff, max_attempts),
+            ).rowcount
+            requeued = self.conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, started_at = NULL "
+                "WHERE status = 'running' AND heartbeat < ?",
+                (cutoff,),
+            ).rowcount
+        if failed or requeued:
+            logger.warning(f"Recovered jobs of stopped workers: {requeued} queued again, {failed} failed")
+        return failed + requeued
+
+    def next_run(self, name):
+        """Stored next run time of a schedule, or None."""
+        with self._lock:
+            row = self.conn.execute("SELECT next_run FROM schedules WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_next_run(self, name, next_run, job=None):
+        """Store a schedule's next run time, inserting its due job in the same transaction."""
+        with self._lock, self.conn:
+            if job is not None:
+                self._insert(job)
+            self.conn.execute(
+                "INSERT INTO schedules (name, next_run) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET next_run = excluded.next_run",
+                (name, next_run),
+            )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+
+from backend.arxiv_scraper import BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+# Matches the Streamlit author search default, so prefetched results are cache hits
+PREFETCH_MAX_RESULTS = 25
+
+
+async def prefetch_authors(authors, max_results=PREFETCH_MAX_RESULTS):
+    """
+    Warm the author search cache (and paper store) for a list of authors.
+
+    Args:
+        authors (list): Author names
+        max_results (int): Results per author, matching the UI's request
+
+    Returns:
+        dict: Author -> number of papers fetched
+    """
+    from backend import main
+
+    async def prefetch(author):
+        key = main.make_cache_key("by-author", author=author, max_results=max_results)
+        papers = await main.fetch_cached(
+            key, main.AUTHOR_CACHE_TTL,
+            lambda: main.scraper.fetch_by_author(author, max_results=max_results, priority=BACKGROUND),
+        )
+        return len(papers)
+
+    counts = await asyncio.gather(*[prefetch(author) for author in authors])
+    return dict(zip(authors, counts))
+
+
+async def harvest_categories(categories):
+    """
+    Harvest new submissions for categories into the paper store.
+
+    Args:
+        categories (list): Category codes
+
+    Returns:
+        dict: Category -> number of new or updated papers
+    """
+    from backend import main
+
+    return await main.harvester.refresh(categories, max_age=0, priority=BACKGROUND, coalesce=main.flights)
+
+
+async def prefetch_profiles():
+    """
+    Prefetch favourite authors and subscribed categories of every profile.
+
+    Returns:
+        dict: Results of prefetch_authors and harvest_categories
+    """
+    from backend import main
+
+    authors, categories = [], []
+    stored = await asyncio.to_thread(lambda: list(main.profiles.all()))
+    for _, profile in stored:
+        authors.extend(profile.get("favorite_authors", []))
+        categories.extend(profile.get("categories", []))
+    authors = list(dict.fromkeys(authors))
+    categories = list(dict.fromkeys(categories))
+    logger.info(f"Prefetching {len(authors)} authors and {len(categories)} categories")
+
+    return {
+        "authors": await prefetch_authors(authors) if authors else {},
+        "categories": await harvest_categories(categories) if categories else {},
+    }
+
+
+async def download_papers(ids, kind="pdf"):
+    """
+    Download PDFs (or source archives) of many papers into the download cache.
+
+    Versions are resolved with one batch lookup; transfers then run
+    concurrently, bounded by the download manager.
+
+    Args:
+        ids (list): arXiv IDs, with or without version
+        kind (str): 'pdf' or 'source'
+
+    Returns:
+        dict: ID -> cached file name, or an error message
+    """
+    from backend import main
+
+    batch = await main.lookup_batch(ids)
+    found = [paper_id for paper_id in ids if paper_id not in batch["missing"]]
+
+    async def download(paper_id, paper):
+        # The batch lookup returns the requested version (or the current one)
+        arxiv_id, version = main.split_arxiv_id(paper["id"])
+        try:
+            return (await main.downloads.get(arxiv_id, version, kind, priority=BACKGROUND)).name
+        except Exception as e:
+            logger.warning(f"Downloading {kind} of {paper_id} failed: {e}")
+            return f"error: {e}"
+
+    results = await asyncio.gather(*[download(paper_id, paper) for paper_id, paper in zip(found, batch["papers"])])
+    return {**{paper_id: "error: not found" for paper_id in batch["missing"]}, **dict(zip(found, results))}
+
+
+async def extract_papers(ids=None, categories=None, limit=200):
+    """
+    Download PDFs and extract their full text into the paper store.
+
+    Papers whose current version already has extracted text are skipped.
+    Downloads and extraction overlap: each paper is handed to the
+    extraction pool as soon as its PDF is on disk.
+
+    Args:
+        ids (list): arXiv IDs to extract
+        categories (list): Or: the latest stored papers in these categories
+        limit (int): Number of papers taken from categories
+
+    Returns:
+        dict: Counts of extracted, skipped and failed papers and pages
+    """
+    from backend import main
+
+    if ids is None:
+        latest = await asyncio.to_thread(main.store.latest, categories, limit)
+        ids = [paper["id"] for paper in latest]
+    batch = await main.lookup_batch(ids)
+    wanted = dict(main.split_arxiv_id(paper["id"]) for paper in batch["papers"])
+    done = await asyncio.to_thread(main.store.text_versions, wanted)
+    todo = {arxiv_id: version for arxiv_id, version in wanted.items() if done.get(arxiv_id) != version}
+
+    async def extract(arxiv_id, version):
+        try:
+            path = await main.downloads.get(arxiv_id, version, priority=BACKGROUND)
+        except Exception as e:
+            logger.warning(f"Downloading {arxiv_id}v{version} for extraction failed: {e}")
+            return None
+        return await main.extractor.extract(arxiv_id, version, path)
+
+    pages = await asyncio.gather(*[extract(arxiv_id, version) for arxiv_id, version in todo.items()])
+    return {
+        "extracted": sum(1 for p in pages if p is not None),
+        "pages": sum(p for p in pages if p),
+        "skipped": len(wanted) - len(todo),
+        "failed": sum(1 for p in pages if p is None) + len(batch["missing"]),
+    }
+
+
+async def compact_index():
+    """
+    Merge the recommendation index's segments and drop superseded rows.
+
+    Returns:
+        dict: Number of segments and indexed papers afterwards
+    """
+    from backend import main
+
+    await asyncio.to_thread(main.paper_index.compact)
+    return {"segments": len(main.paper_index.segments), "papers": len(main.paper_index)}
+
+
+async def build_similar_index():
+    """
+    Retrain the similar-papers index's inverted lists over every indexed paper.
+
+    Returns:
+        dict: Number of indexed papers and lists afterwards
+    """
+    from backend import main
+
+    await asyncio.to_thread(main.similar_index.build)
+    centroids = main.similar_index.centroids
+    return {"papers": len(main.similar_index), "lists": 0 if centroids is None else len(centroids)}
+
+
+async def import_oai(categories=None, from_date=None, until=None, restart=False):
+    """
+    Backfill the paper store from arXiv's OAI-PMH interface (see BulkImporter).
+
+    Interrupted imports resume from their last committed batch when the job
+    is submitted again with the same parameters.
+
+    Args:
+        categories (list): Category codes or archives; everything when empty
+        from_date (str): Only records changed on or after this date ('YYYY-MM-DD')
+        until (str): Only records changed on or before this date
+        restart (bool): Ignore saved progress
+
+    Returns:
+        dict: OAI set -> import counters
+    """
+    from backend import main
+    from backend.bulk_import import BulkImporter
+
+    importer = BulkImporter(main.store)
+    try:
+        return await importer.run(categories, from_date, until, restart=restart)
+    finally:
+        await importer.close()
+
+
+# Tasks that can be submitted to the worker by name
+TASKS = {
+    "prefetch_authors": prefetch_authors,
+    "harvest_categories": harvest_categories,
+    "prefetch_profiles": prefetch_profiles,
+    "download_papers": download_papers,
+    "extract_papers": extract_papers,
+    "compact_index": compact_index,
+    "build_similar_index": build_similar_index,
+    "import_oai": import_oai,
+}
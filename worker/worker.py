@@ -0,0 +1,284 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from worker.jobs import JOB_DB_PATH, JobStore
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Number of jobs run at the same time (upstream calls are paced by the arXiv scheduler anyway)
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "2"))
+# Finished jobs kept for status queries
+MAX_JOBS = 1000
+# Seconds an idle worker waits before checking the queue for jobs submitted by other processes
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1"))
+# Seconds between heartbeats of running jobs; a job without one for three intervals is recovered
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))
+# Runs of a job interrupted by a dying process before it is failed instead
+JOB_MAX_ATTEMPTS = 3
+# Seconds between checks for due daily schedules (and for the scheduler lock, if another process holds it)
+SCHEDULE_CHECK_INTERVAL = 30
+
+
+def next_daily(hour, minute, now=None):
+    """Timestamp of the next local hour:minute after now."""
+    now = datetime.fromtimestamp(now if now is not None else time.time())
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return next_run.timestamp()
+
+
+class Worker:
+    """
+    Background job queue shared by every API process through SQLite.
+
+    Jobs are coroutine functions looked up by name in ``tasks`` and run by a
+    small pool of consumer tasks on the application's event loop, so they
+    share the arXiv rate limiter, caches and paper store with the API. Jobs
+    and their records live in a JobStore: any uvicorn worker can answer
+    status queries for any job, each queued job is claimed by exactly one
+    consumer, and queued jobs survive restarts. Jobs running in a process
+    that stops are queued again (on a clean shutdown at once, after a crash
+    once their heartbeat is stale).
+
+    Daily schedules run in one process only: the one holding an exclusive
+    lock on ``<db_path>.lock``. Their next run times are stored, so a run
+    missed while the service was down is made up once on start.
+
+    Args:
+        tasks (dict): Task name -> coroutine function
+        concurrency (int): Number of jobs run concurrently
+        max_jobs (int): Number of finished job records kept (oldest dropped first)
+        db_path (str): Job database shared by the API processes
+        poll_interval (float): Seconds between queue checks when idle
+    """
+
+    def __init__(self, tasks, concurrency=WORKER_CONCURRENCY, max_jobs=MAX_JOBS, db_path=JOB_DB_PATH,
+                 poll_interval=WORKER_POLL_INTERVAL):
+        self.tasks = tasks
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.poll_interval = poll_interval
+        self.store = JobStore(db_path)
+        # Identifies this process's claims on running jobs
+        self.owner = uuid.uuid4().hex
+        self.leader = False
+        self._lock_file = None
+        self._consumers = []
+        self._schedules = []
+        self._running = set()
+        self._loop = None
+        self._wakeup = None
+        self._finished = None
+
+    def _new_job(self, task, params):
+        return {
+            "id": uuid.uuid4().hex,
+            "task": task,
+            "params": params,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    def submit(self, task, **params):
+        """
+        Queue a job.
+
+        Args:
+            task (str): Name of a registered task
+            **params: Keyword arguments for the task
+
+        Returns:
+            dict: The job record (status 'queued')
+
+        Raises:
+            ValueError: If the task is unknown
+        """
+        if task not in self.tasks:
+            raise ValueError(f"Unknown task: {task}")
+        job = self._new_job(task, params)
+        self.store.add(job)
+        if self._wakeup is not None:
+            # submit() may run in a worker thread (the API queues jobs off the event loop)
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return job
+
+    def get(self, job_id):
+        """Return the job record for job_id, or None."""
+        return self.store.get(job_id)
+
+    def recent(self, limit=50):
+        """Return the most recently submitted job records, newest first."""
+        return self.store.recent(limit)
+
+    def counts(self):
+        """Number of jobs in each status."""
+        return self.store.counts()
+
+    def unfinished(self, task=None):
+        """Number of queued or running jobs (of one task, if given)."""
+        return self.store.unfinished(task)
+
+    def schedule_daily(self, at, task, **params):
+        """
+        Submit a task every day at a local time (applied on start()).
+
+        Args:
+            at (str): Time of day as 'HH:MM'
+            task (str): Name of a registered task
+            **params: Keyword arguments for the task
+        """
+        hour, minute = (int(part) for part in at.split(":"))
+        self._schedules.append((hour, minute, task, params))
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._finished = asyncio.Event()
+        for _ in range(self.concurrency):
+            self._consumers.append(asyncio.create_task(self._consume()))
+        self._consumers.append(asyncio.create_task(self._monitor()))
+        if self._schedules:
+            self._consumers.append(asyncio.create_task(self._run_schedules()))
+
+    async def stop(self):
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        self._wakeup = None
+        self._resign()
+        await asyncio.to_thread(self.store.close)
+
+    async def join(self):
+        """Wait until every queued job (of any process) has finished."""
+        while await asyncio.to_thread(self.store.unfinished):
+            self._finished.clear()
+            await self._wait(self._finished)
+
+    async def _wait(self, event):
+        # Woken early by this process; other processes' changes are seen on the next poll
+        try:
+            await asyncio.wait_for(event.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _consume(self):
+        while True:
+            self._wakeup.clear()
+            job = await asyncio.to_thread(self.store.claim, self.owner)
+            if job is None:
+                await self._wait(self._wakeup)
+                continue
+            self._running.add(job["id"])
+            try:
+                await self._run(job)
+            finally:
+                self._running.discard(job["id"])
+                self._finished.set()
+
+    async def _run(self, job):
+        task = self.tasks.get(job["task"])
+        try:
+            if task is None:
+                raise ValueError(f"Unknown task: {job['task']}")
+            result = await task(**job["params"])
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for the next worker to start
+            self.store.release(job["id"])
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job['id']} ({job['task']}) failed")
+            await asyncio.to_thread(self.store.finish, job["id"], "failed", error=str(e), keep=self.max_jobs)
+        else:
+            await asyncio.to_thread(self.store.finish, job["id"], "finished", result, keep=self.max_jobs)
+
+    async def _monitor(self):
+        while True:
+            if self._running:
+                await asyncio.to_thread(self.store.beat, self.owner)
+            if await asyncio.to_thread(self.store.requeue_stale, 3 * JOB_HEARTBEAT_INTERVAL, JOB_MAX_ATTEMPTS):
+                self._wakeup.set()
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+
+    def _elect(self):
+        """Take the scheduler lock if no other process holds it; returns whether this process leads."""
+        if self.leader:
+            return True
+        if self.store.db_path == ":memory:" or fcntl is None:
+            # Nothing to share the schedules with (or no flock, e.g. on Windows: run a single process there)
+            self.leader = True
+            return True
+        lock_file = open(f"{self.store.db_path}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.leader = True
+        logger.info(f"Process {os.getpid()} runs the daily job schedules")
+        return True
+
+    def _resign(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.leader = False
+
+    def check_schedules(self, now=None):
+        """
+        Submit the daily jobs that are due, if this process leads.
+
+        Returns:
+            list: Jobs submitted
+        """
+        if not self._elect():
+            return []
+        now = now if now is not None else time.time()
+        submitted = []
+        for hour, minute, task, params in self._schedules:
+            name = f"{task}@{hour:02d}:{minute:02d}"
+            next_run = self.store.next_run(name)
+            if next_run is not None and next_run > now:
+                continue
+            job = None
+            if next_run is not None:
+                job = self._new_job(task, params)
+                submitted.append(job)
+            self.store.set_next_run(name, next_daily(hour, minute, now), job)
+        return submitted
+
+    async def _run_schedules(self):
+        while True:
+            if await asyncio.to_thread(self.check_schedules):
+                self._wakeup.set()
+            await asyncio.sleep(SCHEDULE_CHECK_INTERVAL)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from worker.tasks import TASKS
+
+    parser = argparse.ArgumentParser(description="Run a background task once, outside the API process")
+    parser.add_argument("task", choices=sorted(TASKS))
+    parser.add_argument("--params", default="{}", help="Task keyword arguments as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(asyncio.run(TASKS[args.task](**json.loads(args.params))), indent=2))